@@ -0,0 +1,102 @@
+"""Compares list/save/apply latency of the subprocess and in-process Konsave backends.
+
+Runs against a throwaway HOME, so the real Konsave profiles and configuration are never touched:
+
+    python -m benchmarks.backend_latency --repeat 10 --output backend_latency.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+_CONFIG = """---
+save:
+  configs:
+    location: "$CONFIG_DIR"
+    entries:
+      - kdeglobals
+      - plasmarc
+      - gtk-3.0
+export: {}
+"""
+
+
+def create_home(root: str, files_per_folder: int) -> None:
+    config_dir = os.path.join(root, ".config")
+    os.makedirs(os.path.join(config_dir, "konsave", "profiles"))
+    os.makedirs(os.path.join(config_dir, "gtk-3.0"))
+    with open(os.path.join(config_dir, "konsave", "conf.yaml"), "w", encoding="utf-8") as file:
+        file.write(_CONFIG)
+    for name in ("kdeglobals", "plasmarc"):
+        with open(os.path.join(config_dir, name), "w", encoding="utf-8") as file:
+            file.write("[General]\nkey=value\n" * 200)
+    for number in range(files_per_folder):
+        with open(os.path.join(config_dir, "gtk-3.0", f"file_{number}.css"), "w", encoding="utf-8") as file:
+            file.write("* { color: red; }\n" * 50)
+
+
+def measure(operation, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return summarize(timings)
+
+
+def summarize(timings: list[float]) -> dict:
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per operation and backend")
+    parser.add_argument("--files", type=int, default=50, help="files in the saved configuration folder")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="konui-bench-")
+    create_home(home, args.files)
+    # before anything imports konsave: its paths are computed from HOME at import time
+    os.environ["HOME"] = home
+    os.environ["XDG_CACHE_HOME"] = os.path.join(home, ".cache")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from shared.konsave_backend import InProcessBackend, SubprocessBackend
+
+    results = {}
+    try:
+        for backend in (SubprocessBackend(), InProcessBackend()):
+            theme_name = f"bench_{backend.name}"
+            backend.save(theme_name)
+            results[backend.name] = {
+                "list": measure(backend.list_profiles, args.repeat),
+                "save": measure(lambda: backend.save(theme_name), args.repeat),
+                "apply": measure(lambda: backend.apply(theme_name), args.repeat),
+            }
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+    print(f"{'operation':<10}{'subprocess (ms)':>18}{'in_process (ms)':>18}")
+    for operation in ("list", "save", "apply"):
+        print(
+            f"{operation:<10}{results['subprocess'][operation]['median_ms']:>18.2f}"
+            f"{results['in_process'][operation]['median_ms']:>18.2f}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"repeat": args.repeat, "files": args.files, "results": results}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Stand-in for the konsave command, used by the benchmarks.
+
+Implements the commands KonUI runs (--version, -l, -s, -a, -r, -e, -i) against $HOME/.config/konsave,
+with the same profile and archive layout as konsave but none of its dependencies. Saving and applying only
+copy the "configs" section, which is all the generated benchmark homes contain.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import zipfile
+from datetime import datetime
+
+VERSION = "2.2.0"
+EXPORT_EXTENSION = ".knsv"
+SECTION = "configs"
+
+
+def get_konsave_dir() -> str:
+    return os.path.join(os.path.expanduser("~"), ".config", "konsave")
+
+
+def get_profiles_dir() -> str:
+    return os.path.join(get_konsave_dir(), "profiles")
+
+
+def get_profile_names() -> list[str]:
+    try:
+        return sorted(os.listdir(get_profiles_dir()))
+    except FileNotFoundError:
+        return []
+
+
+def copy_entry(source: str, destination: str) -> None:
+    if os.path.isdir(source):
+        shutil.copytree(source, destination, dirs_exist_ok=True)
+    elif os.path.exists(source):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy2(source, destination)
+
+
+def list_profiles() -> None:
+    names = get_profile_names()
+    if not names:
+        print("Konsave: No profile found.")
+        return
+    print("Konsave profiles:\nID\tNAME")
+    for index, name in enumerate(names, start=1):
+        print(f"{index}\t{name}")
+
+
+def save_profile(name: str, force: bool) -> None:
+    profile_dir = os.path.join(get_profiles_dir(), name)
+    if os.path.exists(profile_dir):
+        if not force:
+            sys.exit("Konsave: Profile with this name already exists")
+        shutil.rmtree(profile_dir)
+    config_dir = os.path.join(os.path.expanduser("~"), ".config")
+    os.makedirs(os.path.join(profile_dir, SECTION))
+    shutil.copy2(os.path.join(get_konsave_dir(), "conf.yaml"), os.path.join(profile_dir, "conf.yaml"))
+    for entry in os.listdir(config_dir):
+        if entry != "konsave":
+            copy_entry(os.path.join(config_dir, entry), os.path.join(profile_dir, SECTION, entry))
+
+
+def apply_profile(name: str) -> None:
+    section_dir = os.path.join(get_profiles_dir(), name, SECTION)
+    if not os.path.isdir(section_dir):
+        sys.exit("Konsave: Profile not found.")
+    config_dir = os.path.join(os.path.expanduser("~"), ".config")
+    for entry in os.listdir(section_dir):
+        copy_entry(os.path.join(section_dir, entry), os.path.join(config_dir, entry))
+
+
+def remove_profile(name: str) -> None:
+    profile_dir = os.path.join(get_profiles_dir(), name)
+    if not os.path.isdir(profile_dir):
+        sys.exit("Konsave: Profile not found.")
+    shutil.rmtree(profile_dir)
+
+
+def export_profile(name: str) -> None:
+    # like konsave: a staging copy in the working directory, zipped next to it
+    profile_dir = os.path.join(get_profiles_dir(), name)
+    if not os.path.isdir(profile_dir):
+        sys.exit("Konsave: Profile not found.")
+    export_path = os.path.join(os.getcwd(), name)
+    while any(os.path.exists(f"{export_path}{ext}") for ext in ("", EXPORT_EXTENSION, ".zip")):
+        export_path = f"{export_path}_{datetime.now():%d-%m-%Y:%H-%M-%S}"
+    os.makedirs(os.path.join(export_path, "save"))
+    os.makedirs(os.path.join(export_path, "export"))
+    shutil.copy2(os.path.join(profile_dir, "conf.yaml"), os.path.join(export_path, "conf.yaml"))
+    copy_entry(os.path.join(profile_dir, SECTION), os.path.join(export_path, "save", SECTION))
+    shutil.make_archive(export_path, "zip", export_path)
+    shutil.rmtree(export_path)
+    os.replace(f"{export_path}.zip", f"{export_path}{EXPORT_EXTENSION}")
+
+
+def import_profile(path: str) -> None:
+    name = os.path.basename(path).replace(EXPORT_EXTENSION, "")
+    profile_dir = os.path.join(get_profiles_dir(), name)
+    if os.path.exists(profile_dir):
+        sys.exit("Konsave: Profile already exists")
+    with zipfile.ZipFile(path) as archive:
+        staging_dir = f"{profile_dir}.import"
+        archive.extractall(staging_dir)
+    os.makedirs(profile_dir)
+    shutil.move(os.path.join(staging_dir, "conf.yaml"), os.path.join(profile_dir, "conf.yaml"))
+    for section in os.listdir(os.path.join(staging_dir, "save")):
+        shutil.move(os.path.join(staging_dir, "save", section), os.path.join(profile_dir, section))
+    shutil.rmtree(staging_dir)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="konsave")
+    parser.add_argument("-l", "--list", action="store_true")
+    parser.add_argument("-s", "--save")
+    parser.add_argument("-r", "--remove")
+    parser.add_argument("-a", "--apply")
+    parser.add_argument("-e", "--export-profile")
+    parser.add_argument("-i", "--import-profile")
+    parser.add_argument("-f", "--force", action="store_true")
+    parser.add_argument("-v", "--version", action="store_true")
+    args = parser.parse_args()
+
+    if args.version:
+        print(f"Konsave: {VERSION}")
+    elif args.list:
+        list_profiles()
+    elif args.save:
+        save_profile(args.save, args.force)
+    elif args.apply:
+        apply_profile(args.apply)
+    elif args.remove:
+        remove_profile(args.remove)
+    elif args.export_profile:
+        export_profile(args.export_profile)
+    elif args.import_profile:
+        import_profile(args.import_profile)
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
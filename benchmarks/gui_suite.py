@@ -0,0 +1,268 @@
+"""Measures KonUI's hot paths at several profile counts, headless and without a real Konsave.
+
+Every profile count gets its own throwaway HOME holding generated profiles and a fake konsave
+(benchmarks/fake_konsave.py) first on PATH, and runs in its own process on Qt's offscreen platform:
+
+    python -m benchmarks.gui_suite --profiles 10,1000,10000 --output results.json
+    python -m benchmarks.gui_suite --output new.json --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.backend_latency import measure, summarize
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CONFIG = """---
+save:
+  configs:
+    location: "$CONFIG_DIR"
+    entries:
+      - kdeglobals
+      - plasmarc
+export: {}
+"""
+_KDEGLOBALS = "[Colors:Window]\nBackgroundNormal=49,54,59\n[Colors:View]\nBackgroundNormal=35,38,41\n"
+TRANSFER_THEME = "bench_transfer"
+
+
+def create_home(root: str, profiles: int, profile_bytes: int, transfer_bytes: int) -> None:
+    config_dir = os.path.join(root, ".config")
+    profiles_dir = os.path.join(config_dir, "konsave", "profiles")
+    os.makedirs(profiles_dir)
+    with open(os.path.join(config_dir, "konsave", "conf.yaml"), "w", encoding="utf-8") as file:
+        file.write(_CONFIG)
+    with open(os.path.join(config_dir, "kdeglobals"), "w", encoding="utf-8") as file:
+        file.write(_KDEGLOBALS)
+
+    payload = os.urandom(profile_bytes)
+    for number in range(profiles):
+        create_profile(os.path.join(profiles_dir, f"theme_{number:05d}"), payload)
+    create_profile(os.path.join(profiles_dir, TRANSFER_THEME), os.urandom(transfer_bytes))
+
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(bin_dir)
+    konsave = os.path.join(bin_dir, "konsave")
+    fake_konsave = os.path.join(_ROOT, "benchmarks", "fake_konsave.py")
+    with open(konsave, "w", encoding="utf-8") as file:
+        file.write(f'#!/bin/sh\nexec "{sys.executable}" "{fake_konsave}" "$@"\n')
+    os.chmod(konsave, 0o755)
+
+
+def create_profile(profile_dir: str, payload: bytes) -> None:
+    os.makedirs(os.path.join(profile_dir, "configs"))
+    with open(os.path.join(profile_dir, "conf.yaml"), "w", encoding="utf-8") as file:
+        file.write(_CONFIG)
+    with open(os.path.join(profile_dir, "configs", "kdeglobals"), "w", encoding="utf-8") as file:
+        file.write(_KDEGLOBALS)
+    with open(os.path.join(profile_dir, "configs", "plasmarc"), "wb") as file:
+        file.write(payload)
+
+
+def time_calls(operations) -> dict:
+    timings = []
+    for operation in operations:
+        started_at = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return summarize(timings)
+
+
+def run_worker(worker) -> None:
+    # workers report through signals; called synchronously here, so a failure is turned back into an exception
+    errors = []
+    worker.failed.connect(errors.append)
+    worker.run()
+    if errors:
+        raise RuntimeError(errors[0])
+
+
+def measure_scale(args: argparse.Namespace) -> dict:
+    # runs inside the throwaway HOME prepared by the parent process
+    from PyQt6.QtWidgets import QApplication, QWidget
+
+    from shared import config
+
+    config._CONFIG["konsave_backend"] = args.backend
+
+    from shared.konsave_interface import KonsaveInterface
+    from shared.profile_cache import ProfileCache
+    from shared.resources.export_worker import ExportWorker
+    from shared.resources.import_worker import ImportWorker
+    from windows.all_theme_window import AllThemeWindow
+    from windows.save_theme_dialog import SaveThemeDialog
+
+    app = QApplication([])
+    results = {}
+
+    def read_profile_list():
+        ProfileCache.invalidate()
+        KonsaveInterface().get_profile_list()
+
+    results["profile_list_cold"] = measure(read_profile_list, args.repeat)
+    results["profile_list_cached"] = measure(KonsaveInterface().get_profile_list, args.repeat)
+
+    parent = QWidget()
+
+    def open_window():
+        window = AllThemeWindow(parent)
+        window.show()
+        app.processEvents()
+        return window
+
+    windows = []
+    results["window_open"] = measure(lambda: windows.append(open_window()), args.repeat)
+    for window in windows[:-1]:
+        window.close()
+    window = windows[-1]
+
+    def type_into(callback, text: str):
+        # one operation per keystroke, each followed by the repaint it causes
+        prefixes = [text[:length] for length in range(1, len(text) + 1)]
+        return [lambda prefix=prefix: (callback(prefix), app.processEvents()) for prefix in prefixes]
+
+    results["filter_keystroke"] = time_calls(type_into(window.filter_table, "theme_01") * args.repeat)
+    window.filter_table("")
+
+    # alternates between the full list and one without a theme, as after a delete and a re-import
+    full_list = list(window.themes)
+    reduced_list = full_list[: len(full_list) // 2] + full_list[len(full_list) // 2 + 1 :]
+
+    def update_table(themes):
+        window.themes = themes
+        window.update_table()
+
+    results["update_table"] = time_calls(
+        [lambda themes=themes: update_table(themes) for themes in (reduced_list, full_list) * args.repeat]
+    )
+    results["redraw_table"] = measure(window.table.viewport().repaint, args.repeat)
+    window.close()
+
+    dialog = SaveThemeDialog(parent)
+    dialog.show()
+    results["save_dialog_keystroke"] = time_calls(type_into(dialog.input.setText, "my new theme") * args.repeat)
+    dialog.close()
+
+    output_dir = tempfile.mkdtemp(prefix="exports-", dir=os.path.expanduser("~"))
+    transfer_path = os.path.join(os.path.expanduser("~"), ".config", "konsave", "profiles", TRANSFER_THEME)
+    transfer_bytes = sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(transfer_path)
+        for name in names
+    )
+    for backend in ("konsave", "native"):
+        config._CONFIG["export_backend"] = backend
+        metric = f"export_{backend}"
+        results[metric] = measure(lambda: run_worker(ExportWorker(TRANSFER_THEME, output_dir)), args.repeat)
+        results[metric]["mb_per_s"] = round(transfer_bytes / 1000 / results[metric]["median_ms"], 1)
+
+    archive = next(os.path.join(output_dir, name) for name in os.listdir(output_dir))
+    copies = []
+    for number in range(args.repeat):
+        copies.append(os.path.join(output_dir, f"bench_import_{number}.knsv"))
+        shutil.copy(archive, copies[-1])
+    results["import"] = time_calls([lambda path=path: run_worker(ImportWorker(path)) for path in copies])
+    results["import"]["mb_per_s"] = round(os.path.getsize(archive) / 1000 / results["import"]["median_ms"], 1)
+    app.quit()
+    return results
+
+
+def run_scale(profiles: int, args: argparse.Namespace) -> dict:
+    home = tempfile.mkdtemp(prefix="konui-bench-")
+    try:
+        started_at = time.perf_counter()
+        create_home(home, profiles, args.profile_kb * 1000, args.transfer_mb * 1_000_000)
+        print(f"{profiles} profiles generated in {time.perf_counter() - started_at:.1f}s", file=sys.stderr)
+        env = dict(
+            os.environ,
+            HOME=home,
+            XDG_CACHE_HOME=os.path.join(home, ".cache"),
+            PATH=f"{os.path.join(home, 'bin')}{os.pathsep}{os.environ.get('PATH', '')}",
+            QT_QPA_PLATFORM="offscreen",
+        )
+        command = [sys.executable, "-m", "benchmarks.gui_suite", "--measure", "--repeat", str(args.repeat)]
+        command += ["--backend", args.backend]
+        process = subprocess.run(command, cwd=_ROOT, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise RuntimeError(f"Benchmark at {profiles} profiles failed:\n{process.stderr}")
+        # the last line is the JSON result, anything before it is the application's own output
+        return json.loads(process.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def get_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results: dict, baseline: dict) -> None:
+    for profiles, metrics in results.items():
+        print(f"\n{profiles} profiles")
+        print(f"{'metric':<24}{'median (ms)':>14}{'max (ms)':>12}{'baseline':>12}{'change':>10}")
+        for metric, values in metrics.items():
+            line = f"{metric:<24}{values['median_ms']:>14.2f}{values['max_ms']:>12.2f}"
+            previous = baseline.get(profiles, {}).get(metric)
+            if previous and previous["median_ms"]:
+                change = (values["median_ms"] - previous["median_ms"]) * 100 / previous["median_ms"]
+                line += f"{previous['median_ms']:>12.2f}{change:>+9.0f}%"
+            if "mb_per_s" in values:
+                line += f"  ({values['mb_per_s']} MB/s)"
+            print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", default="10,1000,10000", help="comma separated profile counts")
+    parser.add_argument("--profile-kb", type=int, default=4, help="size of each generated profile")
+    parser.add_argument("--transfer-mb", type=int, default=20, help="size of the profile exported and imported")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    parser.add_argument("--backend", default="subprocess", choices=("subprocess", "in_process"))
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure_scale(args)))
+        return 0
+
+    results = {}
+    for profiles in (int(count) for count in args.profiles.split(",")):
+        results[str(profiles)] = run_scale(profiles, args)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+    print_results(results, baseline)
+
+    if args.output:
+        report = {
+            "revision": get_revision(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {
+                key: value for key, value in vars(args).items() if key not in ("output", "compare", "measure")
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,80 @@
-import subprocess
+import argparse
+import cProfile
+import os
 import sys
+import time
 
-from PyQt6.QtWidgets import QApplication, QMessageBox
-
+from shared.cli import Cli
+from shared.config import Config
+from shared.instrumentation import Instrumentation
 from shared.os_interface import OsInterface
-from windows.main_window import MainWindow
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    if not OsInterface.check_konsave_installed():
-        QMessageBox.critical(
-            None, "Konsave not found", "Konsave has not been found on your system. Please install it to use this UI"
-        )
-        sys.exit(1)
+
+def parse_arguments() -> tuple[argparse.Namespace, list[str]]:
+    # no automatic -h: 'export --help' belongs to the headless command, not to this parser
+    parser = argparse.ArgumentParser(
+        prog="konui",
+        add_help=False,
+        allow_abbrev=False,
+        epilog=f"headless commands: {', '.join(Cli.COMMANDS)} (see <command> --help)",
+    )
+    parser.add_argument("-h", "--help", action="store_true", help="show this help message and exit")
+    parser.add_argument(
+        "--trace", action="store_true", help="record subprocess calls, Konsave operations and GUI stalls"
+    )
+    parser.add_argument("--profile", action="store_true", help="write cProfile statistics of the whole session")
+    # anything else is a headless command, or left to Qt (-platform, -style, ...)
+    arguments, other_arguments = parser.parse_known_args()
+    if arguments.help:
+        if not other_arguments or other_arguments[0] not in Cli.COMMANDS:
+            parser.print_help()
+            sys.exit(0)
+        other_arguments.append("--help")
+    return arguments, other_arguments
+
+
+def run_gui(qt_arguments: list[str], trace: bool) -> int:
+    # imported here so the headless commands never load the widget modules
+    from PyQt6.QtWidgets import QApplication
+
+    from shared.resources.stall_watchdog import StallWatchdog
+    from windows.main_window import MainWindow
+
+    app = QApplication([sys.argv[0], *qt_arguments])
+    watchdog = None
+    if trace:
+        watchdog = StallWatchdog(Config.get_trace_stall_threshold_ms(), parent=app)
+        watchdog.start()
+    # Konsave is looked for in the background once the window is painted (see MainWindow.start_konsave_probe)
     finestra = MainWindow()
     finestra.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if watchdog is not None:
+        watchdog.stop()
+    return exit_code
+
+
+def run(other_arguments: list[str], trace: bool) -> int:
+    if trace:
+        print(f"Tracing to {Instrumentation.enable()}", file=sys.stderr)
+    if other_arguments and other_arguments[0] in Cli.COMMANDS:
+        return Cli().run(other_arguments)
+    return run_gui(other_arguments, trace)
+
+
+if __name__ == "__main__":
+    arguments, other_arguments = parse_arguments()
+    trace = arguments.trace or Config.is_trace_enabled()
+    if not arguments.profile:
+        sys.exit(run(other_arguments, trace))
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        exit_code = run(other_arguments, trace)
+    finally:
+        profiler.disable()
+        profile_path = os.path.join(OsInterface.get_cache_path(), f"profile-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        profiler.dump_stats(profile_path)
+        print(f"Profile written to {profile_path} (read it with: python -m pstats {profile_path})", file=sys.stderr)
+    sys.exit(exit_code)
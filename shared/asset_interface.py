@@ -1,5 +0,0 @@
-class AssetInterface:
-
-    @staticmethod
-    def get_spinner_path():
-        return "./assets/blue_spinner.gif"
@@ -0,0 +1,153 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from shared.config import Config
+from shared.instrumentation import Instrumentation
+
+
+def _probe_systemd() -> bool:
+    try:
+        Instrumentation.run(
+            ["systemctl", "--version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+def _probe_konsave_version() -> Optional[str]:
+    try:
+        output = Instrumentation.run(["konsave", "--version"], text=True, capture_output=True)
+        konsave_version = re.search(r"(\d+\.\d+\.\d+)", output.stdout)
+        return konsave_version.group(1) if konsave_version else None
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+
+
+def _probe_plasmashell_version() -> str:
+    try:
+        output = Instrumentation.run(["plasmashell", "--version"], text=True, capture_output=True, check=True).stdout
+        for line in output.splitlines():
+            if "plasmashell" in line.lower():
+                parts = line.strip().split()
+                for part in parts:
+                    if part[0].isdigit():
+                        return part
+    except Exception as e:
+        print(f"Could not read plasmashell version. Error: {e}")
+    return "unknown"
+
+
+class CapabilityProbe:
+    # Each probe runs at most once per session, all of them concurrently on a small thread pool.
+    # Results are also persisted in the cache keyed by the resolved binary's path and mtime, so a later
+    # launch reuses them until the binary is moved, upgraded or removed. Launchers that stay the same file
+    # across upgrades (pyenv shims, pip wrapper scripts) are covered by expiring every result after a while
+
+    cache_name = "capabilities.json"
+    # name -> (binary, probe, result when the binary is not on PATH)
+    _PROBES: dict[str, tuple[str, Callable[[], Any], Any]] = {
+        "systemd": ("systemctl", _probe_systemd, False),
+        "konsave": ("konsave", _probe_konsave_version, None),
+        "plasmashell": ("plasmashell", _probe_plasmashell_version, "unknown"),
+    }
+
+    _lock = threading.Lock()
+    _executor: Optional[ThreadPoolExecutor] = None
+    _futures: dict[str, Future] = {}
+    _persisted: Optional[dict[str, dict]] = None
+
+    @classmethod
+    def start(cls, names: Optional[list[str]] = None) -> None:
+        # non-blocking: queues every probe that has no result yet for this session
+        with cls._lock:
+            for name in names or list(cls._PROBES):
+                cls._submit(name)
+
+    @classmethod
+    def get(cls, name: str) -> Any:
+        with cls._lock:
+            future = cls._submit(name)
+        return future.result()
+
+    @classmethod
+    def refresh(cls, names: Optional[list[str]] = None) -> None:
+        # forgets the session and persisted results, then probes again in the background
+        names = names or list(cls._PROBES)
+        with cls._lock:
+            persisted = cls._load_persisted()
+            for name in names:
+                cls._futures.pop(name, None)
+                persisted.pop(name, None)
+            cls._write_persisted()
+        cls.start(names)
+
+    @classmethod
+    def _submit(cls, name: str) -> Future:
+        if name not in cls._PROBES:
+            raise KeyError(f"Unknown capability probe '{name}'")
+        future = cls._futures.get(name)
+        if future is None:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(len(cls._PROBES), thread_name_prefix="capability-probe")
+            future = cls._executor.submit(cls._run, name)
+            cls._futures[name] = future
+        return future
+
+    @classmethod
+    def _run(cls, name: str) -> Any:
+        binary, probe, missing_result = cls._PROBES[name]
+        binary_path = shutil.which(binary)
+        if binary_path is None:
+            return missing_result
+        real_path = os.path.realpath(binary_path)
+        try:
+            key = [real_path, os.stat(real_path).st_mtime_ns]
+        except OSError:
+            return probe()
+
+        with cls._lock:
+            entry = cls._load_persisted().get(name)
+        max_age = Config.get_capability_cache_max_age_s()
+        if entry and entry.get("key") == key and time.time() - entry.get("probed_at", 0) < max_age:
+            return entry.get("result")
+
+        result = probe()
+        with cls._lock:
+            cls._load_persisted()[name] = {"key": key, "probed_at": time.time(), "result": result}
+            cls._write_persisted()
+        return result
+
+    @classmethod
+    def _get_cache_file(cls) -> str:
+        # imported here: OsInterface delegates its probes to this class
+        from shared.os_interface import OsInterface
+
+        return os.path.join(OsInterface.get_cache_path(), cls.cache_name)
+
+    @classmethod
+    def _load_persisted(cls) -> dict[str, dict]:
+        if cls._persisted is None:
+            try:
+                with open(cls._get_cache_file(), "r", encoding="utf-8") as file:
+                    cls._persisted = json.load(file)
+            except (OSError, ValueError):
+                cls._persisted = {}
+        return cls._persisted
+
+    @classmethod
+    def _write_persisted(cls) -> None:
+        cache_file = cls._get_cache_file()
+        try:
+            with open(f"{cache_file}.part", "w", encoding="utf-8") as file:
+                json.dump(cls._persisted or {}, file)
+            os.replace(f"{cache_file}.part", cache_file)
+        except OSError as e:
+            print(f"Could not persist capability probes. Error: {e}")
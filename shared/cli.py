@@ -0,0 +1,302 @@
+import argparse
+import json
+import os
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, TextIO
+
+from shared.config import Config
+from shared.konsave_interface import KonsaveInterface
+from shared.os_interface import OsInterface
+
+EXPORT_EXTENSION = ".knsv"
+
+
+class Cli:
+    # Headless commands for scripting, run by main.py instead of the GUI. PyQt widgets are never imported:
+    # the workers are plain QObjects from QtCore, run on a thread pool with their signals connected
+    # directly, so they are delivered on the worker's own thread and no event loop is needed.
+    # Every operation prints one result (status and seconds); the exit code is 1 if any of them failed
+    COMMANDS = ("list", "export", "import", "apply", "inspect")
+
+    def __init__(self, output: TextIO = sys.stdout):
+        self.output = output
+        self.json = False
+        self._output_lock = threading.Lock()
+        self.__konsave_interface = KonsaveInterface()
+
+    def run(self, argv: list[str]) -> int:
+        args = self.get_parser().parse_args(argv)
+        self.json = args.json
+        if self.output is sys.stdout:
+            # results keep the real stdout; whatever konsave or the commands it starts print goes to stderr,
+            # so the output can be piped into a parser
+            sys.stdout.flush()
+            self.output = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+            os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        try:
+            return args.handler(args)
+        finally:
+            self.output.flush()
+
+    def get_parser(self) -> argparse.ArgumentParser:
+        common = argparse.ArgumentParser(add_help=False)
+        common.add_argument("--json", action="store_true", help="print results as JSON, one object per line")
+
+        parser = argparse.ArgumentParser(prog="main.py", description="KonUI without the user interface")
+        commands = parser.add_subparsers(dest="command", required=True)
+
+        list_parser = commands.add_parser("list", parents=[common], help="list saved themes")
+        list_parser.set_defaults(handler=self.list_themes)
+
+        export_parser = commands.add_parser("export", parents=[common], help="export themes to .knsv files")
+        export_parser.add_argument("themes", nargs="*", help="themes to export")
+        export_parser.add_argument("--all", action="store_true", help="export every saved theme")
+        export_parser.add_argument("--jobs", type=int, default=Config.get_max_concurrent_exports())
+        export_parser.add_argument(
+            "--output",
+            default=os.getcwd(),
+            help="folder to write the archives to, or '-' / a named pipe to stream a single theme into",
+        )
+        export_parser.add_argument(
+            "--compression",
+            choices=("default", "store", "fast", "max"),
+            default=Config.get_export_compression(),
+            help="'store' is fastest, 'max' smallest; 'default' is what konsave writes",
+        )
+        export_parser.set_defaults(handler=self.export_themes)
+
+        import_parser = commands.add_parser("import", parents=[common], help="import .knsv files")
+        import_parser.add_argument("paths", nargs="+", help=".knsv files, or folders containing them")
+        import_parser.add_argument("--jobs", type=int, default=Config.get_max_concurrent_imports())
+        import_parser.add_argument(
+            "--verify",
+            action="store_true",
+            default=Config.is_import_crc_verification_enabled(),
+            help="decompress every archive to check its CRCs before importing it",
+        )
+        import_parser.set_defaults(handler=self.import_themes)
+
+        inspect_parser = commands.add_parser("inspect", parents=[common], help="check .knsv files without importing")
+        inspect_parser.add_argument("paths", nargs="+", help=".knsv files, or folders containing them")
+        inspect_parser.add_argument("--deep", action="store_true", help="also decompress every entry to check CRCs")
+        inspect_parser.set_defaults(handler=self.inspect_archives)
+
+        apply_parser = commands.add_parser("apply", parents=[common], help="apply a saved theme")
+        apply_parser.add_argument("theme")
+        apply_parser.add_argument("--reload", action="store_true", help="restart Plasma (and KWin on X11) afterwards")
+        apply_parser.set_defaults(handler=self.apply_theme)
+        return parser
+
+    def list_themes(self, args: argparse.Namespace) -> int:
+        started_at = time.perf_counter()
+        try:
+            themes = self.__konsave_interface.get_profile_list()
+        except Exception as e:
+            return self.report({"operation": "list", "status": "failed", "error": str(e)}, started_at)
+        if not self.json:
+            for index, name in themes:
+                print(f"{index}\t{name}", file=self.output)
+            return 0
+        record = {"operation": "list", "status": "ok", "themes": [{"index": i, "name": n} for i, n in themes]}
+        return self.report(record, started_at)
+
+    def export_themes(self, args: argparse.Namespace) -> int:
+        from shared.resources.export_worker import ExportWorker
+
+        if args.all:
+            theme_names = [name for _, name in self.__konsave_interface.get_profile_list()]
+        elif args.themes:
+            theme_names = args.themes
+        else:
+            print("Name the themes to export, or use --all", file=sys.stderr)
+            return 2
+
+        stream = None
+        if self.is_stream_target(args.output):
+            if len(theme_names) != 1:
+                print("Only one theme can be streamed at a time", file=sys.stderr)
+                return 2
+            stream = self.open_stream_target(args.output)
+        else:
+            os.makedirs(args.output, exist_ok=True)
+
+        def export(theme_name: str) -> int:
+            started_at = time.perf_counter()
+            record: dict[str, Any] = {"operation": "export", "theme": theme_name, "compression": args.compression}
+            existing = self.__konsave_interface.get_existing(theme_name)
+            if existing is None:
+                return self.report({**record, "status": "failed", "error": "theme not found"}, started_at)
+            worker = ExportWorker(existing[1], args.output, args.compression, stream)
+            record.update(self.run_worker(worker))
+            if worker.archive_path:
+                record["archive"] = worker.archive_path
+            export_report = worker.export_report
+            if export_report:
+                record.update(
+                    bytes=export_report.compressed_bytes,
+                    uncompressed_bytes=export_report.uncompressed_bytes,
+                    ratio=round(export_report.get_ratio(), 3),
+                    mb_per_s=round(export_report.uncompressed_bytes / 1_000_000 / max(export_report.seconds, 1e-6), 2),
+                )
+            return self.report(record, started_at)
+
+        try:
+            return self.run_all(export, theme_names, args.jobs)
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def import_themes(self, args: argparse.Namespace) -> int:
+        from shared.resources.import_worker import ImportWorker
+
+        file_paths = self.collect_archives(args.paths)
+
+        # same rule as the GUI: a name that already exists, or repeats in this batch, is not imported
+        queued_names = set()
+        conflicts = set()
+        for file_path in file_paths:
+            theme_name = OsInterface.get_filename_without_extension(file_path)
+            if self.__konsave_interface.get_existing(theme_name) or theme_name.lower() in queued_names:
+                conflicts.add(file_path)
+            queued_names.add(theme_name.lower())
+
+        def import_file(file_path: str) -> int:
+            started_at = time.perf_counter()
+            record: dict[str, Any] = {"operation": "import", "path": file_path}
+            if file_path in conflicts:
+                return self.report({**record, "status": "skipped", "error": "theme already exists"}, started_at)
+            if not os.path.isfile(file_path):
+                return self.report({**record, "status": "failed", "error": "file not found"}, started_at)
+            worker = ImportWorker(file_path, args.verify)
+            record.update(self.run_worker(worker))
+            if worker.archive_info:
+                record.update(self.get_archive_fields(worker.archive_info))
+            return self.report(record, started_at)
+
+        return self.run_all(import_file, file_paths, args.jobs)
+
+    def inspect_archives(self, args: argparse.Namespace) -> int:
+        from shared.knsv_inspector import KnsvInspector
+
+        def inspect(file_path: str) -> int:
+            started_at = time.perf_counter()
+            info = KnsvInspector.inspect(file_path, args.deep)
+            problems = KnsvInspector.get_import_problems(info)
+            record: dict[str, Any] = {
+                "operation": "inspect",
+                "path": file_path,
+                "status": "failed" if problems else "ok",
+                **self.get_archive_fields(info),
+            }
+            if problems:
+                record["error"] = "; ".join(problems)
+            return self.report(record, started_at)
+
+        return self.run_all(inspect, self.collect_archives(args.paths), 1)
+
+    @staticmethod
+    def collect_archives(paths: list[str]) -> list[str]:
+        file_paths = []
+        for path in paths:
+            if os.path.isdir(path):
+                with os.scandir(path) as entries:
+                    file_paths += sorted(e.path for e in entries if e.is_file() and e.name.endswith(EXPORT_EXTENSION))
+            else:
+                file_paths.append(path)
+        return file_paths
+
+    @staticmethod
+    def get_archive_fields(info) -> dict[str, Any]:
+        return {
+            "theme": info.theme_name,
+            "embedded_name": info.embedded_name,
+            "files": info.file_count,
+            "bytes": info.compressed_bytes,
+            "uncompressed_bytes": info.uncompressed_bytes,
+        }
+
+    def apply_theme(self, args: argparse.Namespace) -> int:
+        from shared.resources.apply_worker import ApplyWorker
+
+        started_at = time.perf_counter()
+        record: dict[str, Any] = {"operation": "apply", "theme": args.theme, "reload": args.reload}
+        existing = self.__konsave_interface.get_existing(args.theme)
+        if existing is None:
+            return self.report({**record, "status": "failed", "error": "theme not found"}, started_at)
+        worker = ApplyWorker(existing[1], args.reload)
+        stages: dict[str, float] = {}
+        worker.stage_finished.connect(
+            lambda label, seconds: stages.update({label: round(seconds, 3)}), type=self.get_direct_connection()
+        )
+        record.update(self.run_worker(worker), stages=stages)
+        if record["status"] == "ok":
+            self.write_active_theme(existing[1])
+        return self.report(record, started_at)
+
+    def run_all(self, operation, items: list[str], jobs: int) -> int:
+        if not items:
+            return 0
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            return max(pool.map(operation, items))
+
+    def run_worker(self, worker) -> dict[str, Any]:
+        result: dict[str, Any] = {"status": "failed", "error": "worker finished without a result"}
+        direct = self.get_direct_connection()
+        worker.finished.connect(lambda: result.update(status="ok", error=None), type=direct)
+        worker.failed.connect(lambda error: result.update(status="failed", error=error), type=direct)
+        worker.cancelled.connect(lambda: result.update(status="cancelled", error=None), type=direct)
+        worker.run()
+        return {key: value for key, value in result.items() if value is not None}
+
+    def report(self, record: dict[str, Any], started_at: float) -> int:
+        record["seconds"] = round(time.perf_counter() - started_at, 3)
+        with self._output_lock:
+            if self.json:
+                print(json.dumps(record), file=self.output, flush=True)
+            else:
+                subject = record.get("theme") or record.get("path") or ""
+                details = record.get("error") or record.get("archive") or ""
+                line = f"{record['status']:<9}{record['operation']:<8}{subject}  {record['seconds']:.2f}s  {details}"
+                print(line.rstrip(), file=self.output, flush=True)
+        return 0 if record["status"] in ("ok", "skipped") else 1
+
+    @staticmethod
+    def is_stream_target(output: str) -> bool:
+        if output == "-":
+            return True
+        try:
+            mode = os.stat(output).st_mode
+        except OSError:
+            return False
+        return stat.S_ISFIFO(mode) or stat.S_ISCHR(mode) or stat.S_ISSOCK(mode)
+
+    def open_stream_target(self, output: str) -> BinaryIO:
+        if output != "-":
+            return open(output, "wb")
+        # the archive takes the real stdout, so the results move to stderr
+        stream = os.fdopen(os.dup(self.output.fileno()), "wb")
+        self.output = sys.stderr
+        return stream
+
+    @staticmethod
+    def write_active_theme(theme_name: str) -> None:
+        # what the All Themes window records, so it highlights the theme applied from here too
+        cache_file = Config.get_cache_file("last_applied_theme")
+        if not cache_file:
+            return
+        try:
+            with open(os.path.join(OsInterface.get_cache_path(), cache_file), "w", encoding="utf-8") as f:
+                f.write(theme_name)
+        except OSError as e:
+            print(f"Could not record the applied theme. Error: {e}", file=sys.stderr)
+
+    @staticmethod
+    def get_direct_connection():
+        # imported on first use: listing themes does not need Qt at all
+        from PyQt6.QtCore import Qt
+
+        return Qt.ConnectionType.DirectConnection
@@ -1,7 +1,53 @@
-from pathlib import Path
 from typing import Optional
 
-_CONFIG = {"app_name": "KonUI", "QSS_directory": "QSS", "cache_files": {"last_applied_theme": "last_applied_theme.txt"}}
+_CONFIG = {
+    "app_name": "KonUI",
+    "QSS_directory": "QSS",
+    "assets_directory": "assets",
+    # built with 'python -m shared.resource_loader'; stylesheets and assets are read from it while it is newer
+    # than their folders
+    "resource_bundle": "konui.rcc",
+    # re-apply a window's stylesheet as soon as its QSS file is saved (the bundle is not used while this is on)
+    "qss_hot_reload": False,
+    "cache_files": {
+        "last_applied_theme": "last_applied_theme.txt",
+        "last_export_directory": "last_export_directory.txt",
+    },
+    # "subprocess" runs the konsave command for every operation, "in_process" calls konsave's functions directly
+    # (faster, but konsave only reports their failures by printing, so KonUI infers them from what is on disk)
+    "konsave_backend": "subprocess",
+    # how long probed versions of konsave, plasmashell and systemd are reused across launches
+    "capability_cache_max_age_s": 24 * 60 * 60,
+    # "konsave" runs 'konsave -e', "native" streams the archive in-process (needs PyYAML)
+    "export_backend": "konsave",
+    # "default" (konsave's deflate), "store" (no compression, fastest), "fast" or "max" deflate;
+    # anything but "default" always uses the native exporter, as konsave has no such option
+    "export_compression": "default",
+    "max_concurrent_exports": 2,
+    "max_concurrent_imports": 2,
+    # before importing, also decompress the whole archive to check every CRC (the central directory and the
+    # local headers are always checked)
+    "import_verify_crc": False,
+    # "konsave" runs 'konsave -a', "differential" only copies the files that differ (needs PyYAML)
+    "apply_mode": "konsave",
+    # "konsave" runs 'konsave -s', "incremental" only copies the files changed since the last save (needs PyYAML)
+    "save_mode": "konsave",
+    # keep an extra, deduplicated copy of every saved/imported profile under KonUI's data directory
+    # (on top of konsave's own profile folders, which are left untouched)
+    "dedup_store_enabled": False,
+    # colour swatches and wallpaper thumbnails next to theme names, cached under KonUI's cache directory
+    "previews_enabled": True,
+    "preview_cache_max_bytes": 20_000_000,
+    # follow profiles created or removed outside the All Themes window (terminal, another KonUI) while it is open;
+    # a burst of changes is applied once nothing has changed for profile_watch_delay_ms
+    "profile_watch_enabled": True,
+    "profile_watch_delay_ms": 250,
+    # opt-in trace of subprocess calls, Konsave operations and GUI stalls (also enabled by launching with --trace)
+    "trace_enabled": False,
+    "trace_stall_threshold_ms": 250,
+    "trace_max_bytes": 2_000_000,
+    "trace_backups": 3,
+}
 
 
 class Config:
@@ -10,15 +56,92 @@ class Config:
         return _CONFIG["app_name"]
 
     @staticmethod
-    def get_window_qss(filepath: Path) -> str:
-        try:
-            window_name = filepath.stem
-            qss_folder_path = Path().cwd() / _CONFIG["QSS_directory"]
-            with open(qss_folder_path / f"{window_name}.qss", "r") as file:
-                return file.read()
-        except FileNotFoundError:
-            print(f"QSS file for window '{window_name}' not found")
-            return ""
+    def get_qss_directory() -> str:
+        return _CONFIG["QSS_directory"]
+
+    @staticmethod
+    def get_assets_directory() -> str:
+        return _CONFIG["assets_directory"]
+
+    @staticmethod
+    def get_resource_bundle() -> str:
+        return _CONFIG["resource_bundle"]
+
+    @staticmethod
+    def is_qss_hot_reload_enabled() -> bool:
+        return _CONFIG["qss_hot_reload"]
+
+    @staticmethod
+    def get_konsave_backend() -> str:
+        return _CONFIG["konsave_backend"]
+
+    @staticmethod
+    def get_capability_cache_max_age_s() -> int:
+        return _CONFIG["capability_cache_max_age_s"]
+
+    @staticmethod
+    def get_export_backend() -> str:
+        return _CONFIG["export_backend"]
+
+    @staticmethod
+    def get_export_compression() -> str:
+        return _CONFIG["export_compression"]
+
+    @staticmethod
+    def get_max_concurrent_exports() -> int:
+        return _CONFIG["max_concurrent_exports"]
+
+    @staticmethod
+    def get_max_concurrent_imports() -> int:
+        return _CONFIG["max_concurrent_imports"]
+
+    @staticmethod
+    def is_import_crc_verification_enabled() -> bool:
+        return _CONFIG["import_verify_crc"]
+
+    @staticmethod
+    def get_apply_mode() -> str:
+        return _CONFIG["apply_mode"]
+
+    @staticmethod
+    def get_save_mode() -> str:
+        return _CONFIG["save_mode"]
+
+    @staticmethod
+    def is_dedup_store_enabled() -> bool:
+        return _CONFIG["dedup_store_enabled"]
+
+    @staticmethod
+    def are_previews_enabled() -> bool:
+        return _CONFIG["previews_enabled"]
+
+    @staticmethod
+    def is_profile_watch_enabled() -> bool:
+        return _CONFIG["profile_watch_enabled"]
+
+    @staticmethod
+    def get_profile_watch_delay_ms() -> int:
+        return _CONFIG["profile_watch_delay_ms"]
+
+    @staticmethod
+    def get_preview_cache_max_bytes() -> int:
+        return _CONFIG["preview_cache_max_bytes"]
+
+    @staticmethod
+    def is_trace_enabled() -> bool:
+        return _CONFIG["trace_enabled"]
+
+    @staticmethod
+    def get_trace_stall_threshold_ms() -> int:
+        return _CONFIG["trace_stall_threshold_ms"]
+
+    @staticmethod
+    def get_trace_max_bytes() -> int:
+        return _CONFIG["trace_max_bytes"]
+
+    @staticmethod
+    def get_trace_backups() -> int:
+        return _CONFIG["trace_backups"]
 
     @staticmethod
     def get_cache_file(key: str) -> Optional[str]:
@@ -0,0 +1,84 @@
+import os
+import shutil
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from shared.file_index import FileIndex
+from shared.konsave_config import KonsaveConfig
+
+
+class FileChange(NamedTuple):
+    source: str
+    target: str
+    size: int
+    # "new" when the live file does not exist, "modified" when its content differs
+    reason: str
+
+
+class ApplyPlan(NamedTuple):
+    changes: list[FileChange]
+    skipped_files: int
+    skipped_bytes: int
+
+
+class ApplyReport(NamedTuple):
+    copied_files: int
+    copied_bytes: int
+    skipped_files: int
+    skipped_bytes: int
+
+
+class DifferentialApplier:
+    # Does what 'konsave -a' does (copy every file of each saved section over its location)
+    # but leaves alone the live files whose content already matches the profile
+
+    def __init__(self, file_index: Optional[FileIndex] = None):
+        self.file_index = file_index or FileIndex("apply_file_index.json")
+
+    def plan(self, theme_name: str) -> ApplyPlan:
+        changes = []
+        skipped_files = skipped_bytes = 0
+        for source, target in self._iter_files(theme_name):
+            source_stat = os.stat(source)
+            try:
+                target_stat = os.stat(target)
+            except FileNotFoundError:
+                changes.append(FileChange(source, target, source_stat.st_size, "new"))
+                continue
+            if source_stat.st_size != target_stat.st_size or self.file_index.get_digest(
+                source, source_stat
+            ) != self.file_index.get_digest(target, target_stat):
+                changes.append(FileChange(source, target, source_stat.st_size, "modified"))
+                continue
+            skipped_files += 1
+            skipped_bytes += source_stat.st_size
+        self.file_index.save()
+        return ApplyPlan(changes, skipped_files, skipped_bytes)
+
+    def apply(self, theme_name: str, plan: Optional[ApplyPlan] = None) -> ApplyReport:
+        plan = plan or self.plan(theme_name)
+        copied_bytes = 0
+        for change in plan.changes:
+            os.makedirs(os.path.dirname(change.target), exist_ok=True)
+            # same as konsave: replace the file instead of writing through an existing link
+            if os.path.lexists(change.target):
+                os.remove(change.target)
+            shutil.copy(change.source, change.target)
+            # the copy has the profile file's content, so its digest is already known
+            source_entry = self.file_index.get_entry(change.source)
+            if source_entry:
+                self.file_index.record(change.target, source_entry[2])
+            copied_bytes += change.size
+        self.file_index.save()
+        return ApplyReport(len(plan.changes), copied_bytes, plan.skipped_files, plan.skipped_bytes)
+
+    def _iter_files(self, theme_name: str) -> Iterator[Tuple[str, str]]:
+        profile_path = KonsaveConfig.get_profile_path(theme_name)
+        config = KonsaveConfig.read_profile(theme_name)
+        for section_name, section in config["save"].items():
+            section_path = os.path.join(profile_path, section_name)
+            for directory, _, files in os.walk(section_path, followlinks=True):
+                relative_directory = os.path.relpath(directory, section_path)
+                for file_name in files:
+                    source = os.path.join(directory, file_name)
+                    target = os.path.normpath(os.path.join(section["location"], relative_directory, file_name))
+                    yield source, target
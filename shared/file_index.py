@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+from shared.os_interface import OsInterface
+
+
+class FileIndex:
+    # Persisted path -> (size, mtime_ns, digest) map: a file is only hashed again once its size or mtime changes
+
+    def __init__(self, index_name: str):
+        self.index_path = os.path.join(OsInterface.get_cache_path(), index_name)
+        self._lock = threading.Lock()
+        self._entries: dict[str, list] = {}
+        self._dirty = False
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                self._entries = json.load(file)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as file:
+            while chunk := file.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_digest(self, path: str, stat: Optional[os.stat_result] = None) -> str:
+        stat = stat or os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = self.hash_file(path)
+        self.record(path, digest, stat)
+        return digest
+
+    def get_entry(self, path: str) -> Optional[list]:
+        with self._lock:
+            return self._entries.get(path)
+
+    def is_unchanged(self, path: str, stat: os.stat_result) -> bool:
+        entry = self.get_entry(path)
+        return bool(entry) and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns
+
+    def record(self, path: str, digest: str, stat: Optional[os.stat_result] = None) -> None:
+        stat = stat or os.stat(path)
+        with self._lock:
+            self._entries[path] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._dirty = True
+
+    def forget(self, path: str) -> None:
+        with self._lock:
+            if self._entries.pop(path, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            partial_path = f"{self.index_path}.part"
+            with open(partial_path, "w", encoding="utf-8") as file:
+                json.dump(self._entries, file)
+            os.replace(partial_path, self.index_path)
+            self._dirty = False
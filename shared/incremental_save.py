@@ -0,0 +1,125 @@
+import hashlib
+import os
+import shutil
+import threading
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from shared.file_index import FileIndex
+from shared.konsave_config import KonsaveConfig
+from shared.os_interface import OsInterface
+
+
+class SaveCancelledError(Exception):
+    pass
+
+
+class SaveReport(NamedTuple):
+    copied_files: int
+    copied_bytes: int
+    skipped_files: int
+    skipped_bytes: int
+
+
+class IncrementalSaver:
+    # Does what 'konsave -s <name> -f' does (copy every "save" entry of the global conf.yaml into the profile,
+    # never deleting files already in it) but only copies again the files changed since the last save.
+    # The index is kept per profile, keyed by the live path, so two profiles never share copy state
+
+    def __init__(self, theme_name: str):
+        self.theme_name = theme_name
+        self.profile_path = KonsaveConfig.get_profile_path(theme_name)
+        self.file_index = FileIndex(self.get_index_name(theme_name))
+
+    @staticmethod
+    def get_index_name(theme_name: str) -> str:
+        return f"save_index_{theme_name}.json"
+
+    @staticmethod
+    def remove_index(theme_name: str) -> None:
+        try:
+            os.remove(os.path.join(OsInterface.get_cache_path(), IncrementalSaver.get_index_name(theme_name)))
+        except FileNotFoundError:
+            pass
+
+    def collect_files(self) -> Tuple[list[str], list[Tuple[str, str]]]:
+        # (profile directories to create, (live file, profile file) pairs)
+        config = KonsaveConfig.read(KonsaveConfig.get_global_config_path())
+        directories, files = [], []
+        for section_name, section in config["save"].items():
+            section_path = os.path.join(self.profile_path, section_name)
+            directories.append(section_path)
+            for entry in section["entries"]:
+                source = os.path.join(section["location"], entry)
+                target = os.path.join(section_path, entry)
+                if os.path.isdir(source):
+                    for directory, _, file_names in os.walk(source, followlinks=True):
+                        target_directory = os.path.normpath(os.path.join(target, os.path.relpath(directory, source)))
+                        directories.append(target_directory)
+                        files.extend(
+                            (os.path.join(directory, name), os.path.join(target_directory, name)) for name in file_names
+                        )
+                elif os.path.exists(source):
+                    files.append((source, target))
+        return directories, files
+
+    def save(
+        self,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> SaveReport:
+        directories, files = self.collect_files()
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+
+        copied_files = copied_bytes = skipped_files = skipped_bytes = 0
+        try:
+            for number, (source, target) in enumerate(files, start=1):
+                if cancel_event and cancel_event.is_set():
+                    raise SaveCancelledError()
+                stat = os.stat(source)
+                if self._is_saved(source, target, stat):
+                    skipped_files += 1
+                    skipped_bytes += stat.st_size
+                else:
+                    self.file_index.record(source, self._copy_file(source, target), stat)
+                    copied_files += 1
+                    copied_bytes += stat.st_size
+                if progress_callback:
+                    progress_callback(number, len(files))
+        finally:
+            # whatever was copied before a cancel or an error is recorded, so the next save skips it
+            self.file_index.save()
+
+        shutil.copy(KonsaveConfig.get_global_config_path(), self.profile_path)
+        return SaveReport(copied_files, copied_bytes, skipped_files, skipped_bytes)
+
+    def _is_saved(self, source: str, target: str, stat: os.stat_result) -> bool:
+        try:
+            if os.stat(target).st_size != stat.st_size:
+                return False
+        except FileNotFoundError:
+            return False
+        if self.file_index.is_unchanged(source, stat):
+            return True
+        # touched but maybe not modified: compare the content with what was copied last time
+        entry = self.file_index.get_entry(source)
+        if entry is None:
+            return False
+        digest = FileIndex.hash_file(source)
+        if digest != entry[2]:
+            return False
+        self.file_index.record(source, digest, stat)
+        return True
+
+    @staticmethod
+    def _copy_file(source: str, target: str) -> str:
+        # hashes while copying, so a changed file is only read once
+        if os.path.lexists(target):
+            os.remove(target)
+        digest = hashlib.blake2b(digest_size=20)
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            while chunk := src.read(1024 * 1024):
+                digest.update(chunk)
+                dst.write(chunk)
+        shutil.copymode(source, target)
+        return digest.hexdigest()
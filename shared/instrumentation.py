@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from typing import Any, Iterator, Optional
+
+from shared.config import Config
+
+
+class Instrumentation:
+    # Opt-in trace of what KonUI waits on: one JSON object per line in the cache folder, rotated by size.
+    # Everything here is a no-op until enable() is called, apart from running the wrapped command
+    trace_name = "trace.jsonl"
+
+    _lock = threading.Lock()
+    _logger: Optional[logging.Logger] = None
+
+    @classmethod
+    def enable(cls, trace_file: Optional[str] = None) -> str:
+        with cls._lock:
+            if cls._logger is None:
+                trace_file = trace_file or cls.get_trace_file()
+                handler = RotatingFileHandler(
+                    trace_file,
+                    maxBytes=Config.get_trace_max_bytes(),
+                    backupCount=Config.get_trace_backups(),
+                    encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("konui.trace")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(handler)
+                cls._logger = logger
+            return cls._logger.handlers[0].baseFilename
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._logger is not None
+
+    @classmethod
+    def record(cls, event: str, **fields: Any) -> None:
+        if cls._logger is None:
+            return
+        entry = {"time": round(time.time(), 3), "event": event, "thread": threading.current_thread().name, **fields}
+        cls._logger.info(json.dumps(entry, default=str))
+
+    @classmethod
+    def run(cls, command: list[str], **kwargs: Any) -> subprocess.CompletedProcess:
+        # subprocess.run, plus a "subprocess" record of its wall time, exit code and output size
+        started_at = time.perf_counter()
+        returncode: Optional[int] = None
+        output_bytes = 0
+        try:
+            result = subprocess.run(command, **kwargs)
+            returncode = result.returncode
+            output_bytes = cls._get_size(result.stdout) + cls._get_size(result.stderr)
+            return result
+        except subprocess.CalledProcessError as e:
+            returncode = e.returncode
+            output_bytes = cls._get_size(e.stdout) + cls._get_size(e.stderr)
+            raise
+        finally:
+            cls.record_process(command, started_at, returncode, output_bytes)
+
+    @classmethod
+    def record_process(
+        cls, command: list[str], started_at: float, returncode: Optional[int], output_bytes: int
+    ) -> None:
+        # also called directly for processes that are not started through run(), started_at from perf_counter
+        cls.record(
+            "subprocess",
+            command=command,
+            wall_ms=round((time.perf_counter() - started_at) * 1000, 2),
+            returncode=returncode,
+            output_bytes=output_bytes,
+        )
+
+    @classmethod
+    @contextmanager
+    def span(cls, event: str, **fields: Any) -> Iterator[None]:
+        # times the block, recording whether it raised
+        started_at = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if cls._logger is not None:
+                cls.record(event, wall_ms=round((time.perf_counter() - started_at) * 1000, 2), error=error, **fields)
+
+    @classmethod
+    def get_trace_file(cls) -> str:
+        # imported here: OsInterface runs its commands through this class
+        from shared.os_interface import OsInterface
+
+        return os.path.join(OsInterface.get_cache_path(), cls.trace_name)
+
+    @staticmethod
+    def _get_size(output: Any) -> int:
+        return len(output) if isinstance(output, (str, bytes)) else 0
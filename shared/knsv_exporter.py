@@ -0,0 +1,235 @@
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Callable, NamedTuple, Optional, Tuple, Union
+
+from shared.konsave_config import KonsaveConfig
+
+EXPORT_EXTENSION = ".knsv"
+# archive comment naming the exported profile, which konsave ignores; read back by KnsvInspector
+ARCHIVE_COMMENT_PREFIX = "konui-profile:"
+# zip method and deflate level of every export_compression setting; "default" is what konsave writes
+COMPRESSION_LEVELS = {
+    "default": (zipfile.ZIP_DEFLATED, None),
+    "store": (zipfile.ZIP_STORED, None),
+    "fast": (zipfile.ZIP_DEFLATED, 1),
+    "max": (zipfile.ZIP_DEFLATED, 9),
+}
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class ExportCancelledError(Exception):
+    pass
+
+
+class ExportReport(NamedTuple):
+    uncompressed_bytes: int
+    compressed_bytes: int
+    seconds: float
+
+    def get_ratio(self) -> float:
+        # archive size over the size of the files it holds: 1.0 means nothing was saved by compressing
+        return self.compressed_bytes / self.uncompressed_bytes if self.uncompressed_bytes else 1.0
+
+
+class _CountingWriter:
+    # write-only wrapper counting what goes into a pipe; without tell() zipfile streams the archive
+    # (sizes in data descriptors after each entry) instead of seeking back into it
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.written_bytes = 0
+
+    def write(self, data: bytes) -> int:
+        self.stream.write(data)
+        self.written_bytes += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class KnsvExporter:
+    # Writes the same archive layout as 'konsave -e' (conf.yaml, save/<section>/..., export/<section>/...)
+    # straight into a zip file, without konsave's intermediate copy of the whole profile
+
+    def __init__(
+        self,
+        compression: int = zipfile.ZIP_DEFLATED,
+        compress_level: Optional[int] = None,
+        read_workers: int = 4,
+        chunk_size: int = 1024 * 1024,
+        max_buffered_bytes: int = 32 * 1024 * 1024,
+    ):
+        self.compression = compression
+        self.compress_level = compress_level
+        self.read_workers = read_workers
+        self.chunk_size = chunk_size
+        # Files up to chunk_size are read ahead in parallel, so this caps how many can be in memory at once
+        self.prefetch_window = max(1, max_buffered_bytes // chunk_size)
+
+    @classmethod
+    def for_compression(cls, compression: str, **kwargs) -> "KnsvExporter":
+        if compression not in COMPRESSION_LEVELS:
+            raise ValueError(f"Unknown compression '{compression}', expected one of: {', '.join(COMPRESSION_LEVELS)}")
+        method, level = COMPRESSION_LEVELS[compression]
+        return cls(method, level, **kwargs)
+
+    @staticmethod
+    def get_default_export_path(theme_name: str, directory: Optional[str] = None) -> str:
+        # Same naming rule konsave follows: never overwrite, append a timestamp instead
+        export_path = os.path.join(directory or os.getcwd(), theme_name)
+        while any(os.path.exists(f"{export_path}{ext}") for ext in ("", EXPORT_EXTENSION, ".zip")):
+            export_path = f"{export_path}_{datetime.now():%d-%m-%Y:%H-%M-%S}"
+        return f"{export_path}{EXPORT_EXTENSION}"
+
+    def collect_entries(self, theme_name: str) -> list[Tuple[str, str, int]]:
+        # (source path, archive name, size) in the order they will be written
+        profile_path = KonsaveConfig.get_profile_path(theme_name)
+        if not os.path.isdir(profile_path):
+            raise FileNotFoundError(f"Profile '{theme_name}' not found")
+
+        config_path = os.path.join(profile_path, "conf.yaml")
+        if not os.path.exists(config_path):
+            config_path = KonsaveConfig.get_global_config_path()
+        config = KonsaveConfig.read(config_path)
+
+        entries = [(config_path, "conf.yaml", os.path.getsize(config_path))]
+        entries.append(("", "save/", 0))
+        for section_name in config["save"]:
+            self._collect_tree(os.path.join(profile_path, section_name), f"save/{section_name}", entries)
+        entries.append(("", "export/", 0))
+        for section_name in config["export"]:
+            entries.append(("", f"export/{section_name}/", 0))
+        for section_name, entry, source in KonsaveConfig.get_export_sources(config):
+            self._collect_tree(source, f"export/{section_name}/{entry}", entries)
+        return entries
+
+    def export(
+        self,
+        theme_name: str,
+        destination: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> ExportReport:
+        started_at = time.perf_counter()
+        entries = self.collect_entries(theme_name)
+        total_bytes = sum(size for _, _, size in entries)
+        partial_path = f"{destination}.part"
+        try:
+            self._write_archive(entries, total_bytes, partial_path, theme_name, progress_callback, cancel_event)
+            os.replace(partial_path, destination)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        return ExportReport(total_bytes, os.path.getsize(destination), time.perf_counter() - started_at)
+
+    def export_to_stream(
+        self,
+        theme_name: str,
+        stream: BinaryIO,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> ExportReport:
+        # the archive goes straight into an already open stream (stdout, a pipe, a socket...), in one pass
+        # and without a temporary file; what was written before a failure or cancel stays written
+        started_at = time.perf_counter()
+        entries = self.collect_entries(theme_name)
+        total_bytes = sum(size for _, _, size in entries)
+        writer = _CountingWriter(stream)
+        self._write_archive(entries, total_bytes, writer, theme_name, progress_callback, cancel_event)
+        writer.flush()
+        return ExportReport(total_bytes, writer.written_bytes, time.perf_counter() - started_at)
+
+    def _write_archive(
+        self,
+        entries: list[Tuple[str, str, int]],
+        total_bytes: int,
+        target: Union[str, BinaryIO],
+        theme_name: str,
+        progress_callback: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> None:
+        read_bytes = 0
+        pending: deque[Tuple[str, str, int, Optional[Future]]] = deque()
+        remaining = iter(entries)
+
+        with ThreadPoolExecutor(max_workers=self.read_workers) as pool, zipfile.ZipFile(
+            target, "w", compression=self.compression, compresslevel=self.compress_level
+        ) as archive:
+            archive.comment = f"{ARCHIVE_COMMENT_PREFIX}{theme_name}".encode("utf-8")[:0xFFFF]
+
+            def schedule_next() -> None:
+                for source, arcname, size in remaining:
+                    is_small_file = source and not arcname.endswith("/") and size <= self.chunk_size
+                    future = pool.submit(self._read_file, source) if is_small_file else None
+                    pending.append((source, arcname, size, future))
+                    return
+
+            for _ in range(self.prefetch_window):
+                schedule_next()
+
+            while pending:
+                source, arcname, size, future = pending.popleft()
+                schedule_next()
+                if cancel_event and cancel_event.is_set():
+                    for *_, queued in pending:
+                        if queued:
+                            queued.cancel()
+                    raise ExportCancelledError()
+
+                if arcname.endswith("/"):
+                    archive.writestr(arcname, b"")
+                elif future:
+                    archive.writestr(
+                        self._new_zip_info(source, arcname), future.result(), compresslevel=self.compress_level
+                    )
+                    read_bytes += size
+                else:
+                    for chunk_length in self._stream_file(archive, source, arcname, size, cancel_event):
+                        read_bytes += chunk_length
+                        if progress_callback:
+                            progress_callback(read_bytes, total_bytes)
+                    continue
+
+                if progress_callback:
+                    progress_callback(read_bytes, total_bytes)
+
+    def _stream_file(self, archive: zipfile.ZipFile, source: str, arcname: str, size: int, cancel_event):
+        zip_info = self._new_zip_info(source, arcname)
+        with open(source, "rb") as src, archive.open(zip_info, "w", force_zip64=size >= zipfile.ZIP64_LIMIT) as dst:
+            while chunk := src.read(self.chunk_size):
+                if cancel_event and cancel_event.is_set():
+                    raise ExportCancelledError()
+                dst.write(chunk)
+                yield len(chunk)
+
+    def _new_zip_info(self, source: str, arcname: str) -> zipfile.ZipInfo:
+        zip_info = zipfile.ZipInfo.from_file(source, arcname)
+        zip_info.compress_type = self.compression
+        # ZipFile.open() takes the level from the entry it is handed (a public attribute since Python 3.13,
+        # which KonUI requires; older versions stream large files at the default level)
+        if hasattr(zip_info, "compress_level"):
+            zip_info.compress_level = self.compress_level
+        return zip_info
+
+    @staticmethod
+    def _read_file(source: str) -> bytes:
+        with open(source, "rb") as file:
+            return file.read()
+
+    @staticmethod
+    def _collect_tree(source: str, arcname: str, entries: list[Tuple[str, str, int]]) -> None:
+        if os.path.isfile(source):
+            entries.append((source, arcname, os.path.getsize(source)))
+            return
+        if not os.path.isdir(source):
+            return
+        entries.append(("", f"{arcname}/", 0))
+        for entry in sorted(os.scandir(source), key=lambda e: e.name):
+            KnsvExporter._collect_tree(entry.path, f"{arcname}/{entry.name}", entries)
@@ -0,0 +1,157 @@
+import mmap
+import os
+import shutil
+import struct
+import zipfile
+from typing import NamedTuple, Optional
+
+from shared.knsv_exporter import ARCHIVE_COMMENT_PREFIX, EXPORT_EXTENSION
+from shared.konsave_config import KonsaveConfig
+from shared.os_interface import OsInterface
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+# bit 3: CRC and sizes follow the data in a descriptor and are zero in the local header
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+
+class ArchiveInfo(NamedTuple):
+    path: str
+    # the name konsave imports the profile as, taken from the file name
+    theme_name: str
+    # the name the profile was exported as, when the archive was written by KonUI
+    embedded_name: Optional[str]
+    file_count: int
+    compressed_bytes: int
+    uncompressed_bytes: int
+    errors: tuple[str, ...]
+
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+class KnsvInspector:
+    # Checks a .knsv file before konsave extracts it, reading only the central directory at the end of the
+    # archive and the local header of every entry (the file is memory-mapped, so nothing else is paged in).
+    # A deep check also decompresses every entry and compares its CRC, still without writing anything
+
+    @staticmethod
+    def inspect(path: str, deep: bool = False) -> ArchiveInfo:
+        theme_name = OsInterface.get_filename_without_extension(path)
+        if not path.endswith(EXPORT_EXTENSION):
+            return ArchiveInfo(path, theme_name, None, 0, 0, 0, (f"Not a {EXPORT_EXTENSION} file",))
+        try:
+            with open(path, "rb") as file:
+                try:
+                    source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    # empty files and filesystems that cannot be mapped
+                    source = file
+                try:
+                    return KnsvInspector._inspect_archive(path, theme_name, source, deep)
+                finally:
+                    if source is not file:
+                        source.close()
+        except OSError as e:
+            return ArchiveInfo(path, theme_name, None, 0, 0, 0, (f"Cannot read the file: {e}",))
+
+    @staticmethod
+    def _inspect_archive(path: str, theme_name: str, source, deep: bool) -> ArchiveInfo:
+        try:
+            archive = zipfile.ZipFile(source)
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, ValueError) as e:
+            return ArchiveInfo(path, theme_name, None, 0, 0, 0, (f"Not a valid archive: {e}",))
+
+        with archive:
+            entries = archive.infolist()
+            files = [entry for entry in entries if not entry.is_dir()]
+            comment = archive.comment.decode("utf-8", errors="replace")
+            embedded_name = None
+            if comment.startswith(ARCHIVE_COMMENT_PREFIX):
+                embedded_name = comment[len(ARCHIVE_COMMENT_PREFIX) :]
+
+            errors = []
+            names = {entry.filename for entry in entries}
+            if "conf.yaml" not in names:
+                errors.append("Not a Konsave export: conf.yaml is missing")
+            unsafe = [name for name in names if name.startswith("/") or ".." in name.split("/")]
+            if unsafe:
+                errors.append(f"Unsafe path in the archive: '{unsafe[0]}'")
+            errors += KnsvInspector._check_local_headers(source, entries)
+            if deep and not errors:
+                try:
+                    # read through the file itself: the data is decompressed once, mapping it gains nothing
+                    with zipfile.ZipFile(path) as data:
+                        corrupt_entry = data.testzip()
+                except (zipfile.BadZipFile, OSError, EOFError, NotImplementedError) as e:
+                    corrupt_entry = str(e)
+                if corrupt_entry:
+                    errors.append(f"Corrupt data (CRC mismatch) in '{corrupt_entry}'")
+
+            return ArchiveInfo(
+                path,
+                theme_name,
+                embedded_name,
+                len(files),
+                sum(entry.compress_size for entry in files),
+                sum(entry.file_size for entry in files),
+                tuple(errors),
+            )
+
+    @staticmethod
+    def _check_local_headers(source, entries: list[zipfile.ZipInfo]) -> list[str]:
+        # every entry's local header must sit where the central directory says and agree with it;
+        # a truncated or spliced archive fails here instead of half-way through the extraction
+        source.seek(0, os.SEEK_END)
+        archive_size = source.tell()
+        for entry in entries:
+            if not 0 <= entry.header_offset <= archive_size - _LOCAL_HEADER.size:
+                return [f"Archive is damaged or truncated at '{entry.filename}'"]
+            source.seek(entry.header_offset)
+            header = source.read(_LOCAL_HEADER.size)
+            if len(header) < _LOCAL_HEADER.size:
+                return [f"Archive is truncated at '{entry.filename}'"]
+            signature, _, flags, method, _, _, crc, compressed, _, name_length, extra_length = (
+                _LOCAL_HEADER.unpack(header)
+            )
+            if signature != _LOCAL_HEADER_SIGNATURE or method != entry.compress_type:
+                return [f"Damaged entry '{entry.filename}'"]
+            if not flags & _DATA_DESCRIPTOR_FLAG and crc != entry.CRC:
+                return [f"CRC of '{entry.filename}' does not match the central directory"]
+            # zip64 entries keep their real sizes in the extra field, 0xFFFFFFFF here
+            if not flags & _DATA_DESCRIPTOR_FLAG and compressed != 0xFFFFFFFF and compressed != entry.compress_size:
+                return [f"Size of '{entry.filename}' does not match the central directory"]
+            data_end = entry.header_offset + _LOCAL_HEADER.size + name_length + extra_length + entry.compress_size
+            if data_end > archive_size:
+                return [f"Archive is truncated at '{entry.filename}'"]
+        return []
+
+    @staticmethod
+    def get_import_problems(info: ArchiveInfo) -> list[str]:
+        # everything that would make 'konsave -i' fail, or fill the disk, found before it starts
+        problems = list(info.errors)
+        if os.path.exists(KonsaveConfig.get_profile_path(info.theme_name)):
+            problems.append(f"A theme named '{info.theme_name}' already exists")
+        # konsave extracts the whole archive into its own folder, then copies it into place
+        required_bytes = info.uncompressed_bytes * 2
+        free_bytes = KnsvInspector.get_free_bytes(OsInterface.get_konsave_profiles_path())
+        if free_bytes is not None and required_bytes > free_bytes:
+            problems.append(
+                f"Not enough free disk space: {required_bytes / 1_000_000:.1f} MB needed, "
+                f"{free_bytes / 1_000_000:.1f} MB available"
+            )
+        return problems
+
+    @staticmethod
+    def get_free_bytes(path: str) -> Optional[int]:
+        # the profiles folder may not exist yet, so the closest existing parent is measured
+        while path and not os.path.exists(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        try:
+            return shutil.disk_usage(path).free
+        except OSError as e:
+            print(f"Could not read free disk space. Error: {e}")
+            return None
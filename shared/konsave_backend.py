@@ -0,0 +1,166 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from importlib.resources import files
+from typing import Optional, Tuple
+
+from shared.config import Config
+from shared.instrumentation import Instrumentation
+
+
+class KonsaveBackendError(RuntimeError):
+    pass
+
+
+class KonsaveBackend(ABC):
+    # How KonsaveInterface talks to Konsave. Exports always go through the CLI: ExportWorker needs
+    # a process it can poll and terminate
+    name = ""
+    _default: Optional["KonsaveBackend"] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls) -> "KonsaveBackend":
+        # one backend per process, picked from Config the first time it is needed
+        with KonsaveBackend._lock:
+            if KonsaveBackend._default is None:
+                KonsaveBackend._default = KonsaveBackend.create(Config.get_konsave_backend())
+            return KonsaveBackend._default
+
+    @staticmethod
+    def create(name: str) -> "KonsaveBackend":
+        backends = {backend.name: backend for backend in (SubprocessBackend, InProcessBackend)}
+        backend_class = backends.get(name, SubprocessBackend)
+        try:
+            return backend_class()
+        except ImportError as e:
+            print(f"Konsave backend '{name}' is not available, using the konsave command instead. Error: {e}")
+            return SubprocessBackend()
+
+    @abstractmethod
+    def list_profiles(self) -> list[Tuple[int, str]]:
+        ...
+
+    @abstractmethod
+    def save(self, theme_name: str) -> None:
+        ...
+
+    @abstractmethod
+    def apply(self, theme_name: str) -> None:
+        ...
+
+    @abstractmethod
+    def remove(self, theme_name: str) -> None:
+        ...
+
+    @abstractmethod
+    def import_archive(self, path_to_file: str) -> None:
+        ...
+
+    def export(self, theme_name: str, directory: Optional[str] = None) -> subprocess.Popen:
+        # konsave writes its staging folder and the archive into its working directory
+        return subprocess.Popen(
+            ["konsave", "-e", theme_name], stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=directory
+        )
+
+
+class SubprocessBackend(KonsaveBackend):
+    name = "subprocess"
+
+    def list_profiles(self) -> list[Tuple[int, str]]:
+        process_result = Instrumentation.run(["konsave", "-l"], capture_output=True, text=True, check=True)
+        output = process_result.stdout.strip().splitlines()
+        profiles: list[Tuple[int, str]] = []
+        for p in output:
+            parts = p.split("\t")
+            if len(parts) == 2 and parts[0].isdigit():
+                profiles.append((int(parts[0]), parts[1]))
+        return profiles
+
+    def save(self, theme_name: str) -> None:
+        Instrumentation.run(["konsave", "-s", theme_name, "-f"], check=True)
+
+    def apply(self, theme_name: str) -> None:
+        Instrumentation.run(["konsave", "-a", theme_name], check=True)
+
+    def remove(self, theme_name: str) -> None:
+        Instrumentation.run(["konsave", "-r", theme_name], check=True)
+
+    def import_archive(self, path_to_file: str) -> None:
+        Instrumentation.run(["konsave", "-i", path_to_file], check=True)
+
+
+class InProcessBackend(KonsaveBackend):
+    # Calls konsave's own functions instead of starting an interpreter per operation. Those functions
+    # report failures by printing and returning None, so every call is checked against what it should
+    # have left on disk and raises like a failed subprocess would
+    name = "in_process"
+
+    def __init__(self):
+        # raises ImportError when konsave (or the PyYAML it needs) is not importable from this interpreter
+        from konsave import consts, funcs
+
+        self.consts = consts
+        self.funcs = funcs
+        self._ensure_config()
+
+    def list_profiles(self) -> list[Tuple[int, str]]:
+        # same listing as 'konsave -l': every entry of the profiles folder, sorted, numbered from 1
+        try:
+            names = sorted(os.listdir(self.consts.PROFILES_DIR))
+        except FileNotFoundError:
+            names = []
+        return [(index, name) for index, name in enumerate(names, start=1)]
+
+    def save(self, theme_name: str) -> None:
+        started_at = time.time()
+        self.funcs.save_profile(theme_name, self._get_profile_names(), force=True)
+        config_path = os.path.join(self._get_profile_path(theme_name), "conf.yaml")
+        # 1s of slack for filesystems with coarse timestamps
+        if not os.path.exists(config_path) or os.stat(config_path).st_mtime < started_at - 1:
+            raise KonsaveBackendError(f"Konsave did not save theme '{theme_name}'")
+
+    def apply(self, theme_name: str) -> None:
+        if not os.path.isdir(self._get_profile_path(theme_name)):
+            raise KonsaveBackendError(f"Theme '{theme_name}' not found")
+        profile_names = self._get_profile_names()
+        self.funcs.apply_profile(theme_name, profile_names, len(profile_names))
+        config = self.funcs.read_konsave_config(os.path.join(self._get_profile_path(theme_name), "conf.yaml"))
+        if config is None or not all(os.path.isdir(section["location"]) for section in config["save"].values()):
+            raise KonsaveBackendError(f"Konsave did not apply theme '{theme_name}'")
+
+    def remove(self, theme_name: str) -> None:
+        profile_names = self._get_profile_names()
+        self.funcs.remove_profile(theme_name, profile_names, len(profile_names))
+        if os.path.exists(self._get_profile_path(theme_name)):
+            raise KonsaveBackendError(f"Konsave did not remove theme '{theme_name}'")
+
+    def import_archive(self, path_to_file: str) -> None:
+        theme_name = os.path.basename(path_to_file).replace(self.consts.EXPORT_EXTENSION, "")
+        # checked first: afterwards an existing profile would look like a successful import
+        if os.path.exists(self._get_profile_path(theme_name)):
+            raise KonsaveBackendError(f"A theme named '{theme_name}' already exists")
+        self.funcs.import_profile(path_to_file)
+        if not os.path.isdir(self._get_profile_path(theme_name)):
+            raise KonsaveBackendError(f"Konsave did not import '{os.path.basename(path_to_file)}'")
+
+    def _get_profile_path(self, theme_name: str) -> str:
+        return os.path.join(self.consts.PROFILES_DIR, theme_name)
+
+    def _get_profile_names(self) -> list[str]:
+        # konsave reads this list once at import; a long running process has to list the folder again
+        try:
+            return os.listdir(self.consts.PROFILES_DIR)
+        except FileNotFoundError:
+            return []
+
+    def _ensure_config(self) -> None:
+        # what konsave's CLI does on every start before running a command
+        os.makedirs(self.consts.PROFILES_DIR, exist_ok=True)
+        if not os.path.exists(self.consts.CONFIG_FILE):
+            is_kde = os.path.expandvars("$XDG_CURRENT_DESKTOP") == "KDE"
+            default_config = "conf_kde.yaml" if is_kde else "conf_other.yaml"
+            shutil.copy(str(files("konsave") / default_config), self.consts.CONFIG_FILE)
@@ -0,0 +1,89 @@
+import os
+import re
+from typing import Any, Tuple
+
+try:
+    import yaml
+except ModuleNotFoundError:
+    yaml = None
+
+from shared.os_interface import OsInterface
+
+_FUNCTION_REGEX = re.compile(r"\$\{(\w+)=(?:\"|')(\S+?)(?:\"|')\}")
+
+
+class KonsaveConfig:
+    # Mirrors the placeholders konsave substitutes in the "location" of conf.yaml entries
+
+    @staticmethod
+    def is_available() -> bool:
+        return yaml is not None
+
+    @staticmethod
+    def get_profile_path(theme_name: str) -> str:
+        return os.path.join(OsInterface.get_konsave_profiles_path(), theme_name)
+
+    @staticmethod
+    def get_global_config_path() -> str:
+        return os.path.join(os.path.dirname(OsInterface.get_konsave_profiles_path()), "conf.yaml")
+
+    @staticmethod
+    def read(config_path: str) -> dict[str, Any]:
+        if yaml is None:
+            raise RuntimeError("PyYAML is required to read Konsave configuration files")
+        with open(config_path, "r", encoding="utf-8") as file:
+            config = yaml.safe_load(file) or {}
+        for group in ("save", "export"):
+            sections = config.get(group) or {}
+            for section in sections.values():
+                section["location"] = KonsaveConfig.resolve_location(section.get("location") or "")
+                section["entries"] = [e for e in (section.get("entries") or []) if e]
+            config[group] = sections
+        return config
+
+    @staticmethod
+    def read_profile(theme_name: str) -> dict[str, Any]:
+        return KonsaveConfig.read(os.path.join(KonsaveConfig.get_profile_path(theme_name), "conf.yaml"))
+
+    @staticmethod
+    def resolve_location(location: str) -> str:
+        home = os.path.expanduser("~")
+        keywords = {
+            "HOME": home,
+            "CONFIG_DIR": os.path.join(home, ".config"),
+            "SHARE_DIR": os.path.join(home, ".local/share"),
+            "BIN_DIR": os.path.join(home, ".local/bin"),
+        }
+        for key, value in keywords.items():
+            location = location.replace(f"${key}", value)
+
+        match = _FUNCTION_REGEX.search(location)
+        while match:
+            parent = location[: match.start()]
+            function, text = match.group(1), match.group(2)
+            try:
+                candidates = os.listdir(parent)
+            except OSError:
+                candidates = []
+            if function == "ENDS_WITH":
+                found = next((c for c in candidates if c.endswith(text)), None)
+            elif function == "BEGINS_WITH":
+                found = next((c for c in candidates if c.startswith(text)), None)
+            else:
+                found = None
+            if found is None:
+                break
+            location = location.replace(match.group(0), found, 1)
+            match = _FUNCTION_REGEX.search(location)
+        return location
+
+    @staticmethod
+    def get_export_sources(config: dict[str, Any]) -> list[Tuple[str, str, str]]:
+        # (section, entry, absolute source path) for every exported-only entry that exists on disk
+        sources = []
+        for section_name, section in config["export"].items():
+            for entry in section["entries"]:
+                source = os.path.join(section["location"], entry)
+                if os.path.exists(source):
+                    sources.append((section_name, entry, source))
+        return sources
@@ -1,24 +1,32 @@
+import sqlite3
 import subprocess
-from typing import Tuple
+import threading
+from typing import Callable, Optional, Tuple
+
+from shared.config import Config
+from shared.incremental_save import IncrementalSaver, SaveReport
+from shared.instrumentation import Instrumentation
+from shared.konsave_backend import KonsaveBackend
+from shared.os_interface import OsInterface
+from shared.preview_cache import PreviewCache
+from shared.profile_cache import ProfileCache
+from shared.profile_metadata import ProfileMetadataIndex
+from shared.profile_store import ProfileStore
 
 
 class KonsaveInterface:
+    def __init__(self, backend: Optional[KonsaveBackend] = None):
+        self.backend = backend or KonsaveBackend.get_default()
 
     def get_existing(self, theme_name: str) -> Tuple[int, str] | None:
-        comparison_name = theme_name.strip().lower()
-        for t in self.get_profile_list():
-            if t[1].strip().lower() == comparison_name:
-                return t
-        return None
+        return ProfileCache.lookup(theme_name, self._read_profile_list)
 
     def get_profile_list(self) -> list[Tuple[int, str]]:
-        process_result = subprocess.run(["konsave", "-l"], capture_output=True, text=True, check=True)
-        output = process_result.stdout.strip().splitlines()
-        profiles: list[Tuple[int, str]] = []
-        for p in output:
-            parts = p.split("\t")
-            if len(parts) == 2 and parts[0].isdigit():
-                profiles.append((int(parts[0]), parts[1]))
+        return ProfileCache.get_profiles(self._read_profile_list)
+
+    def _read_profile_list(self) -> list[Tuple[int, str]]:
+        with Instrumentation.span("konsave", operation="list", backend=self.backend.name):
+            profiles = self.backend.list_profiles()
 
         # Validate integrity
         indexes = [t[0] for t in profiles]
@@ -27,16 +35,68 @@ class KonsaveInterface:
         return profiles
 
     def save_theme(self, theme_name: str) -> None:
-        subprocess.run(["konsave", "-s", theme_name, "-f"], check=True)
+        try:
+            with Instrumentation.span("konsave", operation="save", backend=self.backend.name, theme=theme_name):
+                self.backend.save(theme_name)
+        finally:
+            ProfileCache.invalidate()
+        self._update_metadata(theme_name)
+        self._store_profile(theme_name)
+
+    def save_theme_incremental(
+        self,
+        theme_name: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> SaveReport:
+        try:
+            with Instrumentation.span("konsave", operation="save_incremental", theme=theme_name):
+                report = IncrementalSaver(theme_name).save(progress_callback, cancel_event)
+        finally:
+            ProfileCache.invalidate()
+        self._update_metadata(theme_name)
+        self._store_profile(theme_name)
+        return report
 
     def apply_theme(self, theme_name: str) -> None:
-        subprocess.run(["konsave", "-a", theme_name], check=True)
+        with Instrumentation.span("konsave", operation="apply", backend=self.backend.name, theme=theme_name):
+            self.backend.apply(theme_name)
 
     def delete_theme(self, theme_name: str) -> None:
-        subprocess.run(["konsave", "-r", theme_name], check=True)
+        try:
+            with Instrumentation.span("konsave", operation="remove", backend=self.backend.name, theme=theme_name):
+                self.backend.remove(theme_name)
+        finally:
+            ProfileCache.invalidate()
+        IncrementalSaver.remove_index(theme_name)
+        PreviewCache().remove(theme_name)
+        self._update_metadata(theme_name)
+        if Config.is_dedup_store_enabled():
+            ProfileStore().remove(theme_name)
 
-    def export_theme(self, theme_name: str) -> subprocess.Popen:
-        return subprocess.Popen(["konsave", "-e", theme_name], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    def export_theme(self, theme_name: str, directory: Optional[str] = None) -> subprocess.Popen:
+        return self.backend.export(theme_name, directory)
 
     def import_theme(self, path_to_file: str) -> None:
-        subprocess.run(["konsave", "-i", path_to_file], check=True)
+        try:
+            with Instrumentation.span("konsave", operation="import", backend=self.backend.name, path=path_to_file):
+                self.backend.import_archive(path_to_file)
+        finally:
+            ProfileCache.invalidate()
+        theme_name = OsInterface.get_filename_without_extension(path_to_file)
+        self._update_metadata(theme_name)
+        self._store_profile(theme_name)
+
+    def _store_profile(self, theme_name: str) -> None:
+        if not Config.is_dedup_store_enabled():
+            return
+        try:
+            ProfileStore().ingest(theme_name)
+        except OSError as e:
+            print(f"Could not add theme '{theme_name}' to the deduplicated store. Error: {e}")
+
+    def _update_metadata(self, theme_name: str) -> None:
+        try:
+            ProfileMetadataIndex().update(theme_name)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not update the metadata of theme '{theme_name}'. Error: {e}")
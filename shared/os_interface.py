@@ -1,37 +1,24 @@
 import os
-import re
-import subprocess
 from typing import Optional
 
+from shared.capability_probe import CapabilityProbe
 from shared.config import Config
+from shared.instrumentation import Instrumentation
 
 
 class OsInterface:
 
     @staticmethod
     def check_systemd_installed() -> bool:
-        try:
-            subprocess.run(["systemctl", "--version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return CapabilityProbe.get("systemd")
 
     @staticmethod
     def check_konsave_installed() -> bool:
-        try:
-            konsave_version = OsInterface().get_kosnave_version()
-            return True if konsave_version else False
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            return False
+        return bool(OsInterface.get_kosnave_version())
 
     @staticmethod
     def get_kosnave_version() -> Optional[str]:
-        try:
-            output = subprocess.run(["konsave", "--version"], text=True, capture_output=True)
-            konsave_version = re.search(r"(\d+\.\d+\.\d+)", output.stdout)
-            return konsave_version.group(1) if konsave_version else None
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            return None
+        return CapabilityProbe.get("konsave")
 
     @staticmethod
     def get_de_protocol() -> str:
@@ -39,30 +26,61 @@ class OsInterface:
 
     @staticmethod
     def get_plasmashell_version() -> str:
-        try:
-            output = subprocess.check_output(["plasmashell", "--version"], text=True)
-            for line in output.splitlines():
-                if "plasmashell" in line.lower():
-                    parts = line.strip().split()
-                    for part in parts:
-                        if part[0].isdigit():
-                            return part
-        except Exception as e:
-            print(f"Could not read plasmashell version. Error: {e}")
-        return "unknown"
+        return CapabilityProbe.get("plasmashell")
+
+    @staticmethod
+    def restart_plasmashell() -> None:
+        Instrumentation.run(["systemctl", "--user", "restart", "plasma-plasmashell.service"], check=True)
+
+    @staticmethod
+    def can_restart_window_manager() -> bool:
+        # KWin cannot be restarted on Wayland without ending the session
+        return OsInterface.get_de_protocol() == "X11"
+
+    @staticmethod
+    def restart_window_manager() -> None:
+        plasmashell_version = OsInterface.get_plasmashell_version()
+        if plasmashell_version not in ("5", "6"):
+            raise ValueError(f"Can't reload desktop environment because of an unsupported plasmashell version")
+        if plasmashell_version == "5":
+            Instrumentation.run([f"kquitapp5", "kwin_x11"], check=True)
+            Instrumentation.run(["kstart5", "kwin_x11"], check=True)
+        elif plasmashell_version == "6":
+            Instrumentation.run([f"kquitapp6", "kwin_x11"], check=True)
+            Instrumentation.run(["kstart", "kwin_x11"], check=True)
 
     @staticmethod
-    def get_current_files_in_working_directory() -> set:
+    def get_path_size(path: str) -> int:
         try:
-            return set(os.listdir(os.getcwd()))
-        except Exception as e:
-            print(f"Could not list files in current working directory. Error: {e}")
-            return set()
+            if not os.path.isdir(path) or os.path.islink(path):
+                return os.lstat(path).st_size
+            total = 0
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        total += OsInterface.get_path_size(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+            return total
+        except OSError:
+            return 0
 
     @staticmethod
     def get_filename_without_extension(file_path) -> str:
         return os.path.splitext(os.path.basename(file_path))[0]
 
+    @staticmethod
+    def get_konsave_profiles_path() -> str:
+        return os.path.join(os.path.expanduser("~"), ".config", "konsave", "profiles")
+
+    @staticmethod
+    def get_data_path() -> str:
+        data_dir = os.path.join(
+            os.getenv("XDG_DATA_HOME", os.path.expanduser("~/.local/share")), Config().get_app_name()
+        )
+        os.makedirs(data_dir, exist_ok=True)
+        return data_dir
+
     @staticmethod
     def get_cache_path() -> str:
         cache_dir = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), Config().get_app_name())
@@ -0,0 +1,106 @@
+import glob
+import hashlib
+import os
+import threading
+from typing import Optional
+
+from shared.config import Config
+from shared.os_interface import OsInterface
+
+
+class PreviewCache:
+    # Rendered previews as PNG files named after the theme and its profile signature, so a re-saved or
+    # re-imported profile simply misses the cache. An empty file records a theme with nothing to preview.
+    # Hits refresh the file's mtime and the oldest files are evicted once the folder outgrows its budget
+    _lock = threading.Lock()
+    # bytes on disk per cache folder, counted once per process and then kept up to date by store/remove
+    _sizes: dict[str, int] = {}
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.path.join(OsInterface.get_cache_path(), "previews")
+        self.max_bytes = max_bytes if max_bytes is not None else Config.get_preview_cache_max_bytes()
+        os.makedirs(self.path, exist_ok=True)
+
+    def lookup(self, theme_name: str, signature: str) -> Optional[str]:
+        file_path = self._get_file_path(theme_name, signature)
+        try:
+            os.utime(file_path)
+        except OSError:
+            return None
+        return file_path
+
+    def store(self, theme_name: str, signature: str, data: bytes) -> str:
+        file_path = self._get_file_path(theme_name, signature)
+        with self._lock:
+            total = self._get_total()
+            # previews of earlier versions of the profile can never be hit again
+            for old_path in self._get_theme_files(theme_name):
+                total -= self._remove_file(old_path)
+            with open(f"{file_path}.part", "wb") as file:
+                file.write(data)
+            os.replace(f"{file_path}.part", file_path)
+            self._sizes[self.path] = total + len(data)
+            if self._sizes[self.path] > self.max_bytes:
+                self._evict()
+        return file_path
+
+    def remove(self, theme_name: str) -> None:
+        with self._lock:
+            total = self._get_total()
+            for file_path in self._get_theme_files(theme_name):
+                total -= self._remove_file(file_path)
+            self._sizes[self.path] = total
+
+    def get_size(self) -> int:
+        with self._lock:
+            return self._get_total()
+
+    def _evict(self) -> None:
+        # least recently used first, down to 80% of the budget so the next stores do not evict again
+        entries = []
+        with os.scandir(self.path) as iterator:
+            for entry in iterator:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.8
+        for _, _, file_path in entries:
+            if total <= target:
+                break
+            total -= self._remove_file(file_path)
+        self._sizes[self.path] = total
+
+    def _get_total(self) -> int:
+        if self.path not in self._sizes:
+            total = 0
+            with os.scandir(self.path) as iterator:
+                for entry in iterator:
+                    try:
+                        total += entry.stat().st_size
+                    except OSError:
+                        continue
+            self._sizes[self.path] = total
+        return self._sizes[self.path]
+
+    def _get_theme_files(self, theme_name: str) -> list[str]:
+        return glob.glob(os.path.join(self.path, f"{self._hash(theme_name)}_*"))
+
+    def _get_file_path(self, theme_name: str, signature: str) -> str:
+        return os.path.join(self.path, f"{self._hash(theme_name)}_{self._hash(signature)}.png")
+
+    @staticmethod
+    def _remove_file(file_path: str) -> int:
+        try:
+            size = os.stat(file_path).st_size
+            os.remove(file_path)
+            return size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
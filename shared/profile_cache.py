@@ -0,0 +1,76 @@
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+from shared.os_interface import OsInterface
+
+ProfileLoader = Callable[[], list[Tuple[int, str]]]
+
+
+class ProfileCache:
+    # Process-wide: every window and KonsaveInterface instance shares the same cached list
+    _lock = threading.RLock()
+    _profiles: Optional[list[Tuple[int, str]]] = None
+    _by_name: dict[str, Tuple[int, str]] = {}
+    _directory_mtime: Optional[int] = None
+
+    @classmethod
+    def get_profiles(cls, loader: ProfileLoader) -> list[Tuple[int, str]]:
+        with cls._lock:
+            cls._ensure_loaded(loader)
+            return list(cls._profiles or [])
+
+    @classmethod
+    def lookup(cls, theme_name: str, loader: ProfileLoader) -> Tuple[int, str] | None:
+        with cls._lock:
+            cls._ensure_loaded(loader)
+            return cls._by_name.get(cls.normalize_name(theme_name))
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._profiles = None
+            cls._by_name = {}
+            cls._directory_mtime = None
+
+    @classmethod
+    def update_from_directory(cls) -> Tuple[list[Tuple[int, str]], list[str], list[str]]:
+        # Re-reads the profiles folder itself, which is all 'konsave -l' lists (sorted, numbered from 1), and
+        # returns the new list with the names added and removed since the cached one
+        with cls._lock:
+            directory_mtime = cls._get_directory_mtime()
+            try:
+                names = sorted(os.listdir(OsInterface.get_konsave_profiles_path()))
+            except OSError:
+                names = []
+            old_names = {name for _, name in cls._profiles or []}
+            new_names = set(names)
+            cls._profiles = None
+            cls._ensure_loaded(lambda: list(enumerate(names, start=1)))
+            cls._directory_mtime = directory_mtime
+            return list(cls._profiles), sorted(new_names - old_names), sorted(old_names - new_names)
+
+    @staticmethod
+    def normalize_name(theme_name: str) -> str:
+        return theme_name.strip().casefold()
+
+    @classmethod
+    def _ensure_loaded(cls, loader: ProfileLoader) -> None:
+        # mtime is read before loading so a change racing with the load is caught on the next call
+        directory_mtime = cls._get_directory_mtime()
+        if cls._profiles is not None and directory_mtime == cls._directory_mtime:
+            return
+        profiles = loader()
+        by_name: dict[str, Tuple[int, str]] = {}
+        for index, name in profiles:
+            by_name.setdefault(cls.normalize_name(name), (index, name))
+        cls._profiles = profiles
+        cls._by_name = by_name
+        cls._directory_mtime = directory_mtime
+
+    @staticmethod
+    def _get_directory_mtime() -> Optional[int]:
+        try:
+            return os.stat(OsInterface.get_konsave_profiles_path()).st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from shared.konsave_config import KonsaveConfig
+from shared.os_interface import OsInterface
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    created REAL NOT NULL,
+    modified REAL NOT NULL,
+    last_applied REAL,
+    signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_by_size ON profiles (size);
+CREATE INDEX IF NOT EXISTS profiles_by_created ON profiles (created);
+"""
+_COLUMNS = "name, size, file_count, created, modified, last_applied"
+
+
+class ProfileMetadata(NamedTuple):
+    name: str
+    size: int
+    file_count: int
+    created: float
+    modified: float
+    last_applied: Optional[float]
+
+
+class ProfileMetadataIndex:
+    # One SQLite row per profile in KonUI's cache. A profile is only walked again when its signature
+    # (mtimes of its folder and of the conf.yaml every save and import rewrites) differs from the stored one
+    _lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(OsInterface.get_cache_path(), "profile_metadata.sqlite3")
+        try:
+            self._create_schema()
+        except sqlite3.DatabaseError:
+            # only a cache: a damaged file is rebuilt from the profiles on the next refresh
+            os.remove(self.db_path)
+            self._create_schema()
+
+    def refresh(self, theme_names: list[str]) -> dict[str, ProfileMetadata]:
+        with self._lock, self._connect() as connection:
+            signatures = dict(connection.execute("SELECT name, signature FROM profiles"))
+            for theme_name in theme_names:
+                signature = self.get_signature(theme_name)
+                if signature is not None and signatures.get(theme_name) != signature:
+                    self._write(connection, theme_name, signature)
+            removed = set(signatures) - set(theme_names)
+            connection.executemany("DELETE FROM profiles WHERE name = ?", ((name,) for name in removed))
+        return self.get_all()
+
+    def update(self, theme_name: str) -> Optional[ProfileMetadata]:
+        signature = self.get_signature(theme_name)
+        if signature is None:
+            self.remove(theme_name)
+            return None
+        with self._lock, self._connect() as connection:
+            self._write(connection, theme_name, signature)
+        return self.get(theme_name)
+
+    def remove(self, theme_name: str) -> None:
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM profiles WHERE name = ?", (theme_name,))
+
+    def record_applied(self, theme_name: str, applied_at: Optional[float] = None) -> None:
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "UPDATE profiles SET last_applied = ? WHERE name = ?", (applied_at or time.time(), theme_name)
+            )
+
+    def get(self, theme_name: str) -> Optional[ProfileMetadata]:
+        with self._connect() as connection:
+            row = connection.execute(f"SELECT {_COLUMNS} FROM profiles WHERE name = ?", (theme_name,)).fetchone()
+        return ProfileMetadata(*row) if row else None
+
+    def get_all(self) -> dict[str, ProfileMetadata]:
+        with self._connect() as connection:
+            rows = connection.execute(f"SELECT {_COLUMNS} FROM profiles").fetchall()
+        return {row[0]: ProfileMetadata(*row) for row in rows}
+
+    def get_largest(self, limit: int = 10) -> list[ProfileMetadata]:
+        return self._query(f"SELECT {_COLUMNS} FROM profiles ORDER BY size DESC LIMIT ?", limit)
+
+    def get_oldest(self, limit: int = 10) -> list[ProfileMetadata]:
+        return self._query(f"SELECT {_COLUMNS} FROM profiles ORDER BY created ASC LIMIT ?", limit)
+
+    def _query(self, query: str, limit: int) -> list[ProfileMetadata]:
+        with self._connect() as connection:
+            return [ProfileMetadata(*row) for row in connection.execute(query, (limit,))]
+
+    def _write(self, connection: sqlite3.Connection, theme_name: str, signature: str) -> None:
+        profile_path = KonsaveConfig.get_profile_path(theme_name)
+        size, file_count = self._scan(profile_path)
+        profile_stat = os.stat(profile_path)
+        created = getattr(profile_stat, "st_birthtime", profile_stat.st_ctime)
+        modified = self._get_modified(profile_path)
+        # created and last_applied survive a re-save of the same profile
+        connection.execute(
+            "INSERT INTO profiles (name, size, file_count, created, modified, last_applied, signature) "
+            "VALUES (?, ?, ?, ?, ?, NULL, ?) "
+            "ON CONFLICT (name) DO UPDATE SET size = excluded.size, file_count = excluded.file_count, "
+            "modified = excluded.modified, signature = excluded.signature",
+            (theme_name, size, file_count, created, modified, signature),
+        )
+
+    @staticmethod
+    def get_signature(theme_name: str) -> Optional[str]:
+        profile_path = KonsaveConfig.get_profile_path(theme_name)
+        try:
+            profile_mtime = os.stat(profile_path).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            config_mtime = os.stat(os.path.join(profile_path, "conf.yaml")).st_mtime_ns
+        except OSError:
+            config_mtime = 0
+        return f"{profile_mtime}:{config_mtime}"
+
+    @staticmethod
+    def _get_modified(profile_path: str) -> float:
+        try:
+            return os.stat(os.path.join(profile_path, "conf.yaml")).st_mtime
+        except OSError:
+            return os.stat(profile_path).st_mtime
+
+    @staticmethod
+    def _scan(path: str) -> Tuple[int, int]:
+        size = file_count = 0
+        for directory, _, file_names in os.walk(path, followlinks=True):
+            for file_name in file_names:
+                try:
+                    size += os.stat(os.path.join(directory, file_name)).st_size
+                    file_count += 1
+                except OSError:
+                    continue
+        return size, file_count
+
+    def _create_schema(self) -> None:
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # a connection per call: the index is used from the GUI thread and from workers
+        connection = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
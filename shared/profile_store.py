@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from shared.file_index import FileIndex
+from shared.konsave_config import KonsaveConfig
+from shared.os_interface import OsInterface
+
+
+class IngestReport(NamedTuple):
+    files: int
+    new_blobs: int
+    new_bytes: int
+    reused_bytes: int
+
+
+class StoreStats(NamedTuple):
+    profiles: int
+    logical_bytes: int
+    stored_bytes: int
+
+    @property
+    def deduplicated_bytes(self) -> int:
+        # how much smaller the store is than a plain copy of every profile (not a saving on disk:
+        # konsave's own profile folders are kept as they are)
+        return max(0, self.logical_bytes - self.stored_bytes)
+
+
+class ProfileStore:
+    # Keeps every profile file once per distinct content: blobs/<2 hex>/<rest of digest>, plus one
+    # manifests/<profile>.json mapping relative paths to digests, from which the konsave layout is rebuilt
+    _lock = threading.RLock()
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(OsInterface.get_data_path(), "store")
+        self.blobs_path = os.path.join(self.root, "blobs")
+        self.manifests_path = os.path.join(self.root, "manifests")
+        self.stats_path = os.path.join(self.root, "stats.json")
+        os.makedirs(self.blobs_path, exist_ok=True)
+        os.makedirs(self.manifests_path, exist_ok=True)
+        self.file_index = FileIndex("store_file_index.json")
+
+    def ingest(self, theme_name: str) -> IngestReport:
+        profile_path = KonsaveConfig.get_profile_path(theme_name)
+        if not os.path.isdir(profile_path):
+            raise FileNotFoundError(f"Profile '{theme_name}' not found")
+
+        with self._lock:
+            return self._ingest(theme_name, profile_path)
+
+    def _ingest(self, theme_name: str, profile_path: str) -> IngestReport:
+        files: dict[str, list] = {}
+        directories: list[str] = []
+        new_blobs = new_bytes = reused_bytes = 0
+        for directory, _, file_names in os.walk(profile_path, followlinks=True):
+            if directory != profile_path:
+                directories.append(os.path.relpath(directory, profile_path))
+            for file_name in file_names:
+                source = os.path.join(directory, file_name)
+                stat = os.stat(source)
+                digest = self.file_index.get_digest(source, stat)
+                if self._write_blob(source, digest):
+                    new_blobs += 1
+                    new_bytes += stat.st_size
+                else:
+                    reused_bytes += stat.st_size
+                files[os.path.relpath(source, profile_path)] = [digest, stat.st_size, stat.st_mode & 0o777]
+        self.file_index.save()
+
+        previous = self.read_manifest(theme_name)
+        manifest = {"created": time.time(), "directories": directories, "files": files}
+        self._write_json(self._get_manifest_path(theme_name), manifest)
+        stats = self.get_stats()
+        logical_bytes = stats.logical_bytes + sum(size for _, size, _ in files.values())
+        if previous is not None:
+            logical_bytes -= sum(size for _, size, _ in previous["files"].values())
+        profiles = stats.profiles + (previous is None)
+        self._write_stats(StoreStats(profiles, logical_bytes, stats.stored_bytes + new_bytes))
+        return IngestReport(len(files), new_blobs, new_bytes, reused_bytes)
+
+    def materialise(self, theme_name: str, target_path: Optional[str] = None) -> str:
+        manifest = self.read_manifest(theme_name)
+        if manifest is None:
+            raise FileNotFoundError(f"Profile '{theme_name}' is not in the store")
+        target_path = target_path or KonsaveConfig.get_profile_path(theme_name)
+        for relative_path in manifest.get("directories", []):
+            os.makedirs(os.path.join(target_path, relative_path), exist_ok=True)
+        for relative_path, (digest, _, mode) in manifest["files"].items():
+            target = os.path.join(target_path, relative_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # copied rather than hard-linked: konsave overwrites profile files in place on 'save -f'
+            shutil.copyfile(self._get_blob_path(digest), target)
+            os.chmod(target, mode)
+        return target_path
+
+    def remove(self, theme_name: str) -> None:
+        with self._lock:
+            manifest = self.read_manifest(theme_name)
+            if manifest is None:
+                return
+            os.remove(self._get_manifest_path(theme_name))
+            stats = self.get_stats()
+            logical_bytes = stats.logical_bytes - sum(size for _, size, _ in manifest["files"].values())
+            self._write_stats(StoreStats(stats.profiles - 1, logical_bytes, stats.stored_bytes))
+            self.collect_garbage()
+
+    def collect_garbage(self) -> int:
+        with self._lock:
+            referenced = set()
+            for theme_name in self.list_profiles():
+                manifest = self.read_manifest(theme_name) or {"files": {}}
+                referenced.update(digest for digest, _, _ in manifest["files"].values())
+
+            freed_bytes = 0
+            for directory, _, file_names in os.walk(self.blobs_path):
+                for file_name in file_names:
+                    digest = os.path.basename(directory) + file_name
+                    if digest not in referenced:
+                        blob_path = os.path.join(directory, file_name)
+                        freed_bytes += os.path.getsize(blob_path)
+                        os.remove(blob_path)
+                if directory != self.blobs_path and not os.listdir(directory):
+                    os.rmdir(directory)
+            stats = self.get_stats()
+            self._write_stats(StoreStats(stats.profiles, stats.logical_bytes, stats.stored_bytes - freed_bytes))
+            return freed_bytes
+
+    def list_profiles(self) -> list[str]:
+        return sorted(name[:-5] for name in os.listdir(self.manifests_path) if name.endswith(".json"))
+
+    def read_manifest(self, theme_name: str) -> Optional[dict]:
+        try:
+            with open(self._get_manifest_path(theme_name), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def get_stats(self) -> StoreStats:
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as file:
+                return StoreStats(*json.load(file))
+        except (OSError, ValueError, TypeError):
+            return StoreStats(0, 0, 0)
+
+    def _write_blob(self, source: str, digest: str) -> bool:
+        blob_path = self._get_blob_path(digest)
+        if os.path.exists(blob_path):
+            return False
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        # written next to its final name and renamed, so a blob is either complete or absent
+        fd, partial_path = tempfile.mkstemp(dir=os.path.dirname(blob_path))
+        try:
+            with os.fdopen(fd, "wb") as target, open(source, "rb") as src:
+                shutil.copyfileobj(src, target, 1024 * 1024)
+            os.replace(partial_path, blob_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        return True
+
+    def _write_stats(self, stats: StoreStats) -> None:
+        self._write_json(self.stats_path, list(stats))
+
+    def _get_blob_path(self, digest: str) -> str:
+        return os.path.join(self.blobs_path, digest[:2], digest[2:])
+
+    def _get_manifest_path(self, theme_name: str) -> str:
+        return os.path.join(self.manifests_path, f"{theme_name}.json")
+
+    @staticmethod
+    def _write_json(path: str, content) -> None:
+        partial_path = f"{path}.part"
+        with open(partial_path, "w", encoding="utf-8") as file:
+            json.dump(content, file)
+        os.replace(partial_path, path)
@@ -0,0 +1,243 @@
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Optional
+
+from PyQt6.QtCore import QFile, QFileSystemWatcher, QIODevice, QObject, QResource
+
+from shared.config import Config
+
+_ROOT = Path(__file__).resolve().parent.parent
+_BUNDLE_PREFIX = ":/"
+
+
+def _qt_hash(name: str) -> int:
+    # the hash Qt's resource tree sorts and looks up names by
+    value = 0
+    for code_unit in struct.unpack(f">{len(name.encode('utf-16-be')) // 2}H", name.encode("utf-16-be")):
+        value = (value << 4) + code_unit
+        value ^= (value & 0xF0000000) >> 23
+        value &= 0x0FFFFFFF
+    return value
+
+
+class ResourceLoader(QObject):
+    # Stylesheets and assets, resolved from the project folder rather than the working directory, read and
+    # checked once per process. When the bundle built by build_bundle() is newer than both folders, everything is
+    # read from it instead of separate files. With qss_hot_reload on, edited stylesheets are re-applied to open windows
+    _instance: Optional["ResourceLoader"] = None
+
+    def __init__(self):
+        super().__init__()
+        self._stylesheets: dict[str, str] = {}
+        self._asset_paths: dict[str, str] = {}
+        self._styled_widgets: dict[str, list] = {}
+        self._watcher: Optional[QFileSystemWatcher] = None
+        self._spinner = None
+        self._spinner_users = 0
+        self.bundled = self._register_bundle(_ROOT / Config.get_resource_bundle())
+
+    @staticmethod
+    def _register_bundle(bundle_path: Path) -> bool:
+        # the bundle is only a faster copy of QSS/ and assets/: the folders win whenever they may differ
+        if not bundle_path.exists():
+            return False
+        if Config.is_qss_hot_reload_enabled():
+            print(f"Ignoring {bundle_path.name}: qss_hot_reload is on, so stylesheets are read from their folder")
+            return False
+        try:
+            bundle_time = bundle_path.stat().st_mtime
+            # a folder's own mtime changes when a file is added, removed or renamed in it
+            source_time = max(
+                path.stat().st_mtime
+                for directory in (Config.get_qss_directory(), Config.get_assets_directory())
+                for path in (_ROOT / directory, *(_ROOT / directory).iterdir())
+            )
+        except OSError as e:
+            print(f"Could not check {bundle_path.name} against its sources. Error: {e}")
+            return False
+        if source_time > bundle_time:
+            print(
+                f"Ignoring outdated {bundle_path.name}: stylesheets or assets changed after it was built "
+                f"(rebuild it with 'python -m shared.resource_loader')"
+            )
+            return False
+        return QResource.registerResource(str(bundle_path))
+
+    @classmethod
+    def get(cls) -> "ResourceLoader":
+        if cls._instance is None:
+            cls._instance = ResourceLoader()
+        return cls._instance
+
+    def get_stylesheet(self, window_name: str) -> str:
+        if window_name not in self._stylesheets:
+            self._stylesheets[window_name] = self._read_stylesheet(window_name)
+        return self._stylesheets[window_name]
+
+    def apply_stylesheet(self, widget, window_name: str) -> None:
+        widget.setStyleSheet(self.get_stylesheet(window_name))
+        if not Config.is_qss_hot_reload_enabled():
+            return
+        if self._watcher is None:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self.on_stylesheet_changed)
+        self._watcher.addPath(self._get_stylesheet_path(window_name))
+        self._styled_widgets.setdefault(window_name, []).append(widget)
+        widget.destroyed.connect(lambda: self._forget_widget(window_name, widget))
+
+    def get_asset_path(self, asset_name: str) -> str:
+        if asset_name not in self._asset_paths:
+            path = self._get_path(Config.get_assets_directory(), asset_name)
+            if not QFile.exists(path):
+                print(f"Asset '{asset_name}' not found in {path}")
+            self._asset_paths[asset_name] = path
+        return self._asset_paths[asset_name]
+
+    def acquire_spinner(self):
+        # one QMovie for the whole process: frames are decoded once and cached, however many buttons spin
+        from PyQt6.QtGui import QMovie
+
+        if self._spinner is None:
+            self._spinner = QMovie(self.get_asset_path("blue_spinner.gif"), parent=self)
+            self._spinner.setCacheMode(QMovie.CacheMode.CacheAll)
+        self._spinner_users += 1
+        self._spinner.start()
+        return self._spinner
+
+    def release_spinner(self) -> None:
+        self._spinner_users = max(0, self._spinner_users - 1)
+        if self._spinner is not None and not self._spinner_users:
+            self._spinner.stop()
+
+    def on_stylesheet_changed(self, path: str) -> None:
+        window_name = Path(path).stem
+        previous = self._stylesheets.pop(window_name, None)
+        # editors that save by renaming a new file over the old one drop it from the watcher
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+        stylesheet = self.get_stylesheet(window_name)
+        if not stylesheet and previous:
+            # a half-finished edit keeps the last stylesheet that worked
+            self._stylesheets[window_name] = previous
+            return
+        for widget in self._styled_widgets.get(window_name, []):
+            widget.setStyleSheet(stylesheet)
+
+    def _forget_widget(self, window_name: str, widget) -> None:
+        widgets = self._styled_widgets.get(window_name, [])
+        if widget in widgets:
+            widgets.remove(widget)
+
+    def _read_stylesheet(self, window_name: str) -> str:
+        path = self._get_stylesheet_path(window_name)
+        file = QFile(path)
+        if not file.open(QIODevice.OpenModeFlag.ReadOnly):
+            print(f"QSS file for window '{window_name}' not found")
+            return ""
+        try:
+            stylesheet = bytes(file.readAll()).decode("utf-8")
+        except UnicodeDecodeError as e:
+            print(f"Could not read QSS file for window '{window_name}'. Error: {e}")
+            return ""
+        finally:
+            file.close()
+        error = self.validate_stylesheet(stylesheet)
+        if error:
+            # Qt would drop the whole stylesheet anyway, with a less helpful message
+            print(f"QSS file for window '{window_name}' is not valid: {error}")
+            return ""
+        return stylesheet
+
+    @staticmethod
+    def validate_stylesheet(stylesheet: str) -> str:
+        # catches the mistakes that make Qt ignore a whole stylesheet: unbalanced braces and open comments
+        depth = 0
+        position = 0
+        while position < len(stylesheet):
+            if stylesheet.startswith("/*", position):
+                end = stylesheet.find("*/", position + 2)
+                if end < 0:
+                    return f"comment at line {stylesheet.count(chr(10), 0, position) + 1} is never closed"
+                position = end + 2
+                continue
+            character = stylesheet[position]
+            if character == "{":
+                depth += 1
+            elif character == "}":
+                depth -= 1
+                if depth < 0:
+                    return f"unexpected '}}' at line {stylesheet.count(chr(10), 0, position) + 1}"
+            position += 1
+        return "missing '}'" if depth else ""
+
+    def _get_stylesheet_path(self, window_name: str) -> str:
+        return self._get_path(Config.get_qss_directory(), f"{window_name}.qss")
+
+    def _get_path(self, directory: str, file_name: str) -> str:
+        if self.bundled:
+            return f"{_BUNDLE_PREFIX}{directory}/{file_name}"
+        return str(_ROOT / directory / file_name)
+
+    @staticmethod
+    def build_bundle(output_path: Optional[str] = None) -> str:
+        # Writes every stylesheet and asset into one binary Qt resource file (the format 'rcc -binary'
+        # produces, version 1), so no Qt build tools are needed
+        files: dict[str, bytes] = {}
+        for directory in (Config.get_qss_directory(), Config.get_assets_directory()):
+            for path in sorted((_ROOT / directory).iterdir()):
+                if path.is_file():
+                    files[f"{directory}/{path.name}"] = path.read_bytes()
+
+        # directory tree, every node's children listed breadth first and sorted by hash as Qt expects
+        tree: dict = {}
+        for resource_path, content in files.items():
+            node = tree
+            *directories, file_name = resource_path.split("/")
+            for directory in directories:
+                node = node.setdefault(directory, {})
+            node[file_name] = content
+
+        names, data, nodes = bytearray(), bytearray(), []
+        name_offsets: dict[str, int] = {}
+
+        def add_name(name: str) -> int:
+            if name not in name_offsets:
+                name_offsets[name] = len(names)
+                encoded = name.encode("utf-16-be")
+                names.extend(struct.pack(">HI", len(encoded) // 2, _qt_hash(name)) + encoded)
+            return name_offsets[name]
+
+        nodes.append(None)
+        pending = [(0, "", tree)]
+        while pending:
+            index, name, node = pending.pop(0)
+            name_offset = add_name(name) if index else 0
+            if isinstance(node, dict):
+                children = sorted(node.items(), key=lambda item: _qt_hash(item[0]))
+                first_child = len(nodes)
+                nodes.extend([None] * len(children))
+                for number, (child_name, child) in enumerate(children):
+                    pending.append((first_child + number, child_name, child))
+                nodes[index] = struct.pack(">IHII", name_offset, 0x02, len(children), first_child)
+            else:
+                # any territory, C language: the entry every locale falls back to
+                nodes[index] = struct.pack(">IHHHI", name_offset, 0x00, 0, 1, len(data))
+                data.extend(struct.pack(">I", len(node)) + node)
+
+        header_size = 20
+        tree_bytes = b"".join(nodes)
+        data_offset = header_size + len(tree_bytes)
+        names_offset = data_offset + len(data)
+        output_path = output_path or str(_ROOT / Config.get_resource_bundle())
+        with open(f"{output_path}.part", "wb") as file:
+            file.write(b"qres" + struct.pack(">IIII", 1, header_size, data_offset, names_offset))
+            file.write(tree_bytes + bytes(data) + bytes(names))
+        os.replace(f"{output_path}.part", output_path)
+        return output_path
+
+
+if __name__ == "__main__":
+    # python -m shared.resource_loader: (re)builds the bundle next to main.py
+    print(f"Resources bundled into {ResourceLoader.build_bundle(sys.argv[1] if len(sys.argv) > 1 else None)}")
@@ -0,0 +1,82 @@
+import sqlite3
+import time
+from typing import Callable
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from shared.config import Config
+from shared.differential_apply import ApplyPlan, DifferentialApplier
+from shared.konsave_config import KonsaveConfig
+from shared.konsave_interface import KonsaveInterface
+from shared.os_interface import OsInterface
+from shared.profile_metadata import ProfileMetadataIndex
+
+
+class ApplyWorker(QObject):
+    # stage label, stage number (1-based), number of stages
+    stage_started = pyqtSignal(str, int, int)
+    # stage label, seconds spent on it
+    stage_finished = pyqtSignal(str, float)
+    # copied files, copied bytes, skipped files, skipped bytes (differential mode only)
+    files_applied = pyqtSignal(int, int, int, int)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, theme_name: str, reload_desktop: bool):
+        super().__init__()
+        self.theme_name = theme_name
+        self._cancel = False
+        self.stages: list[tuple[str, Callable[[], None]]] = [("Applying theme files", self.apply_files)]
+        if reload_desktop:
+            self.stages.append(("Restarting Plasma shell", OsInterface.restart_plasmashell))
+            if OsInterface.can_restart_window_manager():
+                self.stages.append(("Restarting window manager", OsInterface.restart_window_manager))
+
+    def cancel(self):
+        # konsave -a is never interrupted half way; cancelling only skips the reload stages still to come
+        self._cancel = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancel
+
+    def apply_files(self) -> None:
+        if Config.get_apply_mode() == "differential" and KonsaveConfig.is_available():
+            report = DifferentialApplier().apply(self.theme_name)
+            self.files_applied.emit(*report)
+        else:
+            KonsaveInterface().apply_theme(self.theme_name)
+        try:
+            ProfileMetadataIndex().record_applied(self.theme_name)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not record when theme '{self.theme_name}' was applied. Error: {e}")
+
+    def run(self):
+        try:
+            for number, (label, stage) in enumerate(self.stages, start=1):
+                if self._cancel:
+                    self.cancelled.emit()
+                    return
+                self.stage_started.emit(label, number, len(self.stages))
+                started_at = time.monotonic()
+                stage()
+                self.stage_finished.emit(label, time.monotonic() - started_at)
+            self.finished.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class ApplyPreviewWorker(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, theme_name: str):
+        super().__init__()
+        self.theme_name = theme_name
+
+    def run(self):
+        try:
+            plan: ApplyPlan = DifferentialApplier().plan(self.theme_name)
+            self.finished.emit(plan)
+        except Exception as e:
+            self.failed.emit(str(e))
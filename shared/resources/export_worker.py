@@ -1,89 +1,221 @@
 import os
 import shutil
+import subprocess
+import tempfile
 import threading
 import time
-from codecs import ignore_errors
+from typing import BinaryIO, Optional, Tuple
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from shared.config import Config
+from shared.instrumentation import Instrumentation
+from shared.knsv_exporter import EXPORT_EXTENSION, ExportCancelledError, ExportReport, KnsvExporter
+from shared.knsv_inspector import KnsvInspector
+from shared.konsave_config import KonsaveConfig
 from shared.konsave_interface import KonsaveInterface
 from shared.os_interface import OsInterface
 
 
 class ExportWorker(QObject):
     progress = pyqtSignal(int)
+    # throughput in bytes per second and estimated seconds left (-1 when unknown)
+    throughput = pyqtSignal(float, float)
     finished = pyqtSignal()
     failed = pyqtSignal(str)
     cancelled = pyqtSignal()
 
-    def __init__(self, theme_name):
+    sample_interval = 0.5
+    report_interval = 0.1
+    # archive size over profile size of the last konsave export, to tell how far zipping has got
+    compression_ratio = 1.0
+
+    def __init__(
+        self,
+        theme_name,
+        destination_directory: Optional[str] = None,
+        compression: Optional[str] = None,
+        stream: Optional[BinaryIO] = None,
+    ):
         super().__init__()
         self.theme_name = theme_name
+        self.destination_directory = destination_directory or os.getcwd()
+        self.compression = compression or Config.get_export_compression()
+        # when set, the archive is written into this open stream instead of a file in destination_directory
+        self.stream = stream
         self._cancel = False
-        self._files_present_before_work = OsInterface().get_current_files_in_working_directory()
+        self._cancel_event = threading.Event()
+        self._process = None
+        # private to this job and on the destination's filesystem, so the finished archive is renamed
+        # into place and a cancelled or failed job only ever removes its own files
+        self._job_directory: Optional[str] = None
+        # where the archive ended up and how well it compressed, once the export has finished
+        self.archive_path: Optional[str] = None
+        self.export_report: Optional[ExportReport] = None
+        self._last_report_at = 0.0
 
     def cancel(self):
+        # only flags the job: run() notices it on its worker thread and emits 'cancelled' exactly once
         self._cancel = True
-        if self._process and self._process.poll() is None:
-            self._process.terminate()
-            self.cancelled.emit()
-            self.remove_created_files()
+        self._cancel_event.set()
 
     def run(self):
+        if self.stream is not None:
+            self.run_native()
+            return
+        try:
+            self._job_directory = tempfile.mkdtemp(prefix=".konui-export-", dir=self.destination_directory)
+        except OSError as e:
+            self.failed.emit(f"Cannot write to '{self.destination_directory}': {e}")
+            return
         try:
-            progress = 0
-            stop_flag = threading.Event()
+            if Config.get_export_backend() == "native" or self.compression != "default":
+                self.run_native()
+            else:
+                self.run_konsave()
+        finally:
+            shutil.rmtree(self._job_directory, ignore_errors=True)
+
+    def run_native(self):
+        try:
+            started_at = time.monotonic()
+            exporter = KnsvExporter.for_compression(self.compression)
+
+            def progress_callback(read_bytes: int, total_bytes: int) -> None:
+                self.report_progress(read_bytes, total_bytes, started_at)
+
+            with Instrumentation.span("export", backend="native", theme=self.theme_name, compression=self.compression):
+                if self.stream is not None:
+                    self.export_report = exporter.export_to_stream(
+                        self.theme_name, self.stream, progress_callback, self._cancel_event
+                    )
+                else:
+                    archive_path = os.path.join(self._job_directory, f"{self.theme_name}{EXPORT_EXTENSION}")
+                    self.export_report = exporter.export(
+                        self.theme_name, archive_path, progress_callback, self._cancel_event
+                    )
+                    self.move_to_destination(archive_path)
+            self.progress.emit(100)
+            self.finished.emit()
+        except ExportCancelledError:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
 
-            def simulate_progress():
-                nonlocal progress
-                while progress < 99 and not stop_flag.is_set():
+    def run_konsave(self):
+        try:
+            if self._cancel:
+                self.cancelled.emit()
+                return
+            process_started_at = time.perf_counter()
+            self._process = KonsaveInterface().export_theme(self.theme_name, self._job_directory)
+            sections = self.get_export_sections()
+            total_bytes = sum(size for _, size in sections)
+            started_at = time.monotonic()
+
+            # Konsave first copies the profile into a staging folder and then zips it. Both halves are
+            # measured without walking the staging folder: copying by the sections it has started, zipping
+            # by the archive's size against the compressed size expected from earlier exports
+            while True:
+                try:
+                    stdout, stderr = self._process.communicate(timeout=self.sample_interval)
+                    break
+                except subprocess.TimeoutExpired:
                     if self._cancel:
-                        stop_flag.set()
-                        return
-                    progress += 1
-                    self.progress.emit(progress)
-                    time.sleep(self.get_delay(progress))
-
-            thread = threading.Thread(target=simulate_progress)
-            thread.start()
-
-            self._process = KonsaveInterface().export_theme(self.theme_name)
-            _, stderr = self._process.communicate()
-
-            stop_flag.set()
-            thread.join()
+                        self._process.terminate()
+                        continue
+                    done_bytes = self.get_done_bytes(sections, total_bytes)
+                    # copying and zipping each go over the whole profile once
+                    self.report_progress(done_bytes, total_bytes * 2, started_at, passes=2)
+            Instrumentation.record_process(
+                self._process.args, process_started_at, self._process.returncode, len(stdout) + len(stderr)
+            )
 
             if self._cancel:
+                self.cancelled.emit()
                 return
 
             if self._process.returncode != 0:
                 raise RuntimeError(stderr.decode().strip())
 
+            archives = [name for name in os.listdir(self._job_directory) if name.endswith(EXPORT_EXTENSION)]
+            if not archives:
+                raise RuntimeError(f"Konsave did not create an archive for '{self.theme_name}'")
+            seconds = time.perf_counter() - process_started_at
+            archive_path = self.move_to_destination(os.path.join(self._job_directory, archives[0]))
+            archive_bytes = os.path.getsize(archive_path)
+            # against the profile folder, like the progress it estimates
+            if total_bytes > 0:
+                ExportWorker.compression_ratio = min(1.5, max(0.05, archive_bytes / total_bytes))
+            # the report compares the archive with what it holds: konsave leaves some of the profile out and
+            # adds conf.yaml and the export sections, so the folder size says little about the compression
+            archive_info = KnsvInspector.inspect(archive_path)
+            uncompressed_bytes = archive_info.uncompressed_bytes if archive_info.is_valid() else total_bytes
+            self.export_report = ExportReport(uncompressed_bytes, archive_bytes, seconds)
             self.progress.emit(100)
             self.finished.emit()
 
         except Exception as e:
             self.failed.emit(str(e))
 
-    def get_delay(self, current_progress: int) -> float:
-        base_wait = 0.8
-        if current_progress < 50:
-            return base_wait
-        elif current_progress < 80:
-            return base_wait * 2
-        else:
-            return base_wait * 3
-
-    def remove_created_files(self) -> None:
-        current_files = OsInterface().get_current_files_in_working_directory()
-        created_files = current_files - self._files_present_before_work
-        for file in created_files:
-            path = os.path.join(os.getcwd(), file)
+    def move_to_destination(self, archive_path: str) -> str:
+        # same never-overwrite naming as konsave, checked only once the archive is complete
+        destination = KnsvExporter.get_default_export_path(self.theme_name, self.destination_directory)
+        os.replace(archive_path, destination)
+        self.archive_path = destination
+        return destination
+
+    def report_progress(self, written_bytes: float, total_bytes: int, started_at: float, passes: int = 1) -> None:
+        # passes: how many times the bytes counted go over the profile, so the rate shown is in profile bytes
+        now = time.monotonic()
+        if total_bytes <= 0 or now - self._last_report_at < self.report_interval:
+            return
+        self._last_report_at = now
+        elapsed = now - started_at
+        rate = written_bytes / elapsed if elapsed > 0 else 0.0
+        eta = max(0.0, (total_bytes - written_bytes) / rate) if rate > 0 else -1.0
+        self.progress.emit(min(99, int(written_bytes * 100 / total_bytes)))
+        self.throughput.emit(rate / passes, eta)
+
+    def get_export_sections(self) -> list[Tuple[str, int]]:
+        # (path inside konsave's staging folder, size) of everything it copies, in the order it copies them
+        profile_path = KonsaveConfig.get_profile_path(self.theme_name)
+        if KonsaveConfig.is_available():
             try:
-                if os.path.exists(path):
-                    if os.path.isdir(path):
-                        shutil.rmtree(path, ignore_errors=True)
-                    elif os.path.isfile(path):
-                        os.remove(path)
-            except Exception as e:
-                print(f"Errore durante la rimozione di '{path}': {e}")
+                config = KonsaveConfig.read_profile(self.theme_name)
+                sections = [
+                    (os.path.join("save", name), OsInterface.get_path_size(os.path.join(profile_path, name)))
+                    for name in config["save"]
+                    if os.path.exists(os.path.join(profile_path, name))
+                ]
+                sections += [
+                    (os.path.join("export", name, entry), OsInterface.get_path_size(source))
+                    for name, entry, source in KonsaveConfig.get_export_sources(config)
+                ]
+                return sections
+            except (OSError, RuntimeError, KeyError) as e:
+                print(f"Could not read export entries of '{self.theme_name}'. Error: {e}")
+        # without the profile's sections copying cannot be followed, only zipping
+        return [("", OsInterface.get_path_size(profile_path))]
+
+    def get_done_bytes(self, sections: list[Tuple[str, int]], total_bytes: int) -> float:
+        archive_bytes = 0
+        staging_path = None
+        for entry in os.scandir(self._job_directory):
+            if entry.is_dir():
+                staging_path = entry.path
+            else:
+                archive_bytes += entry.stat().st_size
+        if archive_bytes:
+            # the archive is only written once everything is copied
+            return total_bytes + min(total_bytes, archive_bytes / ExportWorker.compression_ratio)
+        if staging_path is None:
+            return 0
+        # every section before the last one konsave has started is complete
+        copied_bytes = copying_bytes = 0
+        for relative_path, size in sections:
+            if not relative_path or not os.path.exists(os.path.join(staging_path, relative_path)):
+                break
+            copied_bytes += size
+            copying_bytes = size
+        return copied_bytes - copying_bytes
@@ -1,15 +1,49 @@
+import os
+from typing import Optional
+
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from shared.config import Config
+from shared.instrumentation import Instrumentation
+from shared.knsv_inspector import ArchiveInfo, KnsvInspector
+from shared.konsave_config import KonsaveConfig
 from shared.konsave_interface import KonsaveInterface
+from shared.os_interface import OsInterface
 
 
 class ImportWorker(QObject):
     finished = pyqtSignal()
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, verify_crc: Optional[bool] = None):
         super().__init__()
         self.file_path = file_path
+        self.verify_crc = Config.is_import_crc_verification_enabled() if verify_crc is None else verify_crc
+        self._cancel = False
+        # what the pre-import inspection found, once it has run
+        self.archive_info: Optional[ArchiveInfo] = None
+
+    def cancel(self):
+        # konsave -i cannot be interrupted safely, so only an import that has not started yet is cancelled
+        self._cancel = True
 
     def run(self):
-        KonsaveInterface().import_theme(self.file_path)
-        self.finished.emit()
+        if self._cancel:
+            self.cancelled.emit()
+            return
+        try:
+            # a broken, conflicting or too large archive is rejected before konsave starts extracting it
+            with Instrumentation.span("inspect", path=self.file_path, deep=self.verify_crc):
+                self.archive_info = KnsvInspector.inspect(self.file_path, self.verify_crc)
+                problems = KnsvInspector.get_import_problems(self.archive_info)
+            if problems:
+                raise RuntimeError("\n".join(problems))
+            KonsaveInterface().import_theme(self.file_path)
+            # konsave reports its own errors on stdout and still exits with 0
+            theme_name = OsInterface.get_filename_without_extension(self.file_path)
+            if not os.path.isdir(KonsaveConfig.get_profile_path(theme_name)):
+                raise RuntimeError(f"Konsave did not import '{os.path.basename(self.file_path)}'")
+            self.finished.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,126 @@
+from collections import deque
+from enum import Enum
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+
+class JobState(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobQueue(QObject):
+    # Runs workers (QObjects with run/cancel and finished/failed/cancelled signals) on at most
+    # max_concurrent QThreads at a time; queued jobs only get a thread and a worker once they start
+    state_changed = pyqtSignal(str, str)
+    progress = pyqtSignal(str, int)
+    throughput = pyqtSignal(str, float, float)
+    job_failed = pyqtSignal(str, str)
+    drained = pyqtSignal()
+
+    def __init__(self, worker_factory: Callable[[str], QObject], max_concurrent: int, parent=None):
+        super().__init__(parent)
+        self.worker_factory = worker_factory
+        self.max_concurrent = max(1, max_concurrent)
+        self._queue: deque[str] = deque()
+        self._running: dict[str, tuple[QThread, QObject]] = {}
+        self._states: dict[str, JobState] = {}
+        self._rates: dict[str, float] = {}
+
+    def enqueue(self, key: str) -> bool:
+        if self.is_active(key):
+            return False
+        self._queue.append(key)
+        self._set_state(key, JobState.QUEUED)
+        self._start_next()
+        return True
+
+    def cancel(self, key: str) -> None:
+        if key in self._running:
+            _, worker = self._running[key]
+            worker.cancel()
+        elif key in self._queue:
+            # never started, so there is no thread or process to stop
+            self._queue.remove(key)
+            self._set_state(key, JobState.CANCELLED)
+            self._emit_drained_if_idle()
+
+    def cancel_all(self, wait: bool = False) -> None:
+        for key in list(self._queue):
+            self.cancel(key)
+        for key, (_, worker) in list(self._running.items()):
+            worker.cancel()
+            if wait:
+                self._finish(key, JobState.CANCELLED)
+
+    def get_state(self, key: str) -> Optional[JobState]:
+        return self._states.get(key)
+
+    def is_active(self, key: str) -> bool:
+        return self._states.get(key) in (JobState.QUEUED, JobState.RUNNING)
+
+    def get_active_keys(self) -> list[str]:
+        return [*self._running, *self._queue]
+
+    def has_active_jobs(self) -> bool:
+        return bool(self._queue or self._running)
+
+    def count(self, state: JobState) -> int:
+        return sum(1 for s in self._states.values() if s == state)
+
+    def get_aggregate_throughput(self) -> float:
+        return sum(self._rates.get(key, 0.0) for key in self._running)
+
+    def clear_finished(self) -> None:
+        self._states = {key: state for key, state in self._states.items() if key in self._running or key in self._queue}
+
+    def _start_next(self) -> None:
+        while self._queue and len(self._running) < self.max_concurrent:
+            key = self._queue.popleft()
+            worker = self.worker_factory(key)
+            thread = QThread()
+            worker.moveToThread(thread)
+
+            if hasattr(worker, "progress"):
+                worker.progress.connect(lambda value, k=key: self.progress.emit(k, value))
+            if hasattr(worker, "throughput"):
+                worker.throughput.connect(lambda rate, eta, k=key: self._on_throughput(k, rate, eta))
+            worker.finished.connect(lambda k=key: self._finish(k, JobState.DONE))
+            worker.failed.connect(lambda error, k=key: self._finish(k, JobState.FAILED, error))
+            worker.cancelled.connect(lambda k=key: self._finish(k, JobState.CANCELLED))
+            thread.started.connect(worker.run)
+
+            self._running[key] = (thread, worker)
+            self._set_state(key, JobState.RUNNING)
+            thread.start()
+
+    def _finish(self, key: str, state: JobState, error: str = "") -> None:
+        thread, _ = self._running.pop(key, (None, None))
+        if thread is None:
+            return
+        # the worker signals right before run() returns, so this wait is short; afterwards
+        # both objects can be dropped without deleting a worker that is still executing
+        thread.quit()
+        thread.wait()
+        self._rates.pop(key, None)
+        self._set_state(key, state)
+        if state == JobState.FAILED:
+            self.job_failed.emit(key, error)
+        self._start_next()
+        self._emit_drained_if_idle()
+
+    def _on_throughput(self, key: str, rate: float, eta: float) -> None:
+        self._rates[key] = rate
+        self.throughput.emit(key, rate, eta)
+
+    def _set_state(self, key: str, state: JobState) -> None:
+        self._states[key] = state
+        self.state_changed.emit(key, state.value)
+
+    def _emit_drained_if_idle(self) -> None:
+        if not self.has_active_jobs():
+            self.drained.emit()
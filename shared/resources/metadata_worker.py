@@ -0,0 +1,19 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from shared.profile_metadata import ProfileMetadataIndex
+
+
+class MetadataWorker(QObject):
+    # dict of theme name -> ProfileMetadata
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, theme_names: list[str]):
+        super().__init__()
+        self.theme_names = theme_names
+
+    def run(self):
+        try:
+            self.finished.emit(ProfileMetadataIndex().refresh(self.theme_names))
+        except Exception as e:
+            self.failed.emit(str(e))
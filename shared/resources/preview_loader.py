@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from shared.preview_cache import PreviewCache
+from shared.profile_metadata import ProfileMetadataIndex
+from shared.theme_preview import ThemePreview
+
+
+class PreviewJob(QRunnable):
+    def __init__(self, loader: "PreviewLoader", theme_name: str, signature: str):
+        super().__init__()
+        self.loader = loader
+        self.theme_name = theme_name
+        self.signature = signature
+        self.started = False
+
+    def run(self):
+        self.started = True
+        image = None
+        try:
+            cached_path = self.loader.cache.lookup(self.theme_name, self.signature)
+            if cached_path is not None:
+                image = QImage(cached_path)
+                image = None if image.isNull() else image
+            else:
+                image = ThemePreview.render(self.theme_name)
+                self.loader.cache.store(self.theme_name, self.signature, ThemePreview.to_png(image))
+        except Exception as e:
+            print(f"Could not create preview of theme '{self.theme_name}'. Error: {e}")
+        # queued to the loader's thread
+        self.loader.job_finished.emit(self.theme_name, self.signature, image)
+
+
+class PreviewLoader(QObject):
+    # Previews for the rows on screen, rendered or read from the disk cache on a thread pool. Every request
+    # replaces the jobs still waiting, so scrolling past rows never leaves work queued for them, and the
+    # GUI thread only ever reads finished images from memory
+    preview_ready = pyqtSignal(str)
+    job_finished = pyqtSignal(str, str, object)
+
+    def __init__(self, parent=None, max_images: int = 300, max_threads: int = 2):
+        super().__init__(parent)
+        self.cache = PreviewCache()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.max_images = max_images
+        # theme name -> (signature, image or None when the theme has nothing to preview)
+        self._images: OrderedDict[str, Tuple[str, Optional[QImage]]] = OrderedDict()
+        self._jobs: dict[Tuple[str, str], PreviewJob] = {}
+        self.job_finished.connect(self.on_job_finished)
+
+    def get_preview(self, theme_name: str) -> Optional[QImage]:
+        entry = self._images.get(theme_name)
+        if entry is None:
+            return None
+        self._images.move_to_end(theme_name)
+        return entry[1]
+
+    def request(self, theme_names: list[str]) -> None:
+        self.pool.clear()
+        self._jobs = {key: job for key, job in self._jobs.items() if job.started}
+        for theme_name in theme_names:
+            signature = ProfileMetadataIndex.get_signature(theme_name)
+            if signature is None:
+                continue
+            entry = self._images.get(theme_name)
+            if (entry is not None and entry[0] == signature) or (theme_name, signature) in self._jobs:
+                continue
+            job = PreviewJob(self, theme_name, signature)
+            # the loader keeps the job alive and decides when it is dropped
+            job.setAutoDelete(False)
+            self._jobs[(theme_name, signature)] = job
+            self.pool.start(job)
+
+    def invalidate(self, theme_name: str) -> None:
+        self._images.pop(theme_name, None)
+
+    def shutdown(self) -> None:
+        self.pool.clear()
+        self.pool.waitForDone()
+        self._jobs.clear()
+
+    def on_job_finished(self, theme_name: str, signature: str, image: Optional[QImage]) -> None:
+        self._jobs.pop((theme_name, signature), None)
+        self._images[theme_name] = (signature, image)
+        self._images.move_to_end(theme_name)
+        while len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        self.preview_ready.emit(theme_name)
@@ -0,0 +1,20 @@
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class ProbeWorker(QObject):
+    # runs one environment probe (usually a subprocess) off the GUI thread and hands back its result
+    finished = pyqtSignal(object)
+
+    def __init__(self, probe: Callable[[], Any]):
+        super().__init__()
+        self.probe = probe
+
+    def run(self):
+        try:
+            result = self.probe()
+        except Exception as e:
+            print(f"Environment probe failed. Error: {e}")
+            result = None
+        self.finished.emit(result)
@@ -0,0 +1,50 @@
+import os
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from shared.instrumentation import Instrumentation
+from shared.os_interface import OsInterface
+from shared.profile_cache import ProfileCache
+
+
+class ProfileWatcher(QObject):
+    # Keeps the cached profile list in step with konsave's profiles folder, whoever changes it (the terminal,
+    # another KonUI). A burst of events, like konsave creating a profile file by file, is coalesced into one
+    # re-read of the folder listing once it has been quiet for delay_ms; konsave itself is never run
+    # all profiles, then the names added and removed
+    profiles_changed = pyqtSignal(list, list, list)
+
+    def __init__(self, delay_ms: int, parent=None):
+        super().__init__(parent)
+        self.profiles_path = OsInterface.get_konsave_profiles_path()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.on_directory_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.update_profiles)
+        self.watch_paths()
+
+    def watch_paths(self) -> None:
+        # the parent too, so a profiles folder created (or deleted and recreated) later is picked up
+        watched = set(self._watcher.directories())
+        for path in (os.path.dirname(self.profiles_path), self.profiles_path):
+            if path not in watched and os.path.isdir(path):
+                self._watcher.addPath(path)
+
+    def on_directory_changed(self, _path: str) -> None:
+        # restarted on every event, so the folder is read once the burst is over
+        self._timer.start()
+
+    def update_profiles(self) -> None:
+        self.watch_paths()
+        with Instrumentation.span("profiles_rescan"):
+            profiles, added, removed = ProfileCache.update_from_directory()
+        if added or removed:
+            self.profiles_changed.emit(profiles, added, removed)
+
+    def stop(self) -> None:
+        self._timer.stop()
+        directories = self._watcher.directories()
+        if directories:
+            self._watcher.removePaths(directories)
@@ -1,16 +1,48 @@
+from typing import Optional, Tuple
+
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QStyledItemDelegate
 
+from shared.resources.theme_table_model import ThemeTableModel
+
 
 class ProgressBarPainter(QStyledItemDelegate):
-    def __init__(self, progress_map, parent):
+    _STATE_LABELS = {"queued": "Queued", "done": "Exported", "failed": "Export failed"}
+
+    def __init__(self, progress_map, parent, throughput_map: Optional[dict[str, Tuple[float, float]]] = None):
         super().__init__(parent)
-        self.progress_map: dict[int, int] = progress_map
+        # keyed by theme name so progress follows its row through sorting and filtering
+        self.progress_map: dict[str, int] = progress_map
+        self.throughput_map: dict[str, Tuple[float, float]] = throughput_map if throughput_map is not None else {}
 
     def paint(self, painter, option, index):
-        row = index.row()
-        progress = self.progress_map.get(row, 0)
+        theme_name = index.data()
+        progress = self.progress_map.get(theme_name, 0)
         rect = option.rect
         fill_width = int(rect.width() * progress / 100)
         painter.fillRect(rect.adjusted(0, 0, -rect.width() + fill_width, 0), QColor(0, 200, 0, 100))
         super().paint(painter, option, index)
+
+        status = self.get_status_text(theme_name, index.data(ThemeTableModel.ExportStateRole))
+        if status:
+            painter.save()
+            painter.setPen(option.palette.color(option.palette.ColorRole.PlaceholderText))
+            painter.drawText(
+                rect.adjusted(0, 0, -6, 0), Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, status
+            )
+            painter.restore()
+
+    def get_status_text(self, theme_name: str, export_state: Optional[str]) -> str:
+        throughput = self.throughput_map.get(theme_name)
+        if export_state == "running" and throughput:
+            return self.format_throughput(*throughput)
+        return self._STATE_LABELS.get(export_state or "", "")
+
+    @staticmethod
+    def format_throughput(bytes_per_second: float, eta_seconds: float) -> str:
+        text = f"{bytes_per_second / 1_000_000:.1f} MB/s"
+        if eta_seconds >= 0:
+            minutes, seconds = divmod(int(eta_seconds), 60)
+            text += f" · ETA {minutes}:{seconds:02d}"
+        return text
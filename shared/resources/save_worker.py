@@ -0,0 +1,56 @@
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from shared.config import Config
+from shared.incremental_save import SaveCancelledError
+from shared.konsave_config import KonsaveConfig
+from shared.konsave_interface import KonsaveInterface
+
+
+class SaveWorker(QObject):
+    progress = pyqtSignal(int)
+    # copied files, copied bytes, skipped files, skipped bytes (incremental mode only)
+    files_saved = pyqtSignal(int, int, int, int)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    report_interval = 0.1
+
+    def __init__(self, theme_name: str):
+        super().__init__()
+        self.theme_name = theme_name
+        self._cancel_event = threading.Event()
+        self._last_report_at = 0.0
+
+    def cancel(self):
+        # 'konsave -s' is never interrupted; an incremental save stops before its next file
+        self._cancel_event.set()
+
+    def is_incremental(self) -> bool:
+        return Config.get_save_mode() == "incremental" and KonsaveConfig.is_available()
+
+    def run(self):
+        try:
+            if self.is_incremental():
+                report = KonsaveInterface().save_theme_incremental(
+                    self.theme_name, self.report_progress, self._cancel_event
+                )
+                self.files_saved.emit(*report)
+            else:
+                KonsaveInterface().save_theme(self.theme_name)
+            self.progress.emit(100)
+            self.finished.emit()
+        except SaveCancelledError:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def report_progress(self, saved_files: int, total_files: int) -> None:
+        now = time.monotonic()
+        if now - self._last_report_at < self.report_interval:
+            return
+        self._last_report_at = now
+        self.progress.emit(int(saved_files * 100 / total_files))
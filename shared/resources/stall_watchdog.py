@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QTimer
+
+from shared.instrumentation import Instrumentation
+
+
+class StallWatchdog(QObject):
+    # A timer on the GUI thread beats every interval. A background thread grabs the GUI thread's Python stack
+    # as soon as a beat is late by more than the threshold, while the code that blocks the event loop is still
+    # running; the next beat records how long the stall lasted together with that stack. Beats are numbered
+    # and a stack is kept with the number of the beat it was late for, so a stack grabbed just as the GUI
+    # thread recovered is dropped instead of being reported with a later stall
+    def __init__(self, threshold_ms: int, interval_ms: int = 50, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._gui_thread_id = threading.get_ident()
+        # guards the three fields below, shared by both threads
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._beat_number = 0
+        self._stack: Optional[tuple[int, list[str]]] = None
+        self._stop = threading.Event()
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.beat)
+        self._thread = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+
+    def start(self) -> None:
+        with self._lock:
+            self._last_beat = time.monotonic()
+        self._timer.start()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._stop.set()
+
+    def beat(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            stalled_for = now - self._last_beat - self.interval
+            beat_number = self._beat_number
+            self._beat_number += 1
+            self._last_beat = now
+            captured, self._stack = self._stack, None
+        if stalled_for > self.threshold:
+            stack = captured[1] if captured is not None and captured[0] == beat_number else None
+            Instrumentation.record("gui_stall", duration_ms=round(stalled_for * 1000, 1), stack=stack)
+
+    def watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            with self._lock:
+                beat_number = self._beat_number
+                late = time.monotonic() - self._last_beat - self.interval > self.threshold
+                if not late or self._stack is not None:
+                    continue
+            frame = sys._current_frames().get(self._gui_thread_id)
+            if frame is None:
+                continue
+            # formatted outside the lock: a beat arriving meanwhile must not wait for it
+            stack = traceback.format_stack(frame)
+            with self._lock:
+                if self._beat_number == beat_number:
+                    self._stack = (beat_number, stack)
@@ -0,0 +1,40 @@
+from PyQt6.QtCore import QEvent, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPen
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate
+
+from shared.resources.theme_table_model import ThemeTableModel
+
+
+class TableActionPainter(QStyledItemDelegate):
+    clicked = pyqtSignal(str, int)
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.hover_color = QColor("#B0C4DE")
+        self.icon_font = QFont()
+        self.icon_font.setPixelSize(18)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        enabled = bool(index.flags() & Qt.ItemFlag.ItemIsEnabled)
+        rect = QRectF(option.rect).adjusted(2, 2, -2, -2)
+        if enabled and option.state & QStyle.StateFlag.State_MouseOver:
+            painter.setRenderHint(painter.RenderHint.Antialiasing)
+            painter.setPen(QPen(self.hover_color, 2))
+            painter.drawRoundedRect(rect, 9, 9)
+        if not enabled:
+            painter.setOpacity(0.35)
+        painter.setFont(self.icon_font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, index.data() or "")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+            and index.flags() & Qt.ItemFlag.ItemIsEnabled
+            and option.rect.contains(event.position().toPoint())
+        ):
+            self.clicked.emit(index.data(ThemeTableModel.ThemeNameRole), index.column())
+            return True
+        return super().editorEvent(event, model, option, index)
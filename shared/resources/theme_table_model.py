@@ -0,0 +1,295 @@
+import time
+from difflib import SequenceMatcher
+from typing import Any, Callable, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor, QImage
+
+from shared.profile_metadata import ProfileMetadata
+from shared.theme_search_index import ThemeSearchIndex
+
+
+class ThemeTableModel(QAbstractTableModel):
+    NAME_COLUMN = 0
+    SIZE_COLUMN = 1
+    MODIFIED_COLUMN = 2
+    APPLY_COLUMN = 3
+    DELETE_COLUMN = 4
+    EXPORT_COLUMN = 5
+    ThemeNameRole = Qt.ItemDataRole.UserRole + 1
+    ExportStateRole = Qt.ItemDataRole.UserRole + 2
+    # plain numbers for the proxy to compare, so sorting never parses display text
+    SortRole = Qt.ItemDataRole.UserRole + 3
+
+    _HEADERS = {NAME_COLUMN: "Theme", SIZE_COLUMN: "Size", MODIFIED_COLUMN: "Saved"}
+
+    _ACTIONS = {
+        APPLY_COLUMN: ("✅", "Apply this theme"),
+        DELETE_COLUMN: ("🗑️", "Delete this theme"),
+        EXPORT_COLUMN: ("📦", "Export this theme"),
+    }
+    _EXPORT_STATE_ACTIONS = {
+        "queued": ("⏳", "Queued for export, click to remove it from the queue"),
+        "running": ("❌", "Cancel export"),
+    }
+
+    def __init__(self, themes: list[Tuple[int, str]], active_theme: Optional[str], active_color: str, parent=None):
+        super().__init__(parent)
+        # every profile, and the rows currently shown (all of them unless a search is active)
+        self._all_themes: list[Tuple[int, str]] = list(themes)
+        self._themes: list[Tuple[int, str]] = list(themes)
+        self._search_query = ""
+        self._search_index: Optional[ThemeSearchIndex] = None
+        self._rows: dict[str, int] = {}
+        self._rows_valid = False
+        self._active_theme = active_theme
+        self._active_color = QColor(active_color)
+        self._export_states: dict[str, str] = {}
+        self._metadata: dict[str, ProfileMetadata] = {}
+        # returns an already rendered preview or None, never renders one itself
+        self._preview_source: Optional[Callable[[str], Optional[QImage]]] = None
+
+    # Qt override. do not rename this method
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._themes)
+
+    # Qt override. do not rename this method
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ACTIONS) + len(self._HEADERS)
+
+    # Qt override. do not rename this method
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        name = self._themes[index.row()][1]
+        column = index.column()
+
+        if role == self.ThemeNameRole:
+            return name
+        if role == self.ExportStateRole:
+            return self._export_states.get(name)
+        if role == self.SortRole:
+            return self._get_sort_key(name, column)
+        if column in (self.SIZE_COLUMN, self.MODIFIED_COLUMN):
+            return self._get_metadata_data(name, column, role)
+        if column == self.NAME_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return name
+            if role == Qt.ItemDataRole.DecorationRole and self._preview_source is not None:
+                return self._preview_source(name)
+            if name == self._active_theme:
+                if role == Qt.ItemDataRole.BackgroundRole:
+                    return self._active_color
+                if role == Qt.ItemDataRole.ForegroundRole:
+                    return QColor("black")
+            return None
+
+        icon, tooltip = self._get_action(name, column)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return icon
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return tooltip
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    # Qt override. do not rename this method
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            return str(self._themes[section][0]) if 0 <= section < len(self._themes) else None
+        return self._HEADERS.get(section)
+
+    # Qt override. do not rename this method
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        name = self._themes[index.row()][1]
+        if index.column() in (self.APPLY_COLUMN, self.DELETE_COLUMN) and self.is_exporting(name):
+            return Qt.ItemFlag.ItemIsSelectable
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def set_themes(self, themes: list[Tuple[int, str]]) -> None:
+        if [name for _, name in themes] != [name for _, name in self._all_themes]:
+            self._search_index = None
+        self._all_themes = list(themes)
+        if self._search_query:
+            self._show_search_results()
+            return
+        self._set_visible_themes(themes)
+
+    def set_search_query(self, query: str) -> None:
+        # filtering happens here rather than in a proxy filterAcceptsRow, which Qt would call once per row
+        query = query.strip()
+        if query == self._search_query:
+            return
+        self._search_query = query
+        if query:
+            self._show_search_results()
+        else:
+            self._rearrange_rows(self._all_themes)
+
+    def is_searching(self) -> bool:
+        return bool(self._search_query)
+
+    def _show_search_results(self) -> None:
+        if self._search_index is None:
+            self._search_index = ThemeSearchIndex([name for _, name in self._all_themes])
+        rows = self._search_index.search(self._search_query)
+        self._rearrange_rows([self._all_themes[row] for row in rows])
+
+    def _rearrange_rows(self, themes: list[Tuple[int, str]]) -> None:
+        # Search results are ranked, so rows move as well as come and go. Rows are removed and inserted in
+        # contiguous runs and the ones kept are reordered in a single layout change: O(n), and selection,
+        # scroll position and delegate state follow their rows instead of being reset
+        if themes == self._themes:
+            # most keystrokes while typing a longer query leave the results as they are
+            return
+        new_names = {name for _, name in themes}
+        row = len(self._themes)
+        while row > 0:
+            if self._themes[row - 1][1] in new_names:
+                row -= 1
+                continue
+            end = row
+            while row > 0 and self._themes[row - 1][1] not in new_names:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row, end - 1)
+            del self._themes[row:end]
+            self._rows_valid = False
+            self.endRemoveRows()
+
+        old_names = [name for _, name in self._themes]
+        kept_names = set(old_names)
+        kept = [theme for theme in themes if theme[1] in kept_names]
+        if [name for _, name in kept] != old_names:
+            self.layoutAboutToBeChanged.emit()
+            new_rows = {name: row for row, (_, name) in enumerate(kept)}
+            self._themes = kept
+            self._rows_valid = False
+            persistent = self.persistentIndexList()
+            self.changePersistentIndexList(
+                persistent, [self.index(new_rows[old_names[index.row()]], index.column()) for index in persistent]
+            )
+            self.layoutChanged.emit()
+
+        row = 0
+        while row < len(themes):
+            if themes[row][1] in kept_names:
+                row += 1
+                continue
+            end = row
+            while end < len(themes) and themes[end][1] not in kept_names:
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._themes[row:row] = themes[row:end]
+            self._rows_valid = False
+            self.endInsertRows()
+            row = end
+
+        # the numbers konsave gives its profiles may have changed under the same names
+        renumbered = [row for row, (theme, new_theme) in enumerate(zip(self._themes, themes)) if theme != new_theme]
+        self._themes = list(themes)
+        if renumbered:
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, renumbered[0], renumbered[-1])
+
+    def _set_visible_themes(self, themes: list[Tuple[int, str]]) -> None:
+        old_names = [name for _, name in self._themes]
+        new_names = [name for _, name in themes]
+        opcodes = SequenceMatcher(None, old_names, new_names, autojunk=False).get_opcodes()
+
+        # Applied back to front so the row numbers of pending opcodes stay valid
+        for tag, old_start, old_end, new_start, new_end in reversed(opcodes):
+            if tag in ("delete", "replace"):
+                self.beginRemoveRows(QModelIndex(), old_start, old_end - 1)
+                del self._themes[old_start:old_end]
+                self.endRemoveRows()
+            if tag in ("insert", "replace"):
+                self.beginInsertRows(QModelIndex(), old_start, old_start + new_end - new_start - 1)
+                self._themes[old_start:old_start] = themes[new_start:new_end]
+                self.endInsertRows()
+        self._rows_valid = False
+
+        # Konsave renumbers profiles after a removal, so only the vertical header needs refreshing
+        renumbered = [row for row, (theme, new_theme) in enumerate(zip(self._themes, themes)) if theme != new_theme]
+        self._themes = list(themes)
+        if renumbered:
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, renumbered[0], renumbered[-1])
+
+    def set_active_theme(self, active_theme: Optional[str]) -> None:
+        previous_theme, self._active_theme = self._active_theme, active_theme
+        for theme_name in (previous_theme, active_theme):
+            if theme_name:
+                self.refresh_theme(theme_name, self.NAME_COLUMN)
+
+    def set_export_state(self, theme_name: str, state: Optional[str]) -> None:
+        if state is None:
+            self._export_states.pop(theme_name, None)
+        else:
+            self._export_states[theme_name] = state
+        self.refresh_theme(theme_name)
+
+    def set_metadata(self, metadata: dict[str, ProfileMetadata]) -> None:
+        self._metadata = metadata
+        if self._themes:
+            self.dataChanged.emit(
+                self.index(0, self.SIZE_COLUMN), self.index(len(self._themes) - 1, self.MODIFIED_COLUMN)
+            )
+
+    def set_preview_source(self, preview_source: Optional[Callable[[str], Optional[QImage]]]) -> None:
+        self._preview_source = preview_source
+
+    def is_exporting(self, theme_name: str) -> bool:
+        return self._export_states.get(theme_name) in self._EXPORT_STATE_ACTIONS
+
+    def refresh_theme(self, theme_name: str, column: Optional[int] = None) -> None:
+        row = self.get_row(theme_name)
+        if row is None:
+            return
+        first_column = 0 if column is None else column
+        last_column = self.columnCount() - 1 if column is None else column
+        self.dataChanged.emit(self.index(row, first_column), self.index(row, last_column))
+
+    def get_row(self, theme_name: str) -> Optional[int]:
+        if not self._rows_valid:
+            self._rows = {name: row for row, (_, name) in enumerate(self._themes)}
+            self._rows_valid = True
+        return self._rows.get(theme_name)
+
+    def _get_action(self, theme_name: str, column: int) -> Tuple[str, str]:
+        if column == self.EXPORT_COLUMN and self.is_exporting(theme_name):
+            return self._EXPORT_STATE_ACTIONS[self._export_states[theme_name]]
+        return self._ACTIONS[column]
+
+    def _get_sort_key(self, theme_name: str, column: int) -> Any:
+        metadata = self._metadata.get(theme_name)
+        if column == self.SIZE_COLUMN:
+            return metadata.size if metadata else -1
+        if column == self.MODIFIED_COLUMN:
+            return metadata.modified if metadata else -1.0
+        return theme_name.casefold()
+
+    def _get_metadata_data(self, theme_name: str, column: int, role: int) -> Any:
+        metadata = self._metadata.get(theme_name)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if metadata is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.SIZE_COLUMN:
+                return f"{metadata.size / 1_000_000:.1f} MB"
+            return time.strftime("%Y-%m-%d", time.localtime(metadata.modified))
+        if role == Qt.ItemDataRole.ToolTipRole:
+            last_applied = (
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(metadata.last_applied))
+                if metadata.last_applied
+                else "never"
+            )
+            return (
+                f"{metadata.file_count} file(s), {metadata.size / 1_000_000:.1f} MB\n"
+                f"Created: {time.strftime('%Y-%m-%d %H:%M', time.localtime(metadata.created))}\n"
+                f"Saved: {time.strftime('%Y-%m-%d %H:%M', time.localtime(metadata.modified))}\n"
+                f"Last applied: {last_applied}"
+            )
+        return None
@@ -0,0 +1,48 @@
+import json
+import os
+import time
+from typing import Optional
+
+from shared.os_interface import OsInterface
+
+_IMPORTED_AT = time.monotonic()
+
+
+class StartupTimer:
+    # Milliseconds from process start to each startup milestone, appended as one JSON line per launch
+    # to the cache so that cold start can be compared across changes
+    log_name = "startup_times.jsonl"
+    _marks: dict[str, float] = {}
+    _written = False
+
+    @staticmethod
+    def get_process_age() -> float:
+        # measured from the process start time so the interpreter and PyQt6 imports are included
+        try:
+            with open("/proc/self/stat", "r") as file:
+                start_ticks = int(file.read().rsplit(")", 1)[1].split()[19])
+            with open("/proc/uptime", "r") as file:
+                uptime = float(file.read().split()[0])
+            return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+        except (OSError, ValueError, IndexError):
+            return time.monotonic() - _IMPORTED_AT
+
+    @classmethod
+    def mark(cls, name: str) -> None:
+        cls._marks.setdefault(name, round(cls.get_process_age() * 1000, 1))
+
+    @classmethod
+    def get_mark(cls, name: str) -> Optional[float]:
+        return cls._marks.get(name)
+
+    @classmethod
+    def write_when_complete(cls, *names: str) -> None:
+        if cls._written or any(name not in cls._marks for name in names):
+            return
+        cls._written = True
+        record = {"timestamp": time.time(), **cls._marks}
+        try:
+            with open(os.path.join(OsInterface.get_cache_path(), cls.log_name), "a", encoding="utf-8") as file:
+                file.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Could not record startup times. Error: {e}")
@@ -0,0 +1,183 @@
+import os
+import re
+from typing import Optional
+from urllib.parse import unquote, urlparse
+
+from PyQt6.QtCore import QBuffer, QIODevice, QRect, QSize, Qt
+from PyQt6.QtGui import QColor, QImage, QImageReader, QPainter
+
+from shared.konsave_config import KonsaveConfig
+
+# (group, key) of the kdeglobals colours shown as swatches, left to right
+_SWATCHES = (
+    ("Colors:Window", "BackgroundNormal"),
+    ("Colors:View", "BackgroundNormal"),
+    ("Colors:Button", "BackgroundNormal"),
+    ("Colors:Selection", "BackgroundNormal"),
+    ("Colors:Window", "ForegroundNormal"),
+)
+_WALLPAPER_GROUP = re.compile(r"\]\[Wallpaper\]\[[^\]]+\]\[General$")
+_SCHEME_FOLDERS = (
+    os.path.expanduser("~/.local/share/color-schemes"),
+    "/usr/share/color-schemes",
+)
+
+
+class ThemePreview:
+    # Small thumbnail of a saved profile: its wallpaper, downscaled while decoding, next to swatches of
+    # the colour scheme in its kdeglobals. Only QImage is used, so previews can be rendered off the GUI thread
+    WIDTH = 72
+    HEIGHT = 26
+    WALLPAPER_WIDTH = 42
+
+    @staticmethod
+    def render(theme_name: str) -> Optional[QImage]:
+        # None when the profile has neither colours nor a readable wallpaper
+        profile_path = KonsaveConfig.get_profile_path(theme_name)
+        colors = ThemePreview.get_colors(profile_path)
+        wallpaper = ThemePreview.load_wallpaper(profile_path)
+        if not colors and wallpaper is None:
+            return None
+
+        image = QImage(ThemePreview.WIDTH, ThemePreview.HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        swatch_left = 0
+        if wallpaper is not None:
+            swatch_left = ThemePreview.WALLPAPER_WIDTH if colors else ThemePreview.WIDTH
+            source = QRect(0, 0, swatch_left, ThemePreview.HEIGHT)
+            # centre crop of the scaled wallpaper
+            source.moveCenter(wallpaper.rect().center())
+            painter.drawImage(QRect(0, 0, swatch_left, ThemePreview.HEIGHT), wallpaper, source)
+        if colors:
+            width = ThemePreview.WIDTH - swatch_left
+            for number, color in enumerate(colors):
+                left = swatch_left + width * number // len(colors)
+                right = swatch_left + width * (number + 1) // len(colors)
+                painter.fillRect(QRect(left, 0, right - left, ThemePreview.HEIGHT), color)
+        painter.setPen(QColor(0, 0, 0, 60))
+        painter.drawRect(image.rect().adjusted(0, 0, -1, -1))
+        painter.end()
+        return image
+
+    @staticmethod
+    def to_png(image: Optional[QImage]) -> bytes:
+        if image is None:
+            return b""
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "PNG")
+        return bytes(buffer.data())
+
+    @staticmethod
+    def get_colors(profile_path: str) -> list[QColor]:
+        kdeglobals = ThemePreview._find_profile_file(profile_path, "kdeglobals")
+        if kdeglobals is None:
+            return []
+        groups = ThemePreview._read_kde_config(kdeglobals)
+        if not any(group in groups for group, _ in _SWATCHES):
+            # kdeglobals only names the scheme when it was never customised: read the scheme file instead
+            scheme_name = groups.get("General", {}).get("ColorScheme")
+            scheme_file = ThemePreview._find_color_scheme(profile_path, scheme_name) if scheme_name else None
+            if scheme_file is None:
+                return []
+            groups = ThemePreview._read_kde_config(scheme_file)
+
+        colors = []
+        for group, key in _SWATCHES:
+            color = ThemePreview._parse_color(groups.get(group, {}).get(key, ""))
+            if color is not None:
+                colors.append(color)
+        return colors
+
+    @staticmethod
+    def load_wallpaper(profile_path: str) -> Optional[QImage]:
+        wallpaper_path = ThemePreview.get_wallpaper_path(profile_path)
+        if wallpaper_path is None:
+            return None
+        reader = QImageReader(wallpaper_path)
+        size = reader.size()
+        if size.isValid():
+            # decoders like JPEG skip most of the work when told the target size up front
+            target = QSize(ThemePreview.WALLPAPER_WIDTH, ThemePreview.HEIGHT)
+            reader.setScaledSize(size.scaled(target, Qt.AspectRatioMode.KeepAspectRatioByExpanding))
+        image = reader.read()
+        return None if image.isNull() else image
+
+    @staticmethod
+    def get_wallpaper_path(profile_path: str) -> Optional[str]:
+        appletsrc = ThemePreview._find_profile_file(profile_path, "plasma-org.kde.plasma.desktop-appletsrc")
+        if appletsrc is None:
+            return None
+        for group, entries in ThemePreview._read_kde_config(appletsrc).items():
+            image = entries.get("Image")
+            if image and _WALLPAPER_GROUP.search(group):
+                path = unquote(urlparse(image).path) if image.startswith("file:") else image
+                if os.path.isdir(path):
+                    # wallpaper package: one picture per resolution
+                    path = ThemePreview._get_package_image(path)
+                if path and os.path.isfile(path):
+                    return path
+        return None
+
+    @staticmethod
+    def _get_package_image(package_path: str) -> Optional[str]:
+        images_path = os.path.join(package_path, "contents", "images")
+        try:
+            file_names = sorted(os.listdir(images_path))
+        except OSError:
+            return None
+        # the smallest one is the cheapest to decode
+        file_names.sort(key=lambda name: [int(part) for part in re.findall(r"\d+", name)[:2]] or [0])
+        return os.path.join(images_path, file_names[0]) if file_names else None
+
+    @staticmethod
+    def _find_color_scheme(profile_path: str, scheme_name: str) -> Optional[str]:
+        file_name = f"{scheme_name}.colors"
+        scheme_file = ThemePreview._find_profile_file(profile_path, os.path.join("color-schemes", file_name))
+        if scheme_file is not None:
+            return scheme_file
+        for folder in _SCHEME_FOLDERS:
+            if os.path.isfile(os.path.join(folder, file_name)):
+                return os.path.join(folder, file_name)
+        return None
+
+    @staticmethod
+    def _find_profile_file(profile_path: str, relative_path: str) -> Optional[str]:
+        # konsave keeps each save section in its own folder, the config files in one of them
+        try:
+            sections = os.listdir(profile_path)
+        except OSError:
+            return None
+        for section in sorted(sections):
+            candidate = os.path.join(profile_path, section, relative_path)
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    @staticmethod
+    def _read_kde_config(path: str) -> dict[str, dict[str, str]]:
+        # KConfig files are not strict INI (repeated groups, keys without values, [$e] markers),
+        # so only what the preview needs is parsed
+        groups: dict[str, dict[str, str]] = {}
+        entries: dict[str, str] = {}
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as file:
+                for line in file:
+                    line = line.strip()
+                    if line.startswith("[") and line.endswith("]"):
+                        entries = groups.setdefault(line[1:-1], {})
+                    elif "=" in line and not line.startswith("#"):
+                        key, value = line.split("=", 1)
+                        entries[key.split("[", 1)[0].strip()] = value.strip()
+        except OSError as e:
+            print(f"Could not read {path}. Error: {e}")
+        return groups
+
+    @staticmethod
+    def _parse_color(value: str) -> Optional[QColor]:
+        parts = value.split(",")
+        if len(parts) in (3, 4) and all(part.strip().isdigit() for part in parts):
+            return QColor(*(min(int(part), 255) for part in parts))
+        color = QColor(value)
+        return color if value and color.isValid() else None
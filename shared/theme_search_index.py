@@ -0,0 +1,91 @@
+import re
+from bisect import bisect_right
+from typing import Optional
+
+# sort keys pack (tier, position, row) into one int: cheaper to build and compare than tuples
+_ROW_BITS = 24
+_POSITION_BITS = 16
+
+
+class ThemeSearchIndex:
+    # Built once per profile list: every casefolded name on its own line of one string. A fresh query is
+    # a regex scan of that string, which runs in C and stops once per matching name, so a keystroke only
+    # costs Python work for the names that match
+    PREFIX, WORD_START, SUBSTRING, SUBSEQUENCE = range(4)
+
+    def __init__(self, names: list[str]):
+        self.names = list(names)
+        self._folded = [name.casefold() for name in self.names]
+        self._text = "\n".join(self._folded)
+        self._line_starts: list[int] = []
+        offset = 0
+        for folded in self._folded:
+            self._line_starts.append(offset)
+            offset += len(folded) + 1
+        self._last_query = ""
+        self._last_rows: Optional[list[int]] = None
+
+    def search(self, query: str) -> list[int]:
+        # rows of self.names matching query, best first: prefix, word start and substring matches by
+        # position, then subsequence matches by how tightly the typed characters sit together
+        query = query.strip().casefold()
+        if not query:
+            self._last_query, self._last_rows = "", None
+            return list(range(len(self.names)))
+
+        # typing usually extends the previous query, and only names that matched it can match the new one
+        if self._last_rows is not None and query.startswith(self._last_query):
+            keys = self._rank_candidates(query, self._last_rows)
+        else:
+            keys = self._rank_all(query)
+        keys.sort()
+        row_mask = (1 << _ROW_BITS) - 1
+        rows = [key & row_mask for key in keys]
+        self._last_query, self._last_rows = query, rows
+        return rows
+
+    def _rank_all(self, query: str) -> list[int]:
+        keys, matched = [], set()
+        text, line_starts, get_key, get_tier = self._text, self._line_starts, self._get_key, self._get_tier
+        # the pattern eats the rest of the line, so finditer yields only the first occurrence in each name
+        for match in re.finditer(f"{re.escape(query)}[^\n]*", text):
+            start = match.start()
+            row = bisect_right(line_starts, start) - 1
+            position = start - line_starts[row]
+            keys.append(get_key(get_tier(text, start, position), position, row))
+            matched.add(row)
+
+        if len(query) > 1:
+            # lazy gaps find the first occurrence of each character after the previous one
+            gaps = "[^\n]*?".join(re.escape(character) for character in query)
+            for match in re.finditer(f"({gaps})[^\n]*", text):
+                row = bisect_right(line_starts, match.start()) - 1
+                if row not in matched:
+                    keys.append(self._get_key(self.SUBSEQUENCE, match.end(1) - match.start(1), row))
+        return keys
+
+    def _rank_candidates(self, query: str, candidates: list[int]) -> list[int]:
+        keys = []
+        subsequence = None
+        for row in candidates:
+            folded = self._folded[row]
+            position = folded.find(query)
+            if position >= 0:
+                keys.append(self._get_key(self._get_tier(folded, position, position), position, row))
+                continue
+            if subsequence is None:
+                subsequence = re.compile("[^\n]*?".join(re.escape(character) for character in query))
+            match = subsequence.search(folded)
+            if match:
+                keys.append(self._get_key(self.SUBSEQUENCE, match.end() - match.start(), row))
+        return keys
+
+    def _get_tier(self, text: str, start: int, position: int) -> int:
+        if position == 0:
+            return self.PREFIX
+        return self.SUBSTRING if text[start - 1].isalnum() else self.WORD_START
+
+    @staticmethod
+    def _get_key(tier: int, position: int, row: int) -> int:
+        position = min(position, (1 << _POSITION_BITS) - 1)
+        return (((tier << _POSITION_BITS) | position) << _ROW_BITS) | row
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# the global konsave configuration every test home starts from
+CONFIG = """\
+save:
+  configs:
+    location: "$CONFIG_DIR"
+    entries:
+      - kdeglobals
+      - gtk-3.0
+export:
+  share_folder:
+    location: "$SHARE_DIR"
+    entries:
+      - color-schemes
+      - missing-entry
+"""
+
+
+def run_konsave(home: str, *arguments: str, cwd=None) -> None:
+    # a fresh interpreter per call: konsave resolves its folders from HOME once, when it is imported
+    subprocess.run(
+        [sys.executable, "-m", "konsave", *arguments],
+        env={**os.environ, "HOME": home},
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def write_file(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+
+
+def read_tree(root: str) -> dict[str, bytes]:
+    tree = {}
+    for directory, _, file_names in os.walk(root):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            with open(path, "rb") as file:
+                tree[os.path.relpath(path, root)] = file.read()
+    return tree
+
+
+@pytest.fixture
+def konsave_home(tmp_path, monkeypatch):
+    # a throwaway HOME with konsave's configuration and a few live files, KonUI's cache inside it
+    home = str(tmp_path / "home")
+    write_file(os.path.join(home, ".config", "konsave", "conf.yaml"), CONFIG.encode())
+    write_file(os.path.join(home, ".config", "kdeglobals"), b"[General]\nColorScheme=Roundtrip\n")
+    write_file(os.path.join(home, ".config", "gtk-3.0", "settings.ini"), b"[Settings]\ngtk-theme-name=Breeze\n")
+    write_file(os.path.join(home, ".config", "gtk-3.0", "empty.css"), b"")
+    write_file(os.path.join(home, ".local", "share", "color-schemes", "Roundtrip.colors"), os.urandom(3 * 1024 * 1024))
+    monkeypatch.setenv("HOME", home)
+    monkeypatch.setenv("XDG_CACHE_HOME", os.path.join(home, ".cache"))
+    monkeypatch.setenv("XDG_DATA_HOME", os.path.join(home, ".local", "share"))
+    return home
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def run_main(*arguments: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, MAIN, *arguments], capture_output=True, text=True, check=True)
+
+
+@pytest.mark.parametrize("help_flag", ["--help", "-h"])
+def test_command_help_shows_its_options(help_flag):
+    output = run_main("export", help_flag).stdout
+
+    assert "usage: main.py export" in output
+    assert "--compression" in output
+    assert "--trace" not in output
+
+
+def test_help_without_command_lists_commands():
+    output = run_main("--help").stdout
+
+    assert "usage: konui" in output
+    assert "export" in output
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+pytest.importorskip("yaml")
+pytest.importorskip("konsave")
+
+from conftest import read_tree, run_konsave, write_file  # noqa: E402
+from shared.incremental_save import IncrementalSaver  # noqa: E402
+
+
+def get_profile_path(home: str, theme_name: str) -> str:
+    return os.path.join(home, ".config", "konsave", "profiles", theme_name)
+
+
+def test_save_matches_konsave_save(konsave_home):
+    run_konsave(konsave_home, "-s", "reference")
+
+    report = IncrementalSaver("incremental").save()
+
+    assert report.copied_files == 3 and report.skipped_files == 0
+    assert read_tree(get_profile_path(konsave_home, "incremental")) == read_tree(
+        get_profile_path(konsave_home, "reference")
+    )
+
+
+def test_save_again_copies_only_changed_files(konsave_home):
+    IncrementalSaver("incremental").save()
+    kdeglobals = os.path.join(konsave_home, ".config", "kdeglobals")
+    write_file(kdeglobals, b"[General]\nColorScheme=Changed\n")
+    # touched, but with the same content: skipped after comparing hashes
+    os.utime(os.path.join(konsave_home, ".config", "gtk-3.0", "settings.ini"))
+    run_konsave(konsave_home, "-s", "reference")
+
+    report = IncrementalSaver("incremental").save()
+
+    assert (report.copied_files, report.skipped_files) == (1, 2)
+    assert read_tree(get_profile_path(konsave_home, "incremental")) == read_tree(
+        get_profile_path(konsave_home, "reference")
+    )
+
+
+def test_indexes_are_kept_per_profile(konsave_home):
+    IncrementalSaver("first").save()
+
+    report = IncrementalSaver("second").save()
+
+    assert report.copied_files == 3
+    assert read_tree(get_profile_path(konsave_home, "second")) == read_tree(get_profile_path(konsave_home, "first"))
@@ -0,0 +1,60 @@
+import os
+import zipfile
+
+import pytest
+
+pytest.importorskip("yaml")
+pytest.importorskip("konsave")
+
+from conftest import read_tree, run_konsave  # noqa: E402
+from shared.knsv_exporter import KnsvExporter  # noqa: E402
+
+THEME_NAME = "roundtrip"
+
+
+def read_archive(path: str) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as archive:
+        return {info.filename: archive.read(info) for info in archive.infolist() if not info.is_dir()}
+
+
+@pytest.fixture
+def home(konsave_home):
+    run_konsave(konsave_home, "-s", THEME_NAME)
+    return konsave_home
+
+
+@pytest.mark.parametrize("compression", ["default", "store", "max"])
+def test_archive_matches_konsave_export(home, tmp_path, monkeypatch, compression):
+    konsave_dir = tmp_path / "konsave"
+    konsave_dir.mkdir()
+    run_konsave(home, "-e", THEME_NAME, cwd=konsave_dir)
+    expected = read_archive(str(konsave_dir / f"{THEME_NAME}.knsv"))
+
+    streamed = []
+    stream_file = KnsvExporter._stream_file
+    monkeypatch.setattr(
+        KnsvExporter, "_stream_file", lambda self, *args: streamed.append(args[2]) or stream_file(self, *args)
+    )
+    # a small chunk size sends every file larger than 1 KB through the streamed path, in many chunks
+    exporter = KnsvExporter.for_compression(compression, chunk_size=1024)
+    archive_path = str(tmp_path / f"{THEME_NAME}.knsv")
+    exporter.export(THEME_NAME, archive_path)
+
+    assert read_archive(archive_path) == expected
+    assert "export/share_folder/color-schemes/Roundtrip.colors" in streamed
+
+
+def test_konsave_imports_archive(home, tmp_path):
+    archive_path = str(tmp_path / "imported.knsv")
+    KnsvExporter(chunk_size=1024).export(THEME_NAME, archive_path)
+    exported_file = os.path.join(home, ".local", "share", "color-schemes", "Roundtrip.colors")
+    with open(exported_file, "rb") as file:
+        exported_content = file.read()
+    os.remove(exported_file)
+
+    run_konsave(home, "-i", archive_path)
+
+    profiles_path = os.path.join(home, ".config", "konsave", "profiles")
+    assert read_tree(os.path.join(profiles_path, "imported")) == read_tree(os.path.join(profiles_path, THEME_NAME))
+    with open(exported_file, "rb") as file:
+        assert file.read() == exported_content
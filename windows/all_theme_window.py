@@ -1,10 +1,9 @@
 import os
-import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
 
-from PyQt6.QtCore import QEasingCurve, QPropertyAnimation, Qt, QThread
-from PyQt6.QtGui import QColor, QFont, QIcon, QMovie
+from PyQt6.QtCore import QEasingCurve, QPropertyAnimation, QSortFilterProxyModel, Qt, QThread, QTimer
+from PyQt6.QtGui import QFont, QIcon
 from PyQt6.QtWidgets import (
     QDialog,
     QFileDialog,
@@ -12,21 +11,32 @@ from PyQt6.QtWidgets import (
     QHeaderView,
     QLabel,
     QLineEdit,
+    QMenu,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
-from shared.asset_interface import AssetInterface
 from shared.config import Config
+from shared.differential_apply import ApplyPlan
+from shared.konsave_config import KonsaveConfig
 from shared.konsave_interface import KonsaveInterface
 from shared.os_interface import OsInterface
+from shared.profile_store import ProfileStore
+from shared.resource_loader import ResourceLoader
+from shared.resources.apply_worker import ApplyPreviewWorker, ApplyWorker
 from shared.resources.export_worker import ExportWorker
 from shared.resources.import_worker import ImportWorker
+from shared.resources.job_queue import JobQueue, JobState
+from shared.resources.metadata_worker import MetadataWorker
+from shared.resources.preview_loader import PreviewLoader
+from shared.resources.profile_watcher import ProfileWatcher
 from shared.resources.progress_bar_painter import ProgressBarPainter
+from shared.resources.table_action_painter import TableActionPainter
+from shared.resources.theme_table_model import ThemeTableModel
 
 
 class AllThemeWindow(QDialog):
@@ -40,83 +50,179 @@ class AllThemeWindow(QDialog):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
         self.action_buttons_side = 35
-        self.export_threads = {}
         self.export_progress = {}
-        self.import_threads = {}
+        self.export_throughput = {}
+        self.export_errors = {}
+        # chosen when a theme is queued, so changing the folder does not move exports already waiting
+        self.export_destinations: dict[str, str] = {}
+        self.export_directory = self.get_export_directory()
+        self.export_queue = JobQueue(
+            lambda theme_name: ExportWorker(theme_name, self.export_destinations.get(theme_name)),
+            Config.get_max_concurrent_exports(),
+            self,
+        )
+        self.export_queue.state_changed.connect(self.on_export_state_changed)
+        self.export_queue.progress.connect(self.update_progress)
+        self.export_queue.throughput.connect(self.update_throughput)
+        self.export_queue.job_failed.connect(self.export_failed)
+        self.export_queue.drained.connect(self.on_exports_drained)
+        self.apply_job = None
+        self.apply_stage_times = []
+        self.apply_files_summary = ""
+        self.preview_job = None
+        self.metadata_job = None
+        self.metadata_refresh_pending = False
+        self.preview_loader = PreviewLoader(self) if Config.are_previews_enabled() else None
+        self.import_errors = {}
+        self.import_spinner = None
+        self.import_queue = JobQueue(ImportWorker, Config.get_max_concurrent_imports(), self)
+        self.import_queue.state_changed.connect(lambda *_: self.update_import_status())
+        self.import_queue.job_failed.connect(self.import_failed)
+        self.import_queue.drained.connect(self.on_imports_drained)
         self.custom_font = QFont()
         self.custom_font.setPointSize(10)
         self.last_theme_applied_color = "#b6e7b0"
-        self.setStyleSheet(Config.get_window_qss(Path(__file__)))
+        ResourceLoader.get().apply_stylesheet(self, Path(__file__).stem)
         self.setLayout(self.main_layout)
         self.main_layout.setContentsMargins(40, 20, 40, 20)
         self.add_table_header()
         self.add_table()
+        self.profile_watcher = None
+        if Config.is_profile_watch_enabled():
+            self.profile_watcher = ProfileWatcher(Config.get_profile_watch_delay_ms(), self)
+            self.profile_watcher.profiles_changed.connect(self.on_profiles_changed)
 
     def add_table(self) -> None:
         self.table_widget = QWidget()
         self.table_widget.setObjectName("TableContentWidget")
         self.table_layout = QVBoxLayout(self.table_widget)
 
-        active_theme = self.get_active_theme()
+        self.not_found_label = QLabel("No Themes Found")
+        self.not_found_label.setObjectName("NotFoundLabel")
+        self.not_found_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        if not self.themes:
-            label = QLabel("No Themes Found")
-            label.setObjectName("NotFoundLabel")
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table_layout.addWidget(label, stretch=1)
-            self.main_layout.insertWidget(1, self.table_widget)
-            return
+        self.theme_model = ThemeTableModel(self.themes, self.get_active_theme(), self.last_theme_applied_color, self)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.theme_model)
+        self.proxy_model.setSortRole(ThemeTableModel.SortRole)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
+        self.table = QTableView()
+        self.table.setModel(self.proxy_model)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
-        self.table.setItemDelegateForColumn(0, ProgressBarPainter(self.export_progress, self.table))
-
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setVisible(False)
+        self.table.setMouseTracking(True)
+        self.table.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.table.setItemDelegateForColumn(
+            ThemeTableModel.NAME_COLUMN, ProgressBarPainter(self.export_progress, self.table, self.export_throughput)
+        )
+        self.action_painter = TableActionPainter(self.table)
+        self.action_painter.clicked.connect(self.on_table_action)
+        for column in (ThemeTableModel.APPLY_COLUMN, ThemeTableModel.DELETE_COLUMN, ThemeTableModel.EXPORT_COLUMN):
+            self.table.setItemDelegateForColumn(column, self.action_painter)
+
+        # Fixed sizes keep layout O(1) instead of measuring every row's contents
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(ThemeTableModel.NAME_COLUMN, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setDefaultSectionSize(self.action_buttons_side)
+        self.table.horizontalHeader().resizeSection(ThemeTableModel.SIZE_COLUMN, 75)
+        self.table.horizontalHeader().resizeSection(ThemeTableModel.MODIFIED_COLUMN, 85)
+        # no sort column until a header is clicked: rows keep konsave's order
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
 
         self.table.verticalHeader().setVisible(True)
         self.table.verticalHeader().setMinimumWidth(30)
         self.table.verticalHeader().setDefaultAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.action_buttons_side)
+
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.table.customContextMenuRequested.connect(self.show_table_context_menu)
 
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-
-        self.table.setRowCount(len(self.themes))
-        for row, (_, name) in enumerate(self.themes):
-            self.table.setItem(row, 0, QTableWidgetItem(name))
-
-            if name == active_theme:
-                self.table.item(row, 0).setBackground(QColor(self.last_theme_applied_color))
-                self.table.item(row, 0).setForeground(QColor("black"))
-
-            apply_btn = QPushButton("✅")
-            apply_btn.setToolTip("Apply this theme")
-            apply_btn.setObjectName("TableButton")
-            delete_btn = QPushButton("🗑️")
-            delete_btn.setToolTip("Delete this theme")
-            delete_btn.setObjectName("TableButton")
-            export_btn = QPushButton("📦")
-            export_btn.setToolTip("Export this theme")
-            export_btn.setObjectName("TableButton")
-
-            apply_btn.clicked.connect(lambda _, n=name: self.apply_theme(n))
-            delete_btn.clicked.connect(lambda _, n=name: self.delete_theme(n))
-            export_btn.clicked.connect(lambda _, n=name, r=row: self.export_theme(n, r))
-
-            self.table.setCellWidget(row, 1, apply_btn)
-            self.table.setCellWidget(row, 2, delete_btn)
-            self.table.setCellWidget(row, 3, export_btn)
-
-        self.table.resizeColumnsToContents()
-        button_columns_width = 20
-        self.table.setColumnWidth(1, button_columns_width)
-        self.table.setColumnWidth(2, button_columns_width)
-        self.table.setColumnWidth(3, button_columns_width)
+        self.legend_widget = self.get_color_legend_widget()
+        self.table_layout.addWidget(self.not_found_label, stretch=1)
         self.table_layout.addWidget(self.table, stretch=1)
-        self.table_layout.addWidget(self.get_color_legend_widget())
+        self.table_layout.addWidget(self.legend_widget)
         self.main_layout.insertWidget(1, self.table_widget)
+        self.update_empty_state()
+        self.refresh_metadata()
+        self.add_previews()
+
+    def add_previews(self) -> None:
+        if self.preview_loader is None:
+            return
+        self.theme_model.set_preview_source(self.preview_loader.get_preview)
+        self.preview_loader.preview_ready.connect(
+            lambda theme_name: self.theme_model.refresh_theme(theme_name, ThemeTableModel.NAME_COLUMN)
+        )
+        # asks for the rows on screen once scrolling or re-sorting settles, never for every row passed
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(60)
+        self.preview_timer.timeout.connect(self.request_visible_previews)
+        self.table.verticalScrollBar().valueChanged.connect(lambda: self.preview_timer.start())
+        for signal in (
+            self.proxy_model.modelReset,
+            self.proxy_model.layoutChanged,
+            self.proxy_model.rowsInserted,
+            self.proxy_model.rowsRemoved,
+        ):
+            signal.connect(lambda *_: self.preview_timer.start())
+
+    def request_visible_previews(self) -> None:
+        row_count = self.proxy_model.rowCount()
+        if self.preview_loader is None or not row_count or not self.table.isVisible():
+            return
+        first_row = max(self.table.rowAt(0), 0)
+        last_row = self.table.rowAt(self.table.viewport().height() - 1)
+        last_row = row_count - 1 if last_row < 0 else last_row
+        self.preview_loader.request(
+            [
+                self.proxy_model.index(row, ThemeTableModel.NAME_COLUMN).data(ThemeTableModel.ThemeNameRole)
+                for row in range(first_row, last_row + 1)
+            ]
+        )
+
+    # Qt override. do not rename this method
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self.preview_loader is not None:
+            self.preview_timer.start()
+
+    def update_empty_state(self) -> None:
+        has_themes = bool(self.themes)
+        self.not_found_label.setVisible(not has_themes)
+        self.table.setVisible(has_themes)
+        self.legend_widget.setVisible(has_themes)
+
+    def show_table_context_menu(self, position) -> None:
+        index = self.table.indexAt(position)
+        if not index.isValid():
+            return
+        theme_name = index.data(ThemeTableModel.ThemeNameRole)
+        menu = QMenu(self.table)
+        menu.addAction("Apply", lambda: self.apply_theme(theme_name))
+        preview_action = menu.addAction("Preview changes...", lambda: self.preview_apply(theme_name))
+        preview_action.setEnabled(KonsaveConfig.is_available() and self.preview_job is None)
+        menu.addSeparator()
+        menu.addAction("Export", lambda: self.export_theme(theme_name))
+        menu.addAction("Export to...", lambda: self.choose_export_directory() and self.export_theme(theme_name))
+        menu.addAction("Delete", lambda: self.delete_theme(theme_name))
+        menu.exec(self.table.viewport().mapToGlobal(position))
+
+    def on_table_action(self, theme_name: str, column: int) -> None:
+        if column == ThemeTableModel.APPLY_COLUMN:
+            self.apply_theme(theme_name)
+        elif column == ThemeTableModel.DELETE_COLUMN:
+            self.delete_theme(theme_name)
+        elif column == ThemeTableModel.EXPORT_COLUMN:
+            if self.export_queue.is_active(theme_name):
+                self.cancel_export(theme_name)
+            else:
+                self.export_theme(theme_name)
 
     def add_table_header(self) -> None:
         self.table_header_widget = QWidget()
@@ -128,8 +234,13 @@ class AllThemeWindow(QDialog):
 
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Search theme...")
-        self.search_bar.textChanged.connect(self.filter_table)
+        self.search_bar.textChanged.connect(lambda: self.search_timer.start())
         self.search_bar.setFixedWidth(0)
+        # searching waits for a pause in typing instead of running on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(lambda: self.filter_table(self.search_bar.text()))
 
         self.searchbar_animation = QPropertyAnimation(self.search_bar, b"minimumWidth")
         self.searchbar_animation.setDuration(300)
@@ -137,87 +248,320 @@ class AllThemeWindow(QDialog):
 
         self.search_toggle_btn = QPushButton("🔍")
         self.import_button = QPushButton("📥")
-        self.import_button.setToolTip("Import a theme")
+        self.import_button.setToolTip("Import themes")
+        self.import_menu = QMenu(self.import_button)
+        self.import_menu.addAction("Import files...", self.import_theme)
+        self.import_menu.addAction("Import a folder...", self.import_theme_directory)
+        self.export_selected_button = QPushButton("📦")
+        self.export_selected_button.setToolTip("Export selected themes (all themes when none is selected)")
 
         self.search_toggle_btn.clicked.connect(self.toggle_searchbar)
-        self.import_button.clicked.connect(self.import_theme)
+        self.import_button.clicked.connect(
+            lambda: self.import_menu.exec(self.import_button.mapToGlobal(self.import_button.rect().bottomLeft()))
+        )
+        self.export_selected_button.clicked.connect(self.export_selected_themes)
 
         self.table_header_layout.addWidget(label)
         self.table_header_layout.addStretch()
         self.table_header_layout.addWidget(self.search_bar)
         self.table_header_layout.addWidget(self.search_toggle_btn)
         self.table_header_layout.addWidget(self.import_button)
+        self.table_header_layout.addWidget(self.export_selected_button)
 
         self.main_layout.addWidget(self.table_header_widget)
 
-    def redraw_table(self) -> None:
-        self.main_layout.removeWidget(self.table_widget)
-        self.table_widget.deleteLater()
-        self.table_widget = None
-        self.add_table()
+    def update_table(self) -> None:
+        self.theme_model.set_themes(self.themes)
+        self.update_empty_state()
+
+    def on_profiles_changed(self, themes: list[Tuple[int, str]], added: list[str], removed: list[str]) -> None:
+        # only the rows of added and removed profiles change; the listing comes from the watcher, not konsave
+        self.themes = themes
+        if self.preview_loader is not None:
+            for theme_name in removed:
+                self.preview_loader.invalidate(theme_name)
+        self.update_table()
+        if added:
+            self.refresh_metadata()
+
+    def stop_profile_watcher(self) -> None:
+        if self.profile_watcher is not None:
+            self.profile_watcher.stop()
+
+    def stop_previews(self) -> None:
+        if self.preview_loader is not None:
+            self.preview_timer.stop()
+            self.preview_loader.shutdown()
+
+    def refresh_metadata(self) -> None:
+        # profiles only changed since the last refresh are walked, on a worker thread
+        if self.metadata_job is not None:
+            self.metadata_refresh_pending = True
+            return
+        worker = MetadataWorker([name for _, name in self.themes])
+        thread = QThread()
+        worker.moveToThread(thread)
+        worker.finished.connect(self.on_metadata_refreshed)
+        worker.failed.connect(lambda err: self.on_metadata_refreshed(None, err))
+        thread.started.connect(worker.run)
+        self.metadata_job = (thread, worker)
+        thread.start()
+
+    def stop_metadata_refresh(self) -> None:
+        # the refresh is short and only touches the cache, so it is waited for rather than interrupted
+        self.metadata_refresh_pending = False
+        if self.metadata_job is not None:
+            thread, worker = self.metadata_job
+            worker.finished.disconnect()
+            worker.failed.disconnect()
+            thread.quit()
+            thread.wait()
+            self.metadata_job = None
+
+    def on_metadata_refreshed(self, metadata: Optional[dict], error: str = "") -> None:
+        thread, _ = self.metadata_job
+        thread.quit()
+        thread.wait()
+        self.metadata_job = None
+        if error:
+            print(f"Could not refresh theme metadata. Error: {error}")
+        else:
+            self.theme_model.set_metadata(metadata)
+        if self.metadata_refresh_pending:
+            self.metadata_refresh_pending = False
+            self.refresh_metadata()
 
     def import_theme(self) -> None:
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select a profile file", "", "KNSV File (*.knsv)")
-        theme_name = OsInterface().get_filename_without_extension(file_path)
-        if not file_path:
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select profile files", "", "KNSV File (*.knsv)")
+        self.queue_imports(file_paths)
+
+    def import_theme_directory(self) -> None:
+        directory = QFileDialog.getExistingDirectory(self, "Select a folder containing profile files")
+        if not directory:
+            return
+        with os.scandir(directory) as entries:
+            file_paths = sorted(e.path for e in entries if e.is_file() and e.name.endswith(".knsv"))
+        if not file_paths:
+            QMessageBox.information(self, "Theme Import", f"No .knsv files found in '{directory}'")
+            return
+        self.queue_imports(file_paths)
+
+    def queue_imports(self, file_paths: list[str]) -> None:
+        if not file_paths:
             return
-        if any(str(t[1]).lower() == theme_name.lower() for t in self.themes):
+
+        # Conflicts are checked up front against the profile list and against the other queued files
+        skipped = []
+        queued_names = {
+            OsInterface.get_filename_without_extension(path).lower() for path in self.import_queue.get_active_keys()
+        }
+        for file_path in file_paths:
+            theme_name = OsInterface.get_filename_without_extension(file_path)
+            if self.__konsave_interface.get_existing(theme_name) or theme_name.lower() in queued_names:
+                skipped.append(theme_name)
+                continue
+            queued_names.add(theme_name.lower())
+            self.import_errors.pop(file_path, None)
+            self.import_queue.enqueue(file_path)
+
+        if skipped:
             QMessageBox.warning(
                 self,
                 "Existing theme",
-                f"Theme '{theme_name}' already exists and cannot be imported.",
+                "These themes already exist and will not be imported:\n" + "\n".join(skipped),
             )
-            return
+        if self.import_queue.has_active_jobs():
+            self.start_import_spinner()
 
-        self.import_spinner = QMovie(AssetInterface().get_spinner_path())
-        self.import_spinner.start()
+    def start_import_spinner(self) -> None:
+        if self.import_spinner is not None:
+            return
+        self.import_spinner = ResourceLoader.get().acquire_spinner()
         self.import_button.setText("")
-        self.import_button.setIcon(QIcon(self.import_spinner.currentPixmap()))
-        self.import_button.setToolTip(f"Importing theme '{theme_name}'\nThis might take a few minutes...")
-        self.import_spinner.frameChanged.connect(
-            lambda: self.import_button.setIcon(QIcon(self.import_spinner.currentPixmap()))
+        self.update_import_spinner()
+        self.import_spinner.frameChanged.connect(self.update_import_spinner)
+
+    def update_import_spinner(self) -> None:
+        if self.import_spinner is not None:
+            self.import_button.setIcon(QIcon(self.import_spinner.currentPixmap()))
+
+    def stop_import_spinner(self) -> None:
+        if self.import_spinner is None:
+            return
+        # the movie is shared: only this window's connection goes away
+        self.import_spinner.frameChanged.disconnect(self.update_import_spinner)
+        ResourceLoader.get().release_spinner()
+        self.import_spinner = None
+        self.import_button.setIcon(QIcon())
+        self.import_button.setText("📥")
+
+    def update_import_status(self) -> None:
+        queue = self.import_queue
+        if not queue.has_active_jobs():
+            self.import_button.setToolTip("Import themes")
+            return
+        self.import_button.setToolTip(
+            f"Importing: {queue.count(JobState.RUNNING)} running · {queue.count(JobState.QUEUED)} queued · "
+            f"{queue.count(JobState.DONE)} done\nThis might take a few minutes..."
         )
-        self.import_button.clicked.disconnect()
 
+    def import_failed(self, file_path: str, error: str) -> None:
+        self.import_errors[file_path] = error
+
+    def on_imports_drained(self) -> None:
+        imported = self.import_queue.count(JobState.DONE)
+        failed, self.import_errors = self.import_errors, {}
+        self.import_queue.clear_finished()
+        self.stop_import_spinner()
+        self.update_import_status()
+
+        # one profile list refresh for the whole batch
+        self.themes = self.__konsave_interface.get_profile_list()
+        self.update_table()
+        self.update_store_status()
+        self.refresh_metadata()
+
+        if failed:
+            details = "\n".join(f"{os.path.basename(path)}: {error}" for path, error in failed.items())
+            QMessageBox.critical(
+                self, "Theme Import", f"{len(failed)} import(s) failed, {imported} completed.\n\n{details}"
+            )
+        elif imported:
+            QMessageBox.information(self, "Theme Import", f"{imported} theme(s) imported successfully")
+
+    def apply_theme(self, theme_name: str) -> None:
+        if self.apply_job is not None:
+            QMessageBox.information(self, "Apply in progress", "Please wait for the current theme to be applied")
+            return
+
+        reload_desktop = False
+        if OsInterface().check_systemd_installed():
+            try_apply = QMessageBox.question(
+                self,
+                "Try Apply Immediately?",
+                f"I can try to update to the selected theme right away.\nWould you like me to do that now?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            )
+            reload_desktop = try_apply == QMessageBox.StandardButton.Yes
+
+        worker = ApplyWorker(theme_name, reload_desktop)
         thread = QThread()
-        import_worker = ImportWorker(file_path)
-        import_worker.moveToThread(thread)
-        thread.started.connect(import_worker.run)
-        import_worker.finished.connect(self.on_import_finish)
-        import_worker.finished.connect(thread.quit)
-        import_worker.finished.connect(import_worker.deleteLater)
-        thread.finished.connect(thread.deleteLater)
-        self.import_threads[theme_name] = (thread, import_worker)
+        worker.moveToThread(thread)
+
+        self.apply_stage_times = []
+        self.apply_files_summary = ""
+        self.apply_dialog = QProgressDialog(f"Applying theme '{theme_name}'...", "Cancel", 0, len(worker.stages), self)
+        self.apply_dialog.setWindowTitle("Applying Theme")
+        self.apply_dialog.setWindowModality(Qt.WindowModality.NonModal)
+        self.apply_dialog.setAutoClose(False)
+        self.apply_dialog.setAutoReset(False)
+        self.apply_dialog.setMinimumDuration(0)
+        self.apply_dialog.setValue(0)
+        # called directly: a queued call would only reach the worker thread once run() has returned
+        self.apply_dialog.canceled.connect(lambda: worker.cancel())
+
+        worker.stage_started.connect(self.on_apply_stage_started)
+        worker.stage_finished.connect(lambda label, seconds: self.apply_stage_times.append((label, seconds)))
+        worker.files_applied.connect(self.on_files_applied)
+        worker.finished.connect(lambda: self.on_apply_done(theme_name, reload_desktop))
+        worker.failed.connect(lambda err: self.on_apply_done(theme_name, reload_desktop, err))
+        worker.cancelled.connect(lambda: self.on_apply_done(theme_name, reload_desktop, cancelled=True))
+        thread.started.connect(worker.run)
+
+        self.apply_job = (thread, worker)
         thread.start()
 
-    def apply_theme(self, theme_name: str) -> None:
-        try:
-            self.__konsave_interface.apply_theme(theme_name)
-            systemd_installed = OsInterface().check_systemd_installed()
-            if systemd_installed:
-                try_apply = QMessageBox.question(
-                    self,
-                    "Try Apply Immediately?",
-                    f"I can try to update to the selected theme right away.\nWould you like me to do that now?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                )
-                if try_apply == QMessageBox.StandardButton.Yes:
-                    self.reload_desktop_environment()
-                    QMessageBox.information(
-                        self,
-                        "Theme Applied",
-                        f"Theme '{theme_name}' applied successfully.\nSome changes might still require a relog to take full effect",
-                    )
-                    self.set_active_theme(theme_name)
-                    return
+    def on_apply_stage_started(self, label: str, number: int, total: int) -> None:
+        self.apply_dialog.setLabelText(f"{label} ({number}/{total})...")
+        self.apply_dialog.setValue(number - 1)
+        if number > 1:
+            # the desktop is being restarted: stopping half way would leave it without a shell or window manager
+            self.apply_dialog.setCancelButton(None)
+
+    def on_apply_done(self, theme_name: str, reload_desktop: bool, error: str = "", cancelled: bool = False) -> None:
+        thread, _ = self.apply_job
+        thread.quit()
+        thread.wait()
+        self.apply_job = None
+        self.apply_dialog.close()
+        self.apply_dialog.deleteLater()
+
+        files_applied = bool(self.apply_stage_times)
+        timings = "\n".join(f"{label}: {seconds:.1f}s" for label, seconds in self.apply_stage_times)
+        if self.apply_files_summary:
+            timings = f"{self.apply_files_summary}\n{timings}"
+        if files_applied:
+            self.set_active_theme(theme_name)
+            self.refresh_metadata()
+
+        if error:
+            QMessageBox.critical(self, "Error", f"Failed to apply theme '{theme_name}'\nError: {error}")
+        elif cancelled and not files_applied:
+            QMessageBox.information(self, "Apply Cancelled", f"Theme '{theme_name}' has not been applied")
+        elif cancelled:
             QMessageBox.information(
                 self,
                 "Theme Applied",
-                f"Theme '{theme_name}' applied successfully.\nPlease logout and log back in to see the changes",
+                f"Theme '{theme_name}' applied, desktop reload skipped.\n"
+                f"Please logout and log back in to see the changes\n\n{timings}",
+            )
+        elif reload_desktop:
+            QMessageBox.information(
+                self,
+                "Theme Applied",
+                f"Theme '{theme_name}' applied successfully.\n"
+                f"Some changes might still require a relog to take full effect\n\n{timings}",
+            )
+        else:
+            QMessageBox.information(
+                self,
+                "Theme Applied",
+                f"Theme '{theme_name}' applied successfully.\n"
+                f"Please logout and log back in to see the changes\n\n{timings}",
             )
-            self.set_active_theme(theme_name)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to apply theme '{theme_name}'\nError: {e}")
+
+    def on_files_applied(self, copied_files: int, copied_bytes: int, skipped_files: int, skipped_bytes: int) -> None:
+        self.apply_files_summary = (
+            f"Copied {copied_files} file(s) ({copied_bytes / 1_000_000:.1f} MB), "
+            f"skipped {skipped_files} unchanged file(s) ({skipped_bytes / 1_000_000:.1f} MB)"
+        )
+
+    def preview_apply(self, theme_name: str) -> None:
+        worker = ApplyPreviewWorker(theme_name)
+        thread = QThread()
+        worker.moveToThread(thread)
+        worker.finished.connect(lambda plan: self.on_preview_done(theme_name, plan))
+        worker.failed.connect(lambda err: self.on_preview_done(theme_name, None, err))
+        thread.started.connect(worker.run)
+        self.preview_job = (thread, worker)
+        thread.start()
+
+    def on_preview_done(self, theme_name: str, plan: Optional[ApplyPlan], error: str = "") -> None:
+        thread, _ = self.preview_job
+        thread.quit()
+        thread.wait()
+        self.preview_job = None
+        if plan is None:
+            QMessageBox.critical(self, "Error", f"Could not compare theme '{theme_name}'\nError: {error}")
+            return
+
+        home = os.path.expanduser("~")
+        changed_bytes = sum(change.size for change in plan.changes)
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Preview Changes")
+        msg.setText(
+            f"Applying '{theme_name}' would write {len(plan.changes)} file(s) ({changed_bytes / 1_000_000:.1f} MB).\n"
+            f"{plan.skipped_files} file(s) ({plan.skipped_bytes / 1_000_000:.1f} MB) are already up to date."
+        )
+        if plan.changes:
+            msg.setDetailedText(
+                "\n".join(f"{change.reason}: {change.target.replace(home, '~', 1)}" for change in plan.changes)
+            )
+        apply_btn = msg.addButton("Apply", QMessageBox.ButtonRole.AcceptRole)
+        msg.addButton("Close", QMessageBox.ButtonRole.RejectRole)
+        msg.exec()
+        if msg.clickedButton() == apply_btn:
+            self.apply_theme(theme_name)
 
     def delete_theme(self, theme_name: str) -> None:
         try:
@@ -230,51 +574,74 @@ class AllThemeWindow(QDialog):
             if confirmation == QMessageBox.StandardButton.Yes:
                 self.__konsave_interface.delete_theme(theme_name)
                 self.themes = self.__konsave_interface.get_profile_list()
-                self.redraw_table()
+                self.update_table()
+                self.update_store_status()
                 QMessageBox.information(self, "Theme Deleted", f"Theme '{theme_name}' deleted successfully.")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to delete theme '{theme_name}'\nError: {e}")
 
-    def export_theme(self, theme_name: str, row_index: int) -> None:
-        if row_index is None:
-            row_index = next((i for i, (_, name) in enumerate(self.themes) if name == theme_name), -1)
-        if row_index < 0:
+    def export_theme(self, theme_name: str) -> None:
+        if self.export_directory is None and not self.choose_export_directory():
             return
+        self.export_errors.pop(theme_name, None)
+        self.export_destinations[theme_name] = self.export_directory
+        self.export_queue.enqueue(theme_name)
 
-        btn = self.table.cellWidget(row_index, 3)
-        if isinstance(btn, QPushButton) and btn.text() != "❌":
-            btn.setText("❌")
-            btn.setToolTip("Cancel export")
-            btn.clicked.disconnect()
-            btn.clicked.connect(lambda: self.cancel_export(row_index))
-
-        self.toggle_table_operations_state(range(row_index, row_index + 1), [1, 2])
-
-        worker = ExportWorker(theme_name)
-        thread = QThread()
-        worker.moveToThread(thread)
-
-        worker.progress.connect(lambda val: self.update_progress(row_index, val))
-        worker.finished.connect(lambda: self.export_finished(row_index))
-        worker.failed.connect(lambda err: self.export_failed(row_index, err))
-        worker.cancelled.connect(lambda: self.cleanup_export(row_index))
-        thread.started.connect(worker.run)
-        thread.finished.connect(thread.deleteLater)
-
-        self.export_threads[row_index] = (thread, worker)
-        self.export_progress[row_index] = 0
-        self.table.viewport().update()
+    def choose_export_directory(self) -> bool:
+        directory = QFileDialog.getExistingDirectory(
+            self, "Export themes to", self.export_directory or os.path.expanduser("~")
+        )
+        if not directory:
+            return False
+        self.export_directory = directory
+        cache_file = Config().get_cache_file("last_export_directory")
+        if cache_file:
+            self.write_to_cache(cache_file, directory)
+        return True
+
+    def get_export_directory(self) -> Optional[str]:
+        cache_file = Config().get_cache_file("last_export_directory") or ""
+        try:
+            with open(os.path.join(OsInterface().get_cache_path(), cache_file), "r", encoding="utf-8") as f:
+                directory = f.read().strip()
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+        return directory if os.path.isdir(directory) else None
 
-        thread.start()
+    def export_selected_themes(self) -> None:
+        selected_rows = self.table.selectionModel().selectedRows(ThemeTableModel.NAME_COLUMN)
+        theme_names = [index.data(ThemeTableModel.ThemeNameRole) for index in selected_rows]
+        if not theme_names:
+            theme_names = [name for _, name in self.themes]
+            confirmation = QMessageBox.question(
+                self,
+                "Export All Themes",
+                f"No theme is selected.\nDo you want to export all {len(theme_names)} themes?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            )
+            if confirmation != QMessageBox.StandardButton.Yes:
+                return
+        if not self.choose_export_directory():
+            return
+        for theme_name in theme_names:
+            if not self.export_queue.is_active(theme_name):
+                self.export_theme(theme_name)
 
     def filter_table(self, text: str) -> None:
-        if not hasattr(self, "table") or self.table is None:
+        if not hasattr(self, "theme_model") or self.theme_model is None:
             return
-
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item:
-                self.table.setRowHidden(row, text.lower() not in item.text().lower())
+        self.search_timer.stop()
+        was_searching = self.theme_model.is_searching()
+        searching = bool(text.strip())
+        if searching and not was_searching:
+            # results come ranked by relevance: the proxy passes them through unsorted meanwhile, and stops
+            # sorting before the rows change so it does not re-sort them as they are removed and moved
+            self.table.setSortingEnabled(False)
+            self.proxy_model.sort(-1)
+        self.theme_model.set_search_query(text)
+        if was_searching and not searching:
+            # sorts again by the header column chosen before searching, if any
+            self.table.setSortingEnabled(True)
 
     def toggle_searchbar(self) -> None:
         expanded = self.search_bar.width() > 0
@@ -293,88 +660,59 @@ class AllThemeWindow(QDialog):
             self.search_toggle_btn.setText("❌")
             self.search_bar.setFocus()
 
-    def reload_desktop_environment(self) -> None:
-        subprocess.run(["systemctl", "--user", "restart", "plasma-plasmashell.service"], check=True)
-        de_protocol = OsInterface().get_de_protocol()
-
-        if de_protocol == "X11":
-            plasmashell_version = OsInterface().get_plasmashell_version()
-            if plasmashell_version not in ("5", "6"):
-                raise ValueError(f"Can't reload desktop environment because of an unsupported plasmashell version")
-            if plasmashell_version == "5":
-                subprocess.run([f"kquitapp5", "kwin_x11"], check=True)
-                subprocess.run(["kstart5", "kwin_x11"], check=True)
-            elif plasmashell_version == "6":
-                subprocess.run([f"kquitapp6", "kwin_x11"], check=True)
-                subprocess.run(["kstart", "kwin_x11"], check=True)
-
-    def update_progress(self, row, value) -> None:
-        self.export_progress[row] = value
-        self.table.viewport().update()
-
-    def export_finished(self, row) -> None:
-        self.cleanup_export(row)
-        QMessageBox.information(self, "Export Complete", f"Export completed for theme '{self.themes[row][1]}'")
-
-    def export_failed(self, row, error) -> None:
-        self.cleanup_export(row)
-        QMessageBox.critical(self, "Export Failed", error)
-
-    def cancel_export(self, row) -> None:
-        _, worker = self.export_threads[row]
-        worker.cancel()
-
-    def cleanup_export(self, row) -> None:
-        thread, worker = self.export_threads.pop(row, (None, None))
-        self.export_progress.pop(row, None)
-        if thread and thread.isRunning():
-            thread.quit()
-            thread.wait()
-
-        model = self.table.model()
-        model.dataChanged.emit(model.index(row, 0), model.index(row, model.columnCount() - 1))
-
-        self.toggle_table_operations_state(range(self.table.rowCount()), [1, 2])
-        export_btn = self.table.cellWidget(row, 3)
-        if isinstance(export_btn, QPushButton):
-            export_btn.setText("📦")
-            export_btn.setToolTip("Export this theme")
-            export_btn.clicked.disconnect()
-            export_btn.clicked.connect(lambda _, n=self.themes[row][1], r=row: self.export_theme(n, r))
-
-    def on_import_finish(self) -> None:
-        self.themes = self.__konsave_interface.get_profile_list()
-
-        self.import_spinner.stop()
-        self.import_spinner.deleteLater()
-        self.import_spinner = None
-        self.import_button.setIcon(QIcon())
-
-        self.import_button.setText("📥")
-        self.import_button.setToolTip("Import a theme")
-        self.import_button.clicked.connect(self.import_theme)
-        QMessageBox.information(
-            self,
-            "Theme Import",
-            f"Theme imported successfully",
+    def update_progress(self, theme_name: str, value: int) -> None:
+        self.export_progress[theme_name] = value
+        self.theme_model.refresh_theme(theme_name, ThemeTableModel.NAME_COLUMN)
+
+    def update_throughput(self, theme_name: str, bytes_per_second: float, eta_seconds: float) -> None:
+        self.export_throughput[theme_name] = (bytes_per_second, eta_seconds)
+        self.theme_model.refresh_theme(theme_name, ThemeTableModel.NAME_COLUMN)
+        self.update_export_status()
+
+    def export_failed(self, theme_name: str, error: str) -> None:
+        self.export_errors[theme_name] = error
+
+    def cancel_export(self, theme_name: str) -> None:
+        self.export_queue.cancel(theme_name)
+
+    def on_export_state_changed(self, theme_name: str, state: str) -> None:
+        if state == JobState.RUNNING.value:
+            self.export_progress[theme_name] = 0
+        elif state != JobState.QUEUED.value:
+            self.export_progress.pop(theme_name, None)
+            self.export_throughput.pop(theme_name, None)
+            self.export_destinations.pop(theme_name, None)
+        self.theme_model.set_export_state(theme_name, None if state == JobState.CANCELLED.value else state)
+        self.update_export_status()
+
+    def update_export_status(self) -> None:
+        queue = self.export_queue
+        if not queue.has_active_jobs():
+            self.export_status_label.setText("")
+            return
+        self.export_status_label.setText(
+            f"Exporting: {queue.count(JobState.RUNNING)} running · {queue.count(JobState.QUEUED)} queued · "
+            f"{queue.count(JobState.DONE)} done · {queue.get_aggregate_throughput() / 1_000_000:.1f} MB/s"
         )
 
-        self.redraw_table()
-
-    def toggle_table_operations_state(self, rows_to_disable: range, column_to_disable: list[int]) -> None:
-        for row in rows_to_disable:
-            if row not in self.export_threads.keys():
-                for column in column_to_disable:
-                    widget = self.table.cellWidget(row, column)
-                    if isinstance(widget, QPushButton):
-                        widget.setEnabled(not widget.isEnabled())
+    def on_exports_drained(self) -> None:
+        exported = self.export_queue.count(JobState.DONE)
+        failed, self.export_errors = self.export_errors, {}
+        self.export_queue.clear_finished()
+        self.update_export_status()
+        if failed:
+            details = "\n".join(f"{name}: {error}" for name, error in failed.items())
+            QMessageBox.critical(
+                self, "Export Failed", f"{len(failed)} export(s) failed, {exported} completed.\n\n{details}"
+            )
+        elif exported:
+            QMessageBox.information(self, "Export Complete", f"Export completed for {exported} theme(s)")
 
     def write_to_cache(self, filename: str, content: str) -> None:
         cache_dir = OsInterface().get_cache_path()
         file_path = os.path.join(cache_dir, filename)
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(content)
-        self.redraw_table()
 
     def get_active_theme(self) -> Optional[str]:
         cache_directory = OsInterface().get_cache_path()
@@ -387,15 +725,12 @@ class AllThemeWindow(QDialog):
             return None
 
     def set_active_theme(self, selected_theme: str) -> None:
-        cache_dir = OsInterface().get_cache_path()
         cache_file = Config().get_cache_file("last_applied_theme")
         if not cache_file:
             print("Could not find cache file for last applied theme")
             return
-        file_path = os.path.join(cache_dir, cache_file)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(selected_theme.strip())
-        self.redraw_table()
+        self.write_to_cache(cache_file, selected_theme.strip())
+        self.theme_model.set_active_theme(selected_theme.strip())
 
     def get_color_legend_widget(self) -> QWidget:
         legend_widget = QWidget()
@@ -410,38 +745,86 @@ class AllThemeWindow(QDialog):
         label = QLabel("Last theme applied")
         label.setStyleSheet("font-size: 12px;")
 
+        self.export_status_label = QLabel("")
+        self.export_status_label.setStyleSheet("font-size: 12px;")
+        self.store_status_label = QLabel("")
+        self.store_status_label.setStyleSheet("font-size: 12px;")
+        self.update_store_status()
+
         legend_layout.addWidget(color_box)
         legend_layout.addWidget(label)
         legend_layout.addStretch()
+        legend_layout.addWidget(self.export_status_label)
+        legend_layout.addWidget(self.store_status_label)
         return legend_widget
 
+    def update_store_status(self) -> None:
+        if not Config.is_dedup_store_enabled():
+            self.store_status_label.setVisible(False)
+            return
+        stats = ProfileStore().get_stats()
+        # the store is kept next to konsave's own profile folders, so what it holds is extra disk use
+        self.store_status_label.setText(f"Store uses {stats.stored_bytes / 1_000_000:.1f} MB")
+        self.store_status_label.setToolTip(
+            f"{stats.profiles} profile(s): {stats.logical_bytes / 1_000_000:.1f} MB of files kept in "
+            f"{stats.stored_bytes / 1_000_000:.1f} MB, in addition to Konsave's own copies"
+        )
+
     # Qt override. do not rename this method
     def closeEvent(self, event) -> None:
-        active_threads = [t for t, _ in self.export_threads.values() if t.isRunning()]
-        if not active_threads:
+        if self.confirm_close():
+            self.stop_background_work()
             event.accept()
+        else:
+            event.ignore()
+
+    # Qt override. do not rename this method
+    def done(self, result: int) -> None:
+        # Esc and reject() hide the dialog through here, without a closeEvent
+        if not self.confirm_close():
             return
+        self.stop_background_work()
+        super().done(result)
+
+    def confirm_close(self) -> bool:
+        if self.apply_job is not None:
+            QMessageBox.information(self, "Apply in progress", "Please wait for the current theme to be applied")
+            return False
 
+        exporting = self.export_queue.has_active_jobs()
+        importing = self.import_queue.has_active_jobs()
+        if not exporting and not importing:
+            return True
+
+        transfers = " and ".join(name for name, active in (("exports", exporting), ("imports", importing)) if active)
         msg = QMessageBox(self)
         msg.setIcon(QMessageBox.Icon.Warning)
-        msg.setWindowTitle("Export in progress")
-        msg.setText("I am still exporting themes.\nWhat do you want to do?")
-        terminate_btn = msg.addButton("Terminate exports", QMessageBox.ButtonRole.AcceptRole)
+        msg.setWindowTitle("Export in progress" if exporting else "Import in progress")
+        msg.setText(f"I am still {'exporting' if exporting else 'importing'} themes.\nWhat do you want to do?")
+        if importing:
+            # konsave -i cannot be interrupted: queued imports are dropped, running ones are waited for
+            msg.setInformativeText("Imports already running will finish first.")
+        terminate_btn = msg.addButton(f"Terminate {transfers}", QMessageBox.ButtonRole.AcceptRole)
         # let_run_btn = msg.addButton("Close without terminate", QMessageBox.ButtonRole.DestructiveRole)
         _ = msg.addButton("Cancel closure", QMessageBox.ButtonRole.RejectRole)
         msg.exec()
 
-        clicked = msg.clickedButton()
-        if clicked == terminate_btn:
-            for thread, worker in list(self.export_threads.values()):
-                if thread.isRunning():
-                    worker.cancel()
-                    thread.quit()
-                    thread.wait()
-            self.export_threads.clear()
+        if msg.clickedButton() != terminate_btn:
+            return False
+        if exporting:
+            self.export_queue.drained.disconnect(self.on_exports_drained)
+            self.export_queue.cancel_all(wait=True)
             self.export_progress.clear()
-            event.accept()
-        # elif clicked == let_run_btn:
-        #     event.accept()
-        else:
-            event.ignore()
+            self.export_throughput.clear()
+        if importing:
+            # no summary for a window that is going away
+            self.import_queue.drained.disconnect(self.on_imports_drained)
+            self.import_queue.cancel_all(wait=True)
+        return True
+
+    def stop_background_work(self) -> None:
+        # the dialog stays alive under MainWindow once hidden, so nothing may keep running for it
+        self.stop_profile_watcher()
+        self.stop_metadata_refresh()
+        self.stop_previews()
+        self.stop_import_spinner()
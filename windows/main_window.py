@@ -1,11 +1,22 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QMessageBox, QPushButton, QSizePolicy, QVBoxLayout, QWidget
+from PyQt6.QtCore import Qt, QThread, QTimer
+from PyQt6.QtWidgets import (
+    QApplication,
+    QFrame,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QProgressDialog,
+    QPushButton,
+    QSizePolicy,
+    QVBoxLayout,
+    QWidget,
+)
 
+from shared.capability_probe import CapabilityProbe
 from shared.config import Config
-from shared.konsave_interface import KonsaveInterface
 from shared.os_interface import OsInterface
-from windows.all_theme_window import AllThemeWindow
-from windows.save_theme_dialog import SaveThemeDialog
+from shared.resources.probe_worker import ProbeWorker
+from shared.startup_timer import StartupTimer
 
 
 class MainWindow(QWidget):
@@ -13,6 +24,9 @@ class MainWindow(QWidget):
         super().__init__()
         self.__buttons_width = 200
         self.__buttons_height = 50
+        self.save_job = None
+        self.probe_job = None
+        self.__painted = False
 
         self.setWindowTitle(Config.get_app_name())
         self.setFixedSize(400, 240)
@@ -37,30 +51,154 @@ class MainWindow(QWidget):
 
         self.setLayout(self.main_layout)
         self.add_bottom_info()
+        # every action needs Konsave: enabled once the background probe has found it
+        self.set_actions_enabled(False)
 
     def add_bottom_info(self):
         self.konsave_label = QLabel(self)
-        konsave_version = OsInterface.get_kosnave_version()
-        (
-            self.konsave_label.setText(f"Using Konsave v{konsave_version}")
-            if konsave_version
-            else self.konsave_label.setText("Konsave not found")
-        )
         self.konsave_label.setFixedHeight(20)
+        self.set_konsave_label("Checking Konsave...")
+        self.konsave_label.show()
+
+    def set_konsave_label(self, text: str) -> None:
+        self.konsave_label.setText(text)
         self.konsave_label.adjustSize()
         x = self.width() - self.konsave_label.width() - 5
         y = self.height() - self.konsave_label.height() - 5
         self.konsave_label.move(x, y)
-        self.konsave_label.show()
+
+    def set_actions_enabled(self, enabled: bool) -> None:
+        self.all_themes_button.setEnabled(enabled)
+        self.save_current_theme_button.setEnabled(enabled)
+
+    # Qt override. do not rename this method
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if not self.__painted:
+            self.__painted = True
+            StartupTimer.mark("first_paint")
+            # started from the event loop so the probe never competes with the first frame
+            QTimer.singleShot(0, self.start_konsave_probe)
+
+    def start_konsave_probe(self) -> None:
+        # every environment probe starts now, so applying a theme later finds its answers ready
+        CapabilityProbe.start()
+        worker = ProbeWorker(OsInterface.get_kosnave_version)
+        thread = QThread()
+        worker.moveToThread(thread)
+        worker.finished.connect(self.on_konsave_probed)
+        thread.started.connect(worker.run)
+        self.probe_job = (thread, worker)
+        thread.start()
+
+    def on_konsave_probed(self, konsave_version) -> None:
+        thread, _ = self.probe_job
+        thread.quit()
+        thread.wait()
+        self.probe_job = None
+        StartupTimer.mark("konsave_probe")
+        StartupTimer.write_when_complete("first_paint", "konsave_probe")
+
+        if not konsave_version:
+            self.set_konsave_label("Konsave not found")
+            QMessageBox.critical(
+                self, "Konsave not found", "Konsave has not been found on your system. Please install it to use this UI"
+            )
+            QApplication.instance().exit(1)
+            return
+        self.set_konsave_label(f"Using Konsave v{konsave_version}")
+        self.set_actions_enabled(True)
 
     def open_save_theme_dialog(self):
+        # secondary windows are imported on first use so they do not delay the first paint
+        from windows.save_theme_dialog import SaveThemeDialog
+
         dialog = SaveThemeDialog(self)
         if dialog.exec():
-            theme_name = dialog.get_theme_name()
-            KonsaveInterface().save_theme(theme_name)
+            self.save_theme(dialog.get_theme_name())
+
+    def save_theme(self, theme_name: str) -> None:
+        from shared.resources.save_worker import SaveWorker
+
+        worker = SaveWorker(theme_name)
+        thread = QThread()
+        worker.moveToThread(thread)
+
+        self.save_files_summary = ""
+        self.save_dialog = QProgressDialog(f"Saving theme '{theme_name}'...", "Cancel", 0, 100, self)
+        self.save_dialog.setWindowTitle("Saving Theme")
+        self.save_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.save_dialog.setAutoClose(False)
+        self.save_dialog.setAutoReset(False)
+        # an unchanged profile is saved in a blink: only show the dialog when there is something to wait for
+        self.save_dialog.setMinimumDuration(500)
+        self.save_dialog.setValue(0)
+        if worker.is_incremental():
+            # called directly: a queued call would only reach the worker thread once run() has returned
+            self.save_dialog.canceled.connect(lambda: worker.cancel())
+        else:
+            self.save_dialog.setCancelButton(None)
+            self.save_dialog.setRange(0, 0)
+
+        worker.progress.connect(self.save_dialog.setValue)
+        worker.files_saved.connect(self.on_files_saved)
+        worker.finished.connect(lambda: self.on_save_done(theme_name))
+        worker.failed.connect(lambda err: self.on_save_done(theme_name, err))
+        worker.cancelled.connect(lambda: self.on_save_done(theme_name, cancelled=True))
+        thread.started.connect(worker.run)
+
+        self.set_actions_enabled(False)
+        self.save_job = (thread, worker)
+        thread.start()
+
+    def on_files_saved(self, copied_files: int, copied_bytes: int, skipped_files: int, skipped_bytes: int) -> None:
+        self.save_files_summary = (
+            f"{copied_files} file(s) copied ({copied_bytes / 1_000_000:.1f} MB), "
+            f"{skipped_files} unchanged file(s) skipped ({skipped_bytes / 1_000_000:.1f} MB)"
+        )
+
+    def on_save_done(self, theme_name: str, error: str = "", cancelled: bool = False) -> None:
+        thread, _ = self.save_job
+        thread.quit()
+        thread.wait()
+        self.save_job = None
+        self.save_dialog.close()
+        self.save_dialog.deleteLater()
+        self.set_actions_enabled(True)
+
+        if error:
+            QMessageBox.critical(self, "Error", f"Failed to save theme '{theme_name}'\nError: {error}")
+        elif cancelled:
+            QMessageBox.information(
+                self,
+                "Save Cancelled",
+                f"Theme '{theme_name}' has only been partially saved.\nSave it again to complete it.",
+            )
+        else:
             print("-> THEME SAVED: {theme_name}".format(theme_name=theme_name))
-            QMessageBox.information(self, "Theme Saved", f"Theme '{theme_name}' has been saved successfully.")
+            message = f"Theme '{theme_name}' has been saved successfully."
+            if self.save_files_summary:
+                message = f"{message}\n\n{self.save_files_summary}"
+            QMessageBox.information(self, "Theme Saved", message)
 
     def open_all_themes_dialog(self):
+        from windows.all_theme_window import AllThemeWindow
+
         dialog = AllThemeWindow(self)
         dialog.exec()
+        # a new dialog is built every time: the closed one would otherwise live as long as this window
+        dialog.deleteLater()
+
+    # Qt override. do not rename this method
+    def closeEvent(self, event) -> None:
+        if self.save_job is not None:
+            QMessageBox.information(self, "Save in progress", "Please wait for the current theme to be saved")
+            event.ignore()
+            return
+        if self.probe_job is not None:
+            thread, worker = self.probe_job
+            worker.finished.disconnect()
+            thread.quit()
+            thread.wait()
+            self.probe_job = None
+        event.accept()